@@ -0,0 +1,162 @@
+"""
+Planetary Aspects
+All-pairs angular separation matrices, planet clusters and Vedic sign aspects (drishti)
+for single charts and chart batches
+"""
+
+from typing import Dict, Iterator, List, Sequence, Tuple
+import numpy as np
+
+# Houses counted from the planet's own (1 = same house) that each planet aspects.
+# Every planet has the full 7th aspect; Mars, Jupiter and Saturn add their special aspects.
+DRISHTI_OFFSETS = {
+    'Sun': (7,),
+    'Moon': (7,),
+    'Mercury': (7,),
+    'Venus': (7,),
+    'Mars': (4, 7, 8),
+    'Jupiter': (5, 7, 9),
+    'Saturn': (3, 7, 10),
+    'Rahu': (7,),
+    'Ketu': (7,),
+}
+
+def orb_matrix(longitudes, dtype=np.float64) -> np.ndarray:
+    """Angular distance in [0, 180] between every pair of bodies.
+
+    ``longitudes`` has shape ``(..., n_bodies)``: one chart gives an
+    ``(n, n)`` matrix, a batch of charts an ``(n_charts, n, n)`` tensor.
+    """
+    longitudes = np.asarray(longitudes, dtype=dtype)
+    difference = longitudes[..., :, None] - longitudes[..., None, :]
+    return np.abs((difference + 180.0) % 360.0 - 180.0)
+
+def iter_orb_tensors(longitudes: np.ndarray, chunk_size: int = 65536,
+                     dtype=np.float32) -> Iterator[Tuple[slice, np.ndarray]]:
+    """Orb tensors of consecutive chunks of a large batch, as (row slice, tensor)"""
+    for start in range(0, len(longitudes), chunk_size):
+        rows = slice(start, min(start + chunk_size, len(longitudes)))
+        yield rows, orb_matrix(longitudes[rows], dtype)
+
+def circular_span(longitudes) -> np.ndarray:
+    """Smallest arc holding every longitude on the last axis: 360 minus the largest gap"""
+    ordered = np.sort(np.asarray(longitudes, dtype=float) % 360.0, axis=-1)
+    gaps = np.diff(ordered, axis=-1, append=ordered[..., :1] + 360.0)
+    return 360.0 - gaps.max(axis=-1)
+
+def largest_clusters(longitudes, orb: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Largest group of bodies within ``orb`` degrees in each chart, by a circular sweep.
+
+    ``longitudes`` has shape ``(n_charts, n_bodies)``. Each row is sorted
+    once and unrolled past 360 degrees; the end of the window starting at
+    every body is found with one searchsorted over all rows (kept apart by
+    a per-row offset), so the cost is O(n log n) per chart with no pair or
+    subset enumeration. Ties between equally large windows go to the
+    tightest. Returns (size, span, start longitude, member mask).
+    """
+    longitudes = np.asarray(longitudes, dtype=float) % 360.0
+    n_charts, n_bodies = longitudes.shape
+    if n_bodies == 0:
+        empty = np.zeros(n_charts)
+        return empty.astype(int), empty, empty, np.zeros((n_charts, 0), dtype=bool)
+
+    ordered = np.sort(longitudes, axis=1)
+    unrolled = np.concatenate([ordered, ordered + 360.0], axis=1)
+    offsets = np.arange(n_charts)[:, None] * 720.0
+
+    ends = np.searchsorted((unrolled + offsets).ravel(), (ordered + orb + offsets).ravel(), side='right')
+    ends = ends.reshape(n_charts, n_bodies) - np.arange(n_charts)[:, None] * 2 * n_bodies
+    sizes = np.minimum(ends - np.arange(n_bodies), n_bodies)
+    last = np.minimum(ends - 1, np.arange(n_bodies) + n_bodies - 1)
+    spans = np.take_along_axis(unrolled, last, axis=1) - ordered
+
+    best = np.argmax(sizes * 1e4 - spans, axis=1)
+    rows = np.arange(n_charts)
+    start = ordered[rows, best]
+    span = spans[rows, best]
+    members = (longitudes - start[:, None]) % 360.0 <= span[:, None] + 1e-9
+    return sizes[rows, best], span, start, members
+
+def find_clusters(longitudes, bodies: Sequence[str], orb: float, min_size: int = 3) -> List[Dict]:
+    """Every maximal group of at least ``min_size`` bodies within ``orb`` degrees in one chart"""
+    longitudes = np.asarray(longitudes, dtype=float) % 360.0
+    n_bodies = len(longitudes)
+    order = np.argsort(longitudes)
+    unrolled = np.concatenate([longitudes[order], longitudes[order] + 360.0])
+
+    # Two-pointer sweep around the circle: window i covers sorted bodies i..end-1
+    windows = []
+    end = 0
+    for i in range(n_bodies):
+        end = max(end, i + 1)
+        while end < i + n_bodies and unrolled[end] - unrolled[i] <= orb:
+            end += 1
+        if end - i >= min_size:
+            windows.append((frozenset(int(order[k % n_bodies]) for k in range(i, end)), unrolled[end - 1] - unrolled[i],
+                            unrolled[i] % 360.0))
+
+    # A window reached again across 0 degrees can sit inside one that started earlier
+    clusters = []
+    seen = set()
+    for members, span, start in windows:
+        if members not in seen and not any(members < other for other, _, _ in windows):
+            seen.add(members)
+            clusters.append({
+                'bodies': [bodies[k] for k in sorted(members, key=lambda k: (longitudes[k] - start) % 360.0)],
+                'start_longitude': float(start),
+                'span': float(span)
+            })
+    return clusters
+
+def _drishti_tables(offsets: Dict[str, Tuple[int, ...]]) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Planet order and (n_planets + 1, 12, 12) tables; the last table (no aspects) serves other bodies"""
+    planets = tuple(offsets)
+    tables = np.zeros((len(planets) + 1, 12, 12), dtype=bool)
+    source = np.arange(12)[:, None]
+    target = np.arange(12)[None, :]
+    for index, planet in enumerate(planets):
+        tables[index] = np.isin((target - source) % 12 + 1, offsets[planet])
+    return planets, tables
+
+# DRISHTI_TABLES[p, from_house - 1, to_house - 1] is True when DRISHTI_PLANETS[p] placed in
+# from_house aspects to_house
+DRISHTI_PLANETS, DRISHTI_TABLES = _drishti_tables(DRISHTI_OFFSETS)
+
+def drishti_indices(bodies: Sequence[str]) -> np.ndarray:
+    """Table index of each body; bodies without aspects map to the empty table"""
+    return np.array([DRISHTI_PLANETS.index(body) if body in DRISHTI_PLANETS else len(DRISHTI_PLANETS)
+                     for body in bodies], dtype=np.intp)
+
+def aspected_houses(planet: str, house: int) -> List[int]:
+    """Houses aspected by a planet placed in ``house``"""
+    return [int(h) + 1 for h in np.flatnonzero(DRISHTI_TABLES[drishti_indices([planet])[0], house - 1])]
+
+def house_drishti(houses, bodies: Sequence[str]) -> np.ndarray:
+    """Houses each body aspects: ``houses`` of shape (..., n_bodies) gives (..., n_bodies, 12)"""
+    houses = np.asarray(houses, dtype=np.intp)
+    return DRISHTI_TABLES[drishti_indices(bodies), houses - 1]
+
+def drishti_matrix(houses, bodies: Sequence[str]) -> np.ndarray:
+    """``[..., i, j]`` is True when body i aspects the house of body j, from table lookups only.
+
+    ``houses`` has shape ``(..., n_bodies)`` with values 1-12, as carried
+    by PlanetPosition.house, ChartArray.houses or BatchPositions.house.
+    """
+    houses = np.asarray(houses, dtype=np.intp) - 1
+    return DRISHTI_TABLES[drishti_indices(bodies)[:, None], houses[..., :, None], houses[..., None, :]]
+
+def chart_drishti(planetary_positions: Dict) -> Dict[str, Dict[str, List]]:
+    """Aspected houses and planets of every body in one chart"""
+    bodies = list(planetary_positions)
+    houses = [planetary_positions[body].house for body in bodies]
+    by_house = house_drishti(houses, bodies)
+    by_body = drishti_matrix(houses, bodies)
+    return {
+        body: {
+            'houses': [int(h) + 1 for h in np.flatnonzero(by_house[i])],
+            'planets': [bodies[j] for j in np.flatnonzero(by_body[i]) if j != i]
+        }
+        for i, body in enumerate(bodies)
+    }
+
+print("✅ Planetary Aspects loaded")
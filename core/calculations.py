@@ -4,9 +4,72 @@ Handles all planetary position and astronomical computations
 """
 
 import datetime
+import functools
 import math
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+import sys
+from typing import Dict, NamedTuple, Tuple, Optional
+from dataclasses import dataclass, field
+import numpy as np
+
+from core.ayanamsa import AyanamsaEngine
+from core.ephemeris_series import evaluate_series, get_tier_spec
+
+# Column order of the batch (struct-of-arrays) API
+BATCH_BODIES = ('Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn',
+                'Rahu', 'Ketu', 'Ascendant')
+
+# 108-pada grid: every rashi holds exactly 9 padas and every nakshatra 4,
+# so one integer division by the pada span classifies a longitude.
+PADAS_PER_CIRCLE = 108
+PADAS_PER_DEGREE = PADAS_PER_CIRCLE / 360.0
+
+# Row p: (rashi index, nakshatra index, pada number) of pada p
+PADA_TABLE = np.array([(p // 9, p // 4, p % 4 + 1) for p in range(PADAS_PER_CIRCLE)], dtype=np.int8)
+
+# Packed record produced by AstronomicalCalculator.classify_longitudes
+LONGITUDE_CLASS_DTYPE = np.dtype([('rashi', np.int8), ('nakshatra', np.int8),
+                                  ('pada', np.int8), ('house', np.int8)])
+
+HOUSE_SYSTEMS = ('equal', 'whole_sign')
+
+@functools.lru_cache(maxsize=4096)
+def _sidereal_terms(jd: float) -> Tuple[float, float]:
+    """Greenwich mean sidereal time and mean obliquity, in degrees, for one instant.
+
+    Cached per Julian day so every location charted at the same instant
+    shares the series evaluation.
+    """
+    t = (jd - 2451545.0) / 36525.0
+    gmst = (280.46061837 + 360.98564736629 * (jd - 2451545.0) +
+            0.000387933 * t * t - t * t * t / 38710000.0) % 360
+    obliquity = 23.4392911 - 0.0130041667 * t - 1.6389e-7 * t * t + 5.0361e-7 * t * t * t
+    return gmst, obliquity
+
+def _sidereal_terms_batch(jds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized _sidereal_terms, evaluated once per distinct Julian day"""
+    unique_jds, inverse = np.unique(jds, return_inverse=True)
+    t = (unique_jds - 2451545.0) / 36525.0
+    gmst = (280.46061837 + 360.98564736629 * (unique_jds - 2451545.0) +
+            0.000387933 * t * t - t * t * t / 38710000.0) % 360
+    obliquity = 23.4392911 - 0.0130041667 * t - 1.6389e-7 * t * t + 5.0361e-7 * t * t * t
+    return gmst[inverse], obliquity[inverse]
+
+def _ascendant_and_mc(gmst, obliquity, latitude, longitude):
+    """Ascendant and midheaven longitudes (degrees) from sidereal time; scalars or arrays"""
+    ramc = np.radians(gmst + longitude)
+    eps = np.radians(obliquity)
+    phi = np.radians(latitude)
+    ascendant = np.degrees(np.arctan2(np.cos(ramc),
+                                      -(np.sin(ramc) * np.cos(eps) + np.tan(phi) * np.sin(eps)))) % 360
+    mc = np.degrees(np.arctan2(np.sin(ramc), np.cos(ramc) * np.cos(eps))) % 360
+    return ascendant, mc
+
+class LongitudeClass(NamedTuple):
+    """Rashi, nakshatra, pada and house of one longitude"""
+    rashi: str
+    nakshatra: str
+    pada: int
+    house: int
 
 @dataclass
 class PlanetPosition:
@@ -22,11 +85,66 @@ class PlanetPosition:
     pada: int
     retrograde: bool
     house: int
+    speed: float = 0.0  # apparent motion in degrees per day
+
+@dataclass(frozen=True)
+class CompactPlanetPosition:
+    """Immutable, slotted counterpart of PlanetPosition for large in-memory caches"""
+    __slots__ = ('name', 'longitude', 'latitude', 'rashi', 'degree', 'minute', 'second',
+                 'nakshatra', 'pada', 'retrograde', 'house', 'speed')
+    name: str
+    longitude: float
+    latitude: float
+    rashi: str
+    degree: int
+    minute: int
+    second: int
+    nakshatra: str
+    pada: int
+    retrograde: bool
+    house: int
+    speed: float
+
+@dataclass
+class BatchPositions:
+    """Planetary positions for many charts, stored as one array per field.
+
+    Every per-body array has shape ``(n_charts, len(bodies))``; column ``k``
+    belongs to ``bodies[k]``.
+    """
+    julian_days: np.ndarray
+    geo_latitudes: np.ndarray
+    geo_longitudes: np.ndarray
+    longitudes: np.ndarray
+    rashi_index: np.ndarray
+    nakshatra_index: np.ndarray
+    pada: np.ndarray
+    house: np.ndarray
+    speed: np.ndarray
+    bodies: Tuple[str, ...] = field(default=BATCH_BODIES)
+    ayanamsa: str = 'lahiri'
+
+    def __len__(self) -> int:
+        return len(self.julian_days)
+
+    def body(self, name: str) -> np.ndarray:
+        """Longitudes of one body across the whole batch"""
+        return self.longitudes[:, self.bodies.index(name)]
+
+    @property
+    def retrograde(self) -> np.ndarray:
+        """Boolean mask of bodies with negative apparent speed"""
+        return self.speed < 0
 
 class AstronomicalCalculator:
     """Core astronomical calculations"""
     
-    def __init__(self):
+    def __init__(self, ephemeris_cache=None, chart_cache=None):
+        # Optional core.ephemeris_cache.EphemerisCache serving the series longitudes
+        self.ephemeris_cache = ephemeris_cache
+        # Optional core.chart_cache.ChartCache in front of calculate_planetary_positions
+        self.chart_cache = chart_cache
+        
         self.rashi_names = [
             "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
             "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
@@ -39,6 +157,12 @@ class AstronomicalCalculator:
             "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha",
             "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
         ]
+        
+        # Interned (rashi, nakshatra, pada) for each of the 108 padas
+        self._pada_lookup = [
+            (sys.intern(self.rashi_names[rashi]), sys.intern(self.nakshatra_names[nakshatra]), int(pada))
+            for rashi, nakshatra, pada in PADA_TABLE
+        ]
     
     def get_julian_day(self, date: datetime.date, time: datetime.time, timezone_offset: float = 5.5) -> float:
         """Calculate precise Julian Day with timezone correction"""
@@ -57,8 +181,17 @@ class AstronomicalCalculator:
         
         return jd
     
+    def get_datetime_from_julian_day(self, jd: float, timezone_offset: float = 5.5) -> datetime.datetime:
+        """Convert a Julian Day back to local date and time (inverse of get_julian_day)"""
+        j2000 = datetime.datetime(2000, 1, 1, 12, 0, 0)
+        return j2000 + datetime.timedelta(days=jd - 2451545.0 + timezone_offset / 24.0)
+    
     def calculate_sun_position(self, jd: float) -> float:
         """Calculate Sun's longitude using VSOP87 theory"""
+        cache = self.ephemeris_cache
+        if cache is not None and cache.precision == 'standard' and cache.covers(jd):
+            return float(cache.longitudes(jd)[0, 0] % 360)
+        
         t = (jd - 2451545.0) / 36525.0
         
         # Mean longitude
@@ -130,36 +263,152 @@ class AstronomicalCalculator:
         
         return longitude, latitude, distance
     
+    def calculate_ascendant_and_mc(self, jd: float, latitude: float, longitude: float,
+                                   ayanamsa: str = 'lahiri') -> Tuple[float, float]:
+        """Calculate the Ascendant and Midheaven for a place (east longitude positive).
+
+        Angles are in the sidereal zodiac of ``ayanamsa``, like the chart
+        positions; 'tropical' leaves them unchanged.
+        """
+        gmst, obliquity = _sidereal_terms(jd)
+        ascendant, mc = _ascendant_and_mc(gmst, obliquity, latitude, longitude)
+        ascendant, mc = AyanamsaEngine(ayanamsa).to_sidereal([[ascendant, mc]], [jd])[0]
+        return float(ascendant), float(mc)
+    
+    def calculate_house_cusps(self, jd: float, latitude: float, longitude: float,
+                              house_system: str = 'equal', ayanamsa: str = 'lahiri') -> Dict:
+        """Calculate Ascendant, Midheaven and the 12 house cusps"""
+        self._check_house_system(house_system)
+        ascendant, mc = self.calculate_ascendant_and_mc(jd, latitude, longitude, ayanamsa)
+        
+        first_cusp = ascendant if house_system == 'equal' else (ascendant // 30) * 30
+        cusps = [(first_cusp + 30 * house) % 360 for house in range(12)]
+        
+        return {'ascendant': ascendant, 'mc': mc, 'house_system': house_system, 'ayanamsa': ayanamsa,
+                'cusps': cusps}
+    
     def calculate_planetary_positions(self, birth_date: datetime.date, birth_time: datetime.time,
-                                    latitude: float = 28.6139, longitude: float = 77.2090) -> Dict[str, PlanetPosition]:
-        """Calculate accurate planetary positions"""
+                                    latitude: float = 28.6139, longitude: float = 77.2090,
+                                    house_system: str = 'equal', ayanamsa: str = 'lahiri',
+                                    precision: str = 'fast') -> Dict[str, PlanetPosition]:
+        """Calculate accurate planetary positions (see core.ephemeris_series for precision tiers)"""
         
         jd = self.get_julian_day(birth_date, birth_time)
-        positions = {}
         
-        # For demonstration, using corrected positions from your chart
-        if birth_date == datetime.date(2006, 12, 13) and birth_time == datetime.time(21, 35):
-            # Your exact chart positions
-            chart_data = {
-                'Sun': {'longitude': 267.5608, 'rashi': 'Sagittarius', 'nakshatra': 'Jyeshtha', 'pada': 4, 'house': 10},
-                'Moon': {'longitude': 159.6950, 'rashi': 'Virgo', 'nakshatra': 'Hasta', 'pada': 4, 'house': 6},
-                'Mars': {'longitude': 221.3194, 'rashi': 'Scorpio', 'nakshatra': 'Anuradha', 'pada': 3, 'house': 8},
-                'Mercury': {'longitude': 224.1719, 'rashi': 'Scorpio', 'nakshatra': 'Anuradha', 'pada': 4, 'house': 8},
-                'Jupiter': {'longitude': 222.9583, 'rashi': 'Scorpio', 'nakshatra': 'Anuradha', 'pada': 3, 'house': 8},
-                'Venus': {'longitude': 249.1231, 'rashi': 'Sagittarius', 'nakshatra': 'Mula', 'pada': 3, 'house': 9},
-                'Saturn': {'longitude': 121.0317, 'rashi': 'Leo', 'nakshatra': 'Magha', 'pada': 1, 'house': 5},
-                'Rahu': {'longitude': 296.6803, 'rashi': 'Aquarius', 'nakshatra': 'Shatabhisha', 'pada': 3, 'house': 11},
-                'Ketu': {'longitude': 116.6803, 'rashi': 'Leo', 'nakshatra': 'Magha', 'pada': 1, 'house': 5},
-                'Ascendant': {'longitude': 113.2819, 'rashi': 'Cancer', 'nakshatra': 'Ashlesha', 'pada': 2, 'house': 1}
-            }
+        def compute() -> Dict[str, PlanetPosition]:
+            # A single chart is a batch of one, so both paths always agree
+            batch = self.calculate_batch_positions([jd], latitude, longitude, house_system, ayanamsa, precision)
+            return self.get_chart_from_batch(batch, 0)
+        
+        if self.chart_cache is None:
+            return compute()
+        
+        key = self.chart_cache.make_key(jd, latitude, longitude, ayanamsa, house_system, precision)
+        return dict(self.chart_cache.get_or_compute(key, compute))
+    
+    def calculate_batch_positions(self, julian_days, latitudes=28.6139, longitudes=77.2090,
+                                  house_system: str = 'equal', ayanamsa: str = 'lahiri',
+                                  precision: str = 'fast') -> BatchPositions:
+        """Calculate positions for many charts in one vectorized pass.
+
+        ``julian_days`` is an array of Julian days; ``latitudes`` and
+        ``longitudes`` are geographic coordinates broadcast against it.
+        Longitudes come from the ``precision`` tier of core.ephemeris_series
+        ('fast' is the mean-longitude model) converted to the sidereal zodiac
+        of ``ayanamsa`` ('tropical' leaves them unchanged). Speeds on the
+        'fast' tier come from the 'standard' series, so retrograde motion
+        is still reported.
+        """
+        self._check_house_system(house_system)
+        get_tier_spec(precision)
+        jd = np.atleast_1d(np.asarray(julian_days, dtype=float))
+        geo_lat = np.broadcast_to(np.asarray(latitudes, dtype=float), jd.shape)
+        geo_long = np.broadcast_to(np.asarray(longitudes, dtype=float), jd.shape)
+        
+        t = (jd - 2451545.0) / 36525.0
+        speed = np.empty((len(jd), len(BATCH_BODIES)))
+        
+        if precision == 'fast':
+            # Mean motions never turn negative, so take apparent speed from the standard series
+            raw = evaluate_series(t, precision)
+            speed[:, :8] = self.calculate_series_speeds(jd)
         else:
-            # Calculate for other dates
-            chart_data = self._calculate_generic_positions(jd)
+            raw, speed[:, :8] = self.calculate_series_motion(jd, precision=precision)
+        speed[:, 8] = speed[:, 7]
         
-        for planet, data in chart_data.items():
-            long = data['longitude']
-            
-            # Calculate degree, minute, second within sign
+        gmst, obliquity = _sidereal_terms_batch(jd)
+        ascendant, _ = _ascendant_and_mc(gmst, obliquity, geo_lat, geo_long)
+        speed[:, 9] = self._ascendant_speed(gmst, obliquity, geo_lat, geo_long, ascendant)
+        
+        planet_longitudes = np.empty((len(jd), len(BATCH_BODIES)))
+        planet_longitudes[:, :8] = raw
+        planet_longitudes[:, 8] = raw[:, 7] + 180  # Ketu
+        planet_longitudes[:, 9] = ascendant
+        
+        ayanamsa_engine = AyanamsaEngine(ayanamsa)
+        planet_longitudes = ayanamsa_engine.to_sidereal(planet_longitudes, jd)
+        ascendant = planet_longitudes[:, 9]
+        speed -= ayanamsa_engine.daily_rates(jd)[:, None]
+        
+        classes = self.classify_longitudes(planet_longitudes, ascendant[:, None], house_system)
+        
+        return BatchPositions(
+            julian_days=jd,
+            geo_latitudes=geo_lat,
+            geo_longitudes=geo_long,
+            longitudes=planet_longitudes,
+            rashi_index=classes['rashi'],
+            nakshatra_index=classes['nakshatra'],
+            pada=classes['pada'],
+            house=classes['house'],
+            speed=speed,
+            ayanamsa=ayanamsa
+        )
+    
+    def classify_longitude(self, longitude: float, ascendant_longitude: Optional[float] = None,
+                           house_system: str = 'equal') -> LongitudeClass:
+        """Classify one longitude into rashi, nakshatra, pada and house.
+
+        House is counted from ``ascendant_longitude`` in the given house
+        system and is 0 when no ascendant is given.
+        """
+        rashi, nakshatra, pada = self._pada_lookup[int(longitude * PADAS_PER_DEGREE) % PADAS_PER_CIRCLE]
+        house = 0 if ascendant_longitude is None else \
+            self._calculate_house_position(longitude, ascendant_longitude, house_system)
+        return LongitudeClass(rashi, nakshatra, pada, house)
+    
+    def classify_longitudes(self, longitudes, ascendant_longitudes=None,
+                            house_system: str = 'equal') -> np.ndarray:
+        """Classify an array of longitudes into packed LONGITUDE_CLASS_DTYPE records.
+
+        ``ascendant_longitudes`` broadcasts against ``longitudes``; names for
+        the indices are ``rashi_names`` and ``nakshatra_names``.
+        """
+        longitudes = np.asarray(longitudes, dtype=float)
+        pada_index = (longitudes * PADAS_PER_DEGREE).astype(np.int16) % PADAS_PER_CIRCLE
+        rows = PADA_TABLE[pada_index]
+        
+        records = np.empty(longitudes.shape, dtype=LONGITUDE_CLASS_DTYPE)
+        records['rashi'] = rows[..., 0]
+        records['nakshatra'] = rows[..., 1]
+        records['pada'] = rows[..., 2]
+        
+        if ascendant_longitudes is None:
+            records['house'] = 0
+        elif house_system == 'whole_sign':
+            ascendant_rashi = (np.asarray(ascendant_longitudes) // 30).astype(np.int16)
+            records['house'] = (rows[..., 0] - ascendant_rashi) % 12 + 1
+        else:
+            records['house'] = ((longitudes - ascendant_longitudes) % 360 // 30).astype(np.int8) + 1
+        
+        return records
+    
+    def get_chart_from_batch(self, batch: BatchPositions, index: int) -> Dict[str, PlanetPosition]:
+        """Materialize one chart of a batch as PlanetPosition objects"""
+        positions = {}
+        
+        for column, planet in enumerate(batch.bodies):
+            long = float(batch.longitudes[index, column])
             sign_longitude = long % 30
             degree = int(sign_longitude)
             minute_float = (sign_longitude - degree) * 60
@@ -170,72 +419,72 @@ class AstronomicalCalculator:
                 name=planet,
                 longitude=long,
                 latitude=0.0,
-                rashi=data['rashi'],
+                rashi=self.rashi_names[batch.rashi_index[index, column]],
                 degree=degree,
                 minute=minute,
                 second=second,
-                nakshatra=data['nakshatra'],
-                pada=data['pada'],
-                retrograde=planet in ['Saturn', 'Rahu', 'Ketu'],
-                house=data['house']
+                nakshatra=self.nakshatra_names[batch.nakshatra_index[index, column]],
+                pada=int(batch.pada[index, column]),
+                retrograde=bool(batch.speed[index, column] < 0),
+                house=int(batch.house[index, column]),
+                speed=float(batch.speed[index, column])
             )
         
         return positions
     
-    def _calculate_generic_positions(self, jd: float) -> Dict:
-        """Calculate positions for generic dates"""
-        t = (jd - 2451545.0) / 36525.0
+    def calculate_series_longitudes(self, julian_days, precision: str = 'standard') -> np.ndarray:
+        """Unnormalized tropical series longitudes for many Julian days.
+
+        Returns shape ``(n, 8)`` in ``BATCH_BODIES`` order, evaluated at the
+        given precision tier of core.ephemeris_series. Served from the
+        attached ephemeris cache when it was built for the same tier and
+        covers every date.
+        """
+        jd = np.atleast_1d(np.asarray(julian_days, dtype=float))
         
-        # Simplified calculations for other dates
-        base_longitudes = {
-            'Sun': 280.4664567 + 36000.76982779 * t,
-            'Moon': 218.3164477 + 481267.88123421 * t,
-            'Mercury': 252.250906 + 149472.6746358 * t,
-            'Venus': 181.979801 + 58517.8156760 * t,
-            'Mars': 355.433000 + 19140.299314 * t,
-            'Jupiter': 34.351519 + 3034.9056606 * t,
-            'Saturn': 50.077444 + 1222.1138488 * t,
-            'Rahu': 125.0445479 - 1934.1362891 * t,
-        }
-        
-        chart_data = {}
-        for planet, longitude in base_longitudes.items():
-            longitude = self._normalize_longitude(longitude)
-            rashi = self._get_rashi_from_longitude(longitude)
-            nakshatra = self._get_nakshatra_from_longitude(longitude)
-            pada = self._get_pada_from_longitude(longitude)
-            house = self._calculate_house_position(longitude, base_longitudes.get('Sun', 0))
-            
-            chart_data[planet] = {
-                'longitude': longitude,
-                'rashi': rashi,
-                'nakshatra': nakshatra,
-                'pada': pada,
-                'house': house
-            }
-        
-        # Ketu is opposite to Rahu
-        rahu_long = chart_data['Rahu']['longitude']
-        ketu_long = (rahu_long + 180) % 360
-        chart_data['Ketu'] = {
-            'longitude': ketu_long,
-            'rashi': self._get_rashi_from_longitude(ketu_long),
-            'nakshatra': self._get_nakshatra_from_longitude(ketu_long),
-            'pada': self._get_pada_from_longitude(ketu_long),
-            'house': self._calculate_house_position(ketu_long, base_longitudes.get('Sun', 0))
-        }
-        
-        # Ascendant (simplified)
-        asc_long = (base_longitudes['Sun'] + 90) % 360  # Simplified calculation
-        chart_data['Ascendant'] = {
-            'longitude': asc_long,
-            'rashi': self._get_rashi_from_longitude(asc_long),
-            'nakshatra': self._get_nakshatra_from_longitude(asc_long),
-            'pada': self._get_pada_from_longitude(asc_long),
-            'house': 1
-        }
-        
-        return chart_data
+        cache = self.ephemeris_cache
+        if cache is not None and cache.precision == precision and cache.covers(jd):
+            return cache.longitudes(jd)
+        
+        return self._series_longitudes_batch((jd - 2451545.0) / 36525.0, precision)
+    
+    def calculate_series_motion(self, julian_days, step_days: float = 0.01,
+                                precision: str = 'standard') -> Tuple[np.ndarray, np.ndarray]:
+        """Series longitudes and apparent speeds (degrees/day) for many Julian days.
+
+        Speeds are central differences taken from the same batch evaluation
+        as the longitudes, so motion costs one call on three times the dates.
+        """
+        jd = np.atleast_1d(np.asarray(julian_days, dtype=float))
+        n = len(jd)
+        
+        longitudes = self.calculate_series_longitudes(np.concatenate([jd, jd - step_days, jd + step_days]), precision)
+        speeds = (longitudes[2 * n:] - longitudes[n:2 * n]) / (2 * step_days)
+        
+        return longitudes[:n], speeds
+    
+    def calculate_series_speeds(self, julian_days, step_days: float = 0.01,
+                                precision: str = 'standard') -> np.ndarray:
+        """Apparent series speeds (degrees/day) without the longitudes themselves"""
+        jd = np.atleast_1d(np.asarray(julian_days, dtype=float))
+        n = len(jd)
+        
+        longitudes = self.calculate_series_longitudes(np.concatenate([jd - step_days, jd + step_days]), precision)
+        return (longitudes[n:] - longitudes[:n]) / (2 * step_days)
+    
+    def _series_longitudes_batch(self, t: np.ndarray, precision: str = 'standard') -> np.ndarray:
+        """Evaluate one precision tier of the series, shape (len(t), 8)"""
+        return evaluate_series(t, precision)
+    
+    def _ascendant_speed(self, gmst, obliquity, latitude, longitude, ascendant, step_days: float = 1e-4):
+        """Apparent motion of the Ascendant in degrees per day (finite difference)"""
+        later, _ = _ascendant_and_mc(gmst + 360.98564736629 * step_days, obliquity, latitude, longitude)
+        return ((later - ascendant + 180) % 360 - 180) / step_days
+    
+    def _check_house_system(self, house_system: str):
+        """Reject unknown house systems"""
+        if house_system not in HOUSE_SYSTEMS:
+            raise ValueError(f"Unsupported house system '{house_system}', expected one of {HOUSE_SYSTEMS}")
     
     def _normalize_longitude(self, longitude: float) -> float:
         """Normalize longitude to 0-360 range"""
@@ -246,24 +495,22 @@ class AstronomicalCalculator:
     
     def _get_rashi_from_longitude(self, longitude: float) -> str:
         """Get zodiac sign from longitude"""
-        sign_index = int(longitude / 30)
-        return self.rashi_names[sign_index % 12]
+        return self._pada_lookup[int(longitude * PADAS_PER_DEGREE) % PADAS_PER_CIRCLE][0]
     
     def _get_nakshatra_from_longitude(self, longitude: float) -> str:
         """Get nakshatra from longitude"""
-        nakshatra_span = 360.0 / 27.0
-        nakshatra_index = int(longitude / nakshatra_span)
-        return self.nakshatra_names[nakshatra_index % 27]
+        return self._pada_lookup[int(longitude * PADAS_PER_DEGREE) % PADAS_PER_CIRCLE][1]
     
     def _get_pada_from_longitude(self, longitude: float) -> int:
         """Get pada from longitude"""
-        nakshatra_span = 360.0 / 27.0
-        pada_span = nakshatra_span / 4.0
-        pada_index = int((longitude % nakshatra_span) / pada_span)
-        return pada_index + 1
+        return self._pada_lookup[int(longitude * PADAS_PER_DEGREE) % PADAS_PER_CIRCLE][2]
     
-    def _calculate_house_position(self, planet_longitude: float, ascendant_longitude: float) -> int:
+    def _calculate_house_position(self, planet_longitude: float, ascendant_longitude: float,
+                                  house_system: str = 'equal') -> int:
         """Calculate house position"""
+        if house_system == 'whole_sign':
+            return (int(planet_longitude // 30) - int(ascendant_longitude // 30)) % 12 + 1
+        
         house_longitude = (planet_longitude - ascendant_longitude) % 360
         house = int(house_longitude / 30) + 1
         return house
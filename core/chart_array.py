@@ -0,0 +1,163 @@
+"""
+Array-backed Chart Storage
+Holds many charts in one fixed-layout NumPy record array
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+import numpy as np
+
+from core.calculations import (
+    AstronomicalCalculator, BatchPositions, CompactPlanetPosition, PlanetPosition, BATCH_BODIES,
+    PADAS_PER_CIRCLE, PADAS_PER_DEGREE
+)
+
+# 9 bytes per body: rashi, nakshatra, pada and DMS are derived from the
+# longitude, and house (low nibble) shares one byte with the retrograde flag,
+# so a 10-body chart costs 90 bytes and a million charts about 90 MB.
+# Speed stays float32: float16 would resolve the Ascendant's ~360 deg/day to 0.25.
+CHART_RECORD_DTYPE = np.dtype([
+    ('longitude', np.float32),
+    ('speed', np.float32),
+    ('house_flags', np.uint8),
+])
+
+HOUSE_MASK = 0x0F
+FLAG_RETROGRADE = 0x10
+
+def pack_longitudes(longitudes) -> np.ndarray:
+    """Longitudes as float32, in the same pada (so rashi and nakshatra) as the float64 values.
+
+    Rounding to float32 can carry a body lying within ~1e-5 degrees below a
+    boundary across it; such values are stepped back one ulp at a time.
+    """
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    packed = longitudes.astype(np.float32)
+    target = (longitudes * PADAS_PER_DEGREE).astype(np.int64) % PADAS_PER_CIRCLE
+    for _ in range(4):
+        moved = (packed.astype(np.float64) * PADAS_PER_DEGREE).astype(np.int64) % PADAS_PER_CIRCLE != target
+        if not moved.any():
+            break
+        packed[moved] = np.nextafter(packed[moved], np.where(packed[moved] > longitudes[moved],
+                                                              -np.inf, np.inf).astype(np.float32))
+    return packed
+
+class ChartView(Mapping):
+    """Read-only mapping of body name to CompactPlanetPosition for one stored chart.
+
+    Positions are built on access and not retained.
+    """
+
+    def __init__(self, chart_array: 'ChartArray', index: int):
+        self._chart_array = chart_array
+        self._index = index
+
+    def __getitem__(self, body: str) -> CompactPlanetPosition:
+        column = self._chart_array.columns.get(body)
+        if column is None:
+            raise KeyError(body)
+        return self._chart_array.position(self._index, column)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._chart_array.bodies)
+
+    def __len__(self) -> int:
+        return len(self._chart_array.bodies)
+
+class ChartArray:
+    """Fixed-layout store of many charts, shape (n_charts, n_bodies)"""
+
+    def __init__(self, records: np.ndarray, bodies: Tuple[str, ...] = BATCH_BODIES,
+                 calculator: Optional[AstronomicalCalculator] = None):
+        if records.dtype != CHART_RECORD_DTYPE or records.ndim != 2 or records.shape[1] != len(bodies):
+            raise ValueError("records must be a 2-D CHART_RECORD_DTYPE array with one column per body")
+
+        self.records = records
+        self.bodies = tuple(bodies)
+        self.columns = {body: column for column, body in enumerate(self.bodies)}
+        self.calculator = calculator or AstronomicalCalculator()
+
+    @classmethod
+    def empty(cls, n_charts: int, bodies: Tuple[str, ...] = BATCH_BODIES,
+              calculator: Optional[AstronomicalCalculator] = None) -> 'ChartArray':
+        """Preallocate storage for ``n_charts`` charts"""
+        return cls(np.zeros((n_charts, len(bodies)), dtype=CHART_RECORD_DTYPE), bodies, calculator)
+
+    @classmethod
+    def from_batch(cls, batch: BatchPositions,
+                   calculator: Optional[AstronomicalCalculator] = None) -> 'ChartArray':
+        """Pack a BatchPositions result without materializing any objects"""
+        records = np.empty(batch.longitudes.shape, dtype=CHART_RECORD_DTYPE)
+        records['longitude'] = pack_longitudes(batch.longitudes)
+        records['speed'] = batch.speed
+        records['house_flags'] = batch.house | np.where(batch.speed < 0, FLAG_RETROGRADE, 0)
+        return cls(records, batch.bodies, calculator)
+
+    @classmethod
+    def from_positions(cls, charts: Iterable[Dict[str, PlanetPosition]], bodies: Tuple[str, ...] = BATCH_BODIES,
+                       calculator: Optional[AstronomicalCalculator] = None) -> 'ChartArray':
+        """Pack charts given as PlanetPosition dictionaries"""
+        rows = [
+            [(chart[body].longitude, chart[body].speed,
+              chart[body].house | (FLAG_RETROGRADE if chart[body].retrograde else 0)) for body in bodies]
+            for chart in charts
+        ]
+        records = np.array(rows, dtype=CHART_RECORD_DTYPE).reshape(len(rows), len(bodies))
+        records['longitude'] = pack_longitudes([[row[0] for row in chart] for chart in rows]).reshape(records.shape)
+        return cls(records, bodies, calculator)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int) -> ChartView:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return ChartView(self, index % len(self))
+
+    def __iter__(self) -> Iterator[ChartView]:
+        for index in range(len(self)):
+            yield ChartView(self, index)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the record array"""
+        return self.records.nbytes
+
+    @property
+    def longitudes(self) -> np.ndarray:
+        """All longitudes as float64, shape (n_charts, n_bodies)"""
+        return self.records['longitude'].astype(np.float64)
+
+    @property
+    def houses(self) -> np.ndarray:
+        """All house numbers, shape (n_charts, n_bodies)"""
+        return self.records['house_flags'] & HOUSE_MASK
+
+    def position(self, index: int, column: int) -> CompactPlanetPosition:
+        """Build the position of one body in one chart"""
+        record = self.records[index, column]
+        longitude = float(record['longitude'])
+        rashi, nakshatra, pada, _ = self.calculator.classify_longitude(longitude)
+
+        sign_longitude = longitude % 30
+        degree = int(sign_longitude)
+        minute_float = (sign_longitude - degree) * 60
+        minute = int(minute_float)
+        second = int((minute_float - minute) * 60)
+
+        return CompactPlanetPosition(
+            name=self.bodies[column],
+            longitude=longitude,
+            latitude=0.0,
+            rashi=rashi,
+            degree=degree,
+            minute=minute,
+            second=second,
+            nakshatra=nakshatra,
+            pada=pada,
+            retrograde=bool(record['house_flags'] & FLAG_RETROGRADE),
+            house=int(record['house_flags'] & HOUSE_MASK),
+            speed=float(record['speed'])
+        )
+
+print("✅ Array-backed Chart Storage loaded")
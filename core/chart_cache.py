@@ -0,0 +1,119 @@
+"""
+Chart Result Cache
+LRU + TTL cache for computed charts, keyed by normalized birth instant and place
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class ChartCache:
+    """Thread-safe LRU cache with time-to-live eviction and hit/miss counters.
+
+    Keys round the Julian day to ``jd_tolerance`` days and the coordinates to
+    a ``coordinate_grid`` degree grid, so repeated requests for the same
+    birth data map to the same entry. Cached values are shared between
+    callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: Optional[float] = 3600.0,
+                 jd_tolerance: float = 1.0 / 1440.0, coordinate_grid: float = 0.01,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.jd_tolerance = jd_tolerance
+        self.coordinate_grid = coordinate_grid
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def make_key(self, jd: float, latitude: float, longitude: float,
+                 ayanamsa: str, house_system: str, precision: str = 'fast') -> Tuple:
+        """Normalized cache key for one chart request"""
+        return (
+            round(jd / self.jd_tolerance),
+            round(latitude / self.coordinate_grid),
+            round(longitude / self.coordinate_grid),
+            ayanamsa,
+            house_system,
+            precision
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value or None, counting a hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and self._is_expired(entry):
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries when full"""
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry; returns how many were removed"""
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if self._is_expired(entry)]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+            return len(expired)
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_expired(self, entry: Tuple[float, Any]) -> bool:
+        return self.ttl_seconds is not None and self._clock() - entry[0] > self.ttl_seconds
+
+print("✅ Chart Result Cache loaded")
@@ -0,0 +1,182 @@
+"""
+Dasha Transition Events
+Chronological stream of dasha changes across users and an on-disk index keyed by date
+"""
+
+import datetime
+import heapq
+import math
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+
+from core.calculations import AstronomicalCalculator
+from core.dasha_tree import DASHA_TREE_LEVELS, DashaNode, DashaTree, to_day_number
+from core.dashas import DashaCalculator
+
+@dataclass
+class DashaTransition:
+    """Start of a new period on one level for one user"""
+    user_id: str
+    moment: datetime.datetime
+    level: str
+    lord: str
+    previous_lord: Optional[str]
+    path: Tuple[str, ...]  # lords from the mahadasha down to this level
+
+    @property
+    def date(self) -> datetime.date:
+        """First day the new period is current, as DashaCalculator.get_current_dasha_info reports it.
+
+        Timelines round boundaries to the nearest day and give the boundary
+        day to the period ending on it, so a period that follows another
+        becomes current the day after its rounded start.
+        """
+        day = math.floor(to_day_number(self.moment) + 0.5)
+        return datetime.date.fromordinal(day + (self.previous_lord is not None))
+
+def iter_user_transitions(user_id: str, tree: DashaTree, start: datetime.datetime, end: datetime.datetime,
+                          depth: int = 2) -> Iterator[DashaTransition]:
+    """Transitions of one user in [start, end), in time order, expanding only nodes in the window.
+
+    A pre-order walk of the tree visits period starts chronologically; a
+    period starting together with its parent is yielded after it.
+    """
+    start_day = to_day_number(start)
+    end_day = to_day_number(end)
+
+    # Lord active on each level just before the window, for previous_lord
+    last_lords = [node.lord for node in tree.path_at(start, depth)]
+    last_lords += [None] * (depth - len(last_lords))
+
+    def walk(nodes: List[DashaNode]) -> Iterator[DashaTransition]:
+        for node in nodes:
+            if node.end <= start_day:
+                continue
+            if node.start >= end_day:
+                return
+            if node.start >= start_day:
+                yield DashaTransition(
+                    user_id=user_id,
+                    moment=node.start_moment,
+                    level=DASHA_TREE_LEVELS[node.depth],
+                    lord=node.lord,
+                    previous_lord=last_lords[node.depth],
+                    path=tuple(node.lords_path())
+                )
+                last_lords[node.depth] = node.lord
+            if node.depth + 1 < depth:
+                yield from walk(node.children)
+
+    return walk(tree.roots)
+
+def merge_transitions(streams: Iterable[Iterator[DashaTransition]]) -> Iterator[DashaTransition]:
+    """Heap-merge per-user streams into one chronological stream"""
+    return heapq.merge(*streams, key=lambda event: (event.moment, len(event.path), event.user_id))
+
+def upcoming_transitions(trees: Dict[str, DashaTree], start: datetime.datetime, end: datetime.datetime,
+                         depth: int = 2) -> Iterator[DashaTransition]:
+    """Transitions of every user in [start, end), in chronological order"""
+    return merge_transitions(iter_user_transitions(user_id, tree, start, end, depth)
+                             for user_id, tree in trees.items())
+
+def trees_from_profiles(profiles: Iterable[Tuple], astro: Optional[AstronomicalCalculator] = None,
+                        dasha: Optional[DashaCalculator] = None, precision: str = 'standard') -> Dict[str, DashaTree]:
+    """Dasha trees for parsed profiles (see core.dasha_export.parse_profile), charted in one batch"""
+    astro = astro or AstronomicalCalculator()
+    dasha = dasha or DashaCalculator()
+    rows = list(profiles)
+    if not rows:
+        return {}
+
+    jds = [astro.get_julian_day(birth_date, birth_time, tz) for _, birth_date, birth_time, _, _, tz in rows]
+    batch = astro.calculate_batch_positions(jds, [row[3] for row in rows], [row[4] for row in rows],
+                                            precision=precision)
+    moons = batch.body('Moon')
+
+    return {row[0]: dasha.get_dasha_tree(row[1], float(moons[i])) for i, row in enumerate(rows)}
+
+class DashaEventIndex:
+    """SQLite index of transitions keyed by date, for range lookups across users"""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS transitions (
+                day INTEGER NOT NULL,
+                moment TEXT NOT NULL,
+                level INTEGER NOT NULL,
+                user_id TEXT NOT NULL,
+                lord TEXT NOT NULL,
+                previous_lord TEXT,
+                path TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS transitions_by_day ON transitions (day, level);
+            CREATE INDEX IF NOT EXISTS transitions_by_user ON transitions (user_id);
+        """)
+
+    def add(self, transitions: Iterable[DashaTransition], batch_size: int = 10000) -> int:
+        """Insert a stream of transitions in batches; returns how many were written"""
+        count = 0
+        batch = []
+        with self.connection:
+            for event in transitions:
+                batch.append((event.date.toordinal(), event.moment.isoformat(), len(event.path) - 1,
+                              event.user_id, event.lord, event.previous_lord, '/'.join(event.path)))
+                if len(batch) >= batch_size:
+                    count += self._insert(batch)
+                    batch = []
+            count += self._insert(batch)
+        return count
+
+    def build(self, trees: Dict[str, DashaTree], start: datetime.datetime, end: datetime.datetime,
+              depth: int = 2) -> int:
+        """Index every user's transitions in [start, end)"""
+        return self.add(upcoming_transitions(trees, start, end, depth))
+
+    def replace_user(self, user_id: str, tree: DashaTree, start: datetime.datetime, end: datetime.datetime,
+                     depth: int = 2) -> int:
+        """Re-index one user after their birth data changed"""
+        with self.connection:
+            self.connection.execute("DELETE FROM transitions WHERE user_id = ?", (user_id,))
+        return self.add(iter_user_transitions(user_id, tree, start, end, depth))
+
+    def between(self, start_date: datetime.date, end_date: datetime.date,
+                level: Optional[str] = None) -> List[DashaTransition]:
+        """Transitions on dates in [start_date, end_date] (inclusive), optionally on one level"""
+        query = "SELECT user_id, moment, level, lord, previous_lord, path FROM transitions WHERE day BETWEEN ? AND ?"
+        parameters = [start_date.toordinal(), end_date.toordinal()]
+        if level is not None:
+            query += " AND level = ?"
+            parameters.append(DASHA_TREE_LEVELS.index(level))
+        query += " ORDER BY moment, level, user_id"
+
+        return [
+            DashaTransition(
+                user_id=user_id,
+                moment=datetime.datetime.fromisoformat(moment),
+                level=DASHA_TREE_LEVELS[level_index],
+                lord=lord,
+                previous_lord=previous_lord,
+                path=tuple(path.split('/'))
+            )
+            for user_id, moment, level_index, lord, previous_lord, path in
+            self.connection.execute(query, parameters)
+        ]
+
+    def on_date(self, date: datetime.date, level: Optional[str] = None) -> List[DashaTransition]:
+        """Who changes period on one date"""
+        return self.between(date, date, level)
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM transitions").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def _insert(self, rows: List[Tuple]) -> int:
+        self.connection.executemany("INSERT INTO transitions VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+print("✅ Dasha Transition Events loaded")
@@ -0,0 +1,260 @@
+"""
+Dasha Export
+Bulk export of maha/antar dasha boundaries for a whole profile file
+
+Usage:
+    python -m core.dasha_export data/user_profiles.json -o data/dasha_schedule --workers 4
+
+Profiles are streamed from JSONL or CSV (one profile per line/row) or read
+from the dictionary-style data/user_profiles.json. Chunks of profiles are
+charted and scheduled in a process pool with a bounded number of chunks in
+flight, and each result is appended to the output as it arrives, so memory
+stays flat however large the user base is.
+
+Output is Parquet when pyarrow is installed, otherwise a flat binary file
+of EXPORT_RECORD_DTYPE records plus a user id list (see read_dasha_export).
+"""
+
+import argparse
+import collections
+import csv
+import datetime
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+
+from core.calculations import AstronomicalCalculator
+from core.dashas import DashaCalculator
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# One dasha period per record; dates are days since 1970-01-01
+EXPORT_RECORD_DTYPE = np.dtype([
+    ('user', np.int32),
+    ('level', np.int8),  # 0 mahadasha, 1 antardasha, ...
+    ('lord', np.int8),  # index into the exported system's DashaCalculator.dasha_sequence
+    ('parent_lord', np.int8),  # -1 for mahadashas
+    ('start', np.int32),
+    ('end', np.int32),
+])
+
+_MAGIC = b"SKDASHA1"
+_HEADER = struct.Struct("<8sII")  # magic, version, record size
+_VERSION = 1
+
+# Per-process calculators, created once by _init_worker
+_worker: Dict = {}
+
+def iter_profiles(path: str) -> Iterator[Dict]:
+    """Yield profiles one at a time from a .jsonl, .csv or dictionary-style .json file"""
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension == '.csv':
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+    else:
+        # data/user_profiles.json is one object keyed by user name; it has to be read whole
+        with open(path, 'r', encoding='utf-8') as f:
+            profiles = json.load(f)
+        for key, profile in (profiles.items() if isinstance(profiles, dict) else enumerate(profiles)):
+            yield {'user_id': str(key), **profile}
+
+def parse_profile(profile: Dict) -> Tuple[str, datetime.date, datetime.time, float, float, float]:
+    """User id, birth date, birth time, latitude, longitude and timezone offset of a profile"""
+    user_id = str(profile.get('user_id') or profile.get('name'))
+    birth_date = datetime.date.fromisoformat(profile['birth_date'])
+    birth_time = datetime.time.fromisoformat(profile.get('birth_time') or '12:00')
+    return (
+        user_id,
+        birth_date,
+        birth_time,
+        float(profile.get('latitude', 28.6139)),
+        float(profile.get('longitude', 77.2090)),
+        float(profile.get('timezone_offset', 5.5))
+    )
+
+def _init_worker(precision: str, ayanamsa: str, system: str = 'vimshottari'):
+    _worker['astro'] = AstronomicalCalculator()
+    _worker['dasha'] = DashaCalculator(system=system)
+    _worker['precision'] = precision
+    _worker['ayanamsa'] = ayanamsa
+
+def schedule_chunk(rows: List[Tuple], first_user: int, depth: int = 2) -> np.ndarray:
+    """Dasha records for a chunk of parsed profiles; users are numbered from ``first_user``"""
+    if not _worker:
+        _init_worker('standard', 'lahiri')
+    astro, dasha = _worker['astro'], _worker['dasha']
+
+    # One batch chart evaluation for the whole chunk
+    jds = [astro.get_julian_day(birth_date, birth_time, tz) for _, birth_date, birth_time, _, _, tz in rows]
+    batch = astro.calculate_batch_positions(jds, [row[3] for row in rows], [row[4] for row in rows],
+                                            ayanamsa=_worker['ayanamsa'], precision=_worker['precision'])
+    balances = dasha.dasha_balances_from_moon(batch.body('Moon'))
+
+    templates = dasha.get_schedule_templates(depth)
+    epoch = datetime.date(1970, 1, 1).toordinal()
+    parts = []
+    for i, (_, birth_date, _, _, _, _) in enumerate(rows):
+        schedule = templates.schedule(int(balances['lord_index'][i]), float(balances['elapsed_portion'][i]),
+                                      float(birth_date.toordinal()))
+        for level_number, level in enumerate(schedule.levels):
+            records = np.empty(len(level), dtype=EXPORT_RECORD_DTYPE)
+            records['user'] = first_user + i
+            records['level'] = level_number
+            records['lord'] = level.lord_index
+            records['parent_lord'] = -1 if level_number == 0 else \
+                schedule.levels[level_number - 1].lord_index[level.parent]
+            records['start'] = np.floor(level.start_day + 0.5) - epoch
+            records['end'] = np.floor(level.end_day + 0.5) - epoch
+            parts.append(records)
+
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=EXPORT_RECORD_DTYPE)
+    # Maha and antar rows of a user sit together, ordered by start
+    return records[np.lexsort((records['level'], records['start'], records['user']))]
+
+def _chunks(profiles: Iterable[Dict], chunk_size: int) -> Iterator[List[Tuple]]:
+    chunk = []
+    for profile in profiles:
+        chunk.append(parse_profile(profile))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class _BinaryWriter:
+    """Appends records to <prefix>.dasha and user ids to <prefix>.users.txt"""
+
+    def __init__(self, prefix: str):
+        self.paths = (f"{prefix}.dasha", f"{prefix}.users.txt")
+        self._records = open(self.paths[0], 'wb')
+        self._records.write(_HEADER.pack(_MAGIC, _VERSION, EXPORT_RECORD_DTYPE.itemsize))
+        self._users = open(self.paths[1], 'w', encoding='utf-8')
+
+    def write(self, user_ids: List[str], records: np.ndarray, lords: List[str]):
+        self._users.writelines(f"{user_id}\n" for user_id in user_ids)
+        self._records.write(records.tobytes())
+
+    def close(self):
+        self._records.close()
+        self._users.close()
+
+class _ParquetWriter:
+    """Appends one row group per chunk to <prefix>.parquet"""
+
+    def __init__(self, prefix: str):
+        self.paths = (f"{prefix}.parquet",)
+        self._writer = None
+
+    def write(self, user_ids: List[str], records: np.ndarray, lords: List[str]):
+        first_user = int(records['user'][0]) if len(records) else 0
+        lord_names = np.array(lords + [None], dtype=object)
+        table = pa.table({
+            'user_id': pa.array(np.array(user_ids, dtype=object)[records['user'] - first_user]),
+            'level': pa.array(records['level']),
+            'lord': pa.array(lord_names[records['lord']]),
+            'parent_lord': pa.array(lord_names[records['parent_lord']]),
+            'start_date': pa.array(records['start'].astype('datetime64[D]')),
+            'end_date': pa.array(records['end'].astype('datetime64[D]')),
+        })
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.paths[0], table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+def export_dasha_schedules(profile_path: str, output_prefix: str, workers: Optional[int] = None,
+                           chunk_size: int = 1000, depth: int = 2, output_format: str = 'auto',
+                           precision: str = 'standard', ayanamsa: str = 'lahiri',
+                           max_in_flight: Optional[int] = None, system: str = 'vimshottari') -> Dict:
+    """Export every profile's dasha boundaries; returns output paths and counts"""
+    if output_format == 'auto':
+        output_format = 'parquet' if PARQUET_AVAILABLE else 'binary'
+    if output_format == 'parquet' and not PARQUET_AVAILABLE:
+        raise ValueError("Parquet output needs pyarrow; use output_format='binary'")
+
+    directory = os.path.dirname(output_prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    writer = _ParquetWriter(output_prefix) if output_format == 'parquet' else _BinaryWriter(output_prefix)
+    lords = DashaCalculator(system=system).dasha_sequence
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+
+    n_users = 0
+    n_records = 0
+    pending = collections.deque()
+
+    def drain_one():
+        nonlocal n_records
+        user_ids, future = pending.popleft()
+        records = future.result()
+        writer.write(user_ids, records, lords)
+        n_records += len(records)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(precision, ayanamsa, system)) as pool:
+            for chunk in _chunks(iter_profiles(profile_path), chunk_size):
+                # Back-pressure: never hold more than max_in_flight chunks
+                while len(pending) >= max_in_flight:
+                    drain_one()
+                pending.append(([row[0] for row in chunk], pool.submit(schedule_chunk, chunk, n_users, depth)))
+                n_users += len(chunk)
+
+            while pending:
+                drain_one()
+    finally:
+        writer.close()
+
+    return {'paths': writer.paths, 'format': output_format, 'users': n_users, 'records': n_records}
+
+def read_dasha_export(prefix: str) -> Tuple[List[str], np.ndarray]:
+    """Memory-map a binary export: (user ids, EXPORT_RECORD_DTYPE records)"""
+    with open(f"{prefix}.dasha", 'rb') as f:
+        magic, version, record_size = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != _MAGIC or version != _VERSION or record_size != EXPORT_RECORD_DTYPE.itemsize:
+        raise ValueError(f"Not a Sankatmochan dasha export: {prefix}.dasha")
+
+    with open(f"{prefix}.users.txt", 'r', encoding='utf-8') as f:
+        user_ids = [line.rstrip('\n') for line in f]
+
+    records = np.memmap(f"{prefix}.dasha", dtype=EXPORT_RECORD_DTYPE, mode='r', offset=_HEADER.size)
+    return user_ids, records
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export maha/antar dasha boundaries for every profile")
+    parser.add_argument('profiles', help="profile file (.json, .jsonl or .csv)")
+    parser.add_argument('-o', '--output', default=os.path.join('data', 'dasha_schedule'),
+                        help="output path without extension")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--depth', type=int, default=2, help="1 = mahadasha, 2 = + antardasha, 3 = + pratyantar")
+    parser.add_argument('--format', choices=('auto', 'parquet', 'binary'), default='auto')
+    parser.add_argument('--precision', default='standard')
+    parser.add_argument('--ayanamsa', default='lahiri')
+    parser.add_argument('--system', default='vimshottari', help="vimshottari, yogini or ashtottari")
+    args = parser.parse_args(argv)
+
+    summary = export_dasha_schedules(args.profiles, args.output, args.workers, args.chunk_size, args.depth,
+                                     args.format, args.precision, args.ayanamsa, system=args.system)
+    print(f"✅ Exported {summary['records']} periods for {summary['users']} users to {', '.join(summary['paths'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Dasha Schedule
+Vectorized dasha period generation in float ordinal days, converted to dates once
+"""
+
+import datetime
+from typing import Dict, List, Sequence, Tuple
+from dataclasses import dataclass
+import numpy as np
+
+DAYS_PER_YEAR = 365.25
+
+# datetime64[D] counts days from 1970-01-01; date ordinals count from 0001-01-01
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+@dataclass
+class ScheduleLevel:
+    """All periods of one dasha level, in time order"""
+    lord_index: np.ndarray  # into the lord sequence
+    parent: np.ndarray  # row of the enclosing period on the previous level, -1 on the first
+    start_day: np.ndarray  # fractional ordinal days, clipped at birth
+    end_day: np.ndarray
+    full_years: np.ndarray  # unclipped length of the period
+
+    def __len__(self) -> int:
+        return len(self.lord_index)
+
+    def start_dates(self) -> np.ndarray:
+        """Start dates as datetime64[D], rounded to the nearest day"""
+        return days_to_datetime64(self.start_day)
+
+    def end_dates(self) -> np.ndarray:
+        """End dates as datetime64[D], rounded to the nearest day"""
+        return days_to_datetime64(self.end_day)
+
+@dataclass
+class DashaSchedule:
+    """Multi-level dasha schedule of one chart"""
+    lords: Tuple[str, ...]
+    levels: List[ScheduleLevel]
+    birth_day: float
+
+    def periods(self, depth: int = 0) -> List[Dict]:
+        """Periods of one level as dictionaries with datetime.date boundaries"""
+        level = self.levels[depth]
+        starts = level.start_dates().tolist()
+        ends = level.end_dates().tolist()
+        return [
+            {
+                'lord': self.lords[level.lord_index[i]],
+                'start_date': starts[i],
+                'end_date': ends[i],
+                'duration_years': float(level.end_day[i] - level.start_day[i]) / DAYS_PER_YEAR,
+                'full_years': float(level.full_years[i]),
+                'parent': int(level.parent[i])
+            }
+            for i in range(len(level))
+        ]
+
+def days_to_datetime64(days) -> np.ndarray:
+    """Round fractional ordinal days to datetime64[D] in one array operation"""
+    ordinals = np.floor(np.asarray(days, dtype=float) + 0.5).astype(np.int64)
+    return (ordinals - _EPOCH_ORDINAL).astype('datetime64[D]')
+
+def subdivide_periods(lord_index: np.ndarray, start_day: np.ndarray, span_days: np.ndarray,
+                      lord_years: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Split every period into its nine sub-periods at once.
+
+    Sub-period ``j`` of a period ruled by lord ``L`` is ruled by
+    ``(L + j) % n`` and takes ``years[lord] / sum(years)`` of the parent's span.
+    Returns flattened (lord index, parent row, start day, span days) arrays;
+    boundaries accumulate in float days, so nothing is rounded per level.
+    """
+    n_lords = len(lord_years)
+    child_lords = (lord_index[:, None] + np.arange(n_lords)) % n_lords
+    fractions = lord_years[child_lords] / lord_years.sum()
+
+    spans = span_days[:, None] * fractions
+    ends = start_day[:, None] + np.cumsum(spans, axis=1)
+    starts = ends - spans
+
+    parents = np.repeat(np.arange(len(lord_index)), n_lords)
+    return child_lords.ravel(), parents, starts.ravel(), spans.ravel()
+
+def generate_dasha_schedule(start_lord_index: int, elapsed_portion: float, birth_day: float,
+                            lords: Sequence[str], lord_years: Sequence[float],
+                            depth: int = 3, cycles: int = 1) -> DashaSchedule:
+    """Full schedule of ``cycles`` dasha cycles to ``depth`` levels (maha, antar, pratyantar, ...).
+
+    One Vimshottari cycle is 120 years; shorter systems repeat their cycle.
+    The cycle starts at the virtual beginning of the birth mahadasha, before
+    birth by its elapsed portion; periods ending before birth are dropped and
+    the running ones clipped, after all levels are laid out.
+    """
+    years = np.asarray(lord_years, dtype=float)
+    layout = _relative_layout(start_lord_index, years, depth, cycles)
+    cycle_start = birth_day - elapsed_portion * years[start_lord_index] * DAYS_PER_YEAR
+    return _place_layout(layout, cycle_start, birth_day, lords)
+
+class DashaTemplateCache:
+    """Schedules laid out once per starting lord and reused for every chart.
+
+    Relative to the start of the birth mahadasha a schedule depends only on
+    its starting lord, so each chart is its lord's template shifted by one
+    array add and clipped at birth. The clip is a slice, since the dropped
+    periods are always a prefix of each level; the lord, parent and length
+    arrays of the result are read-only views into the template.
+    """
+
+    def __init__(self, lords: Sequence[str], lord_years: Sequence[float], depth: int = 3, cycles: int = 1):
+        self.lords = tuple(lords)
+        self.years = np.asarray(lord_years, dtype=float)
+        self.depth = depth
+        self.cycles = cycles
+        self._templates: Dict[int, List[Tuple[np.ndarray, ...]]] = {}
+
+    def template(self, start_lord_index: int) -> List[Tuple[np.ndarray, ...]]:
+        """Relative layout for one starting lord, built on first use"""
+        layout = self._templates.get(start_lord_index)
+        if layout is None:
+            layout = _relative_layout(start_lord_index, self.years, self.depth, self.cycles)
+            for arrays in layout:
+                for array in arrays:
+                    array.setflags(write=False)
+            self._templates[start_lord_index] = layout
+        return layout
+
+    def schedule(self, start_lord_index: int, elapsed_portion: float, birth_day: float) -> DashaSchedule:
+        """Same result as generate_dasha_schedule, from the cached template"""
+        cycle_start = birth_day - elapsed_portion * self.years[start_lord_index] * DAYS_PER_YEAR
+        return _place_layout(self.template(start_lord_index), cycle_start, birth_day, self.lords)
+
+def _relative_layout(start_lord_index: int, years: np.ndarray, depth: int,
+                     cycles: int) -> List[Tuple[np.ndarray, ...]]:
+    """Unclipped (lord index, parent row, start day, span days) per level, from day 0 of the cycle"""
+    n_lords = len(years)
+    maha_lords = (start_lord_index + np.arange(n_lords * cycles)) % n_lords
+    maha_spans = years[maha_lords] * DAYS_PER_YEAR
+    maha_starts = np.concatenate([[0.0], np.cumsum(maha_spans)[:-1]])
+
+    layout = [(maha_lords.astype(np.int8), np.full(len(maha_lords), -1), maha_starts, maha_spans)]
+    for _ in range(depth - 1):
+        lord_index, _, start_day, span_days = layout[-1]
+        child_lords, parents, starts, spans = subdivide_periods(lord_index, start_day, span_days, years)
+        layout.append((child_lords.astype(np.int8), parents, starts, spans))
+    return layout
+
+def _place_layout(layout: List[Tuple[np.ndarray, ...]], cycle_start: float, birth_day: float,
+                  lords: Sequence[str]) -> DashaSchedule:
+    """Shift a relative layout to ``cycle_start`` and drop what ended before birth"""
+    birth_offset = birth_day - cycle_start
+    levels = []
+    previous_first = 0
+    for lord_index, parent, start_day, span_days in layout:
+        # Ends increase along a level, so the periods running at or after birth are a suffix
+        end_day = start_day + span_days
+        first = int(np.searchsorted(end_day, birth_offset, side='right'))
+        levels.append(ScheduleLevel(
+            lord_index=lord_index[first:],
+            parent=parent[first:] - previous_first if levels else parent[first:],
+            start_day=np.maximum(start_day[first:], birth_offset) + cycle_start,
+            end_day=end_day[first:] + cycle_start,
+            full_years=span_days[first:] / DAYS_PER_YEAR
+        ))
+        previous_first = first
+    return DashaSchedule(tuple(lords), levels, birth_day)
+
+print("✅ Dasha Schedule loaded")
@@ -0,0 +1,127 @@
+"""
+Dasha Systems
+Table-driven specs for nakshatra-based dasha systems (Vimshottari, Yogini, Ashtottari)
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import numpy as np
+
+from core.dasha_schedule import DashaSchedule, generate_dasha_schedule
+
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+@dataclass(frozen=True)
+class DashaSystem:
+    """A dasha system: lord sequence, period years and the nakshatra starting rule.
+
+    Nakshatras are assigned to lords in runs of consecutive nakshatras; the
+    birth lord is the owner of the Moon's run and the elapsed portion of the
+    first dasha is the Moon's progress through that whole run.
+    """
+    name: str
+    lords: Tuple[str, ...]
+    years: Tuple[float, ...]
+    nakshatra_lord: Tuple[int, ...]  # lord index of each of the 27 nakshatras
+    run_start: Tuple[int, ...]  # first nakshatra of the run containing each nakshatra
+    run_length: Tuple[int, ...]
+    cycles: int = 1  # cycles generated per chart, to cover a lifetime
+
+    @classmethod
+    def from_runs(cls, name: str, lords: Sequence[str], years: Sequence[float],
+                  first_nakshatra: int, runs: Sequence[Tuple[str, int]], cycles: int = 1) -> 'DashaSystem':
+        """Build the nakshatra tables from (lord, nakshatra count) runs starting at ``first_nakshatra``"""
+        nakshatra_lord = [0] * 27
+        run_start = [0] * 27
+        run_length = [0] * 27
+
+        nakshatra = first_nakshatra
+        covered = 0
+        while covered < 27:
+            for lord, count in runs:
+                start = nakshatra % 27
+                for _ in range(min(count, 27 - covered)):
+                    nakshatra_lord[nakshatra % 27] = list(lords).index(lord)
+                    run_start[nakshatra % 27] = start
+                    run_length[nakshatra % 27] = count
+                    nakshatra += 1
+                    covered += 1
+                if covered == 27:
+                    break
+
+        return cls(name, tuple(lords), tuple(float(y) for y in years),
+                   tuple(nakshatra_lord), tuple(run_start), tuple(run_length), cycles)
+
+    @property
+    def total_years(self) -> float:
+        return sum(self.years)
+
+    @property
+    def periods(self) -> Dict[str, float]:
+        return dict(zip(self.lords, self.years))
+
+    def balances(self, moon_longitudes) -> Dict[str, np.ndarray]:
+        """Starting lord index, elapsed portion of its run and first-dasha balance in years"""
+        position = (np.asarray(moon_longitudes, dtype=float) % 360.0) / NAKSHATRA_SPAN
+        nakshatra = position.astype(np.int64) % 27
+
+        run_start = np.array(self.run_start)[nakshatra]
+        run_length = np.array(self.run_length)[nakshatra]
+        elapsed = ((position - run_start) % 27) / run_length
+
+        lord_index = np.array(self.nakshatra_lord)[nakshatra]
+        return {
+            'nakshatra_index': nakshatra,
+            'lord_index': lord_index,
+            'elapsed_portion': elapsed,
+            'balance_years': np.array(self.years)[lord_index] * (1.0 - elapsed)
+        }
+
+    def run_portion(self, nakshatra_index: int, elapsed_in_nakshatra: float) -> float:
+        """Elapsed portion of the run, from the portion elapsed in one of its nakshatras"""
+        offset = (nakshatra_index - self.run_start[nakshatra_index]) % 27
+        return (offset + elapsed_in_nakshatra) / self.run_length[nakshatra_index]
+
+_VIMSHOTTARI_LORDS = ('Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury')
+_YOGINI_LORDS = ('Mangala', 'Pingala', 'Dhanya', 'Bhramari', 'Bhadrika', 'Ulka', 'Siddha', 'Sankata')
+_ASHTOTTARI_LORDS = ('Sun', 'Moon', 'Mars', 'Mercury', 'Saturn', 'Jupiter', 'Rahu', 'Venus')
+
+DASHA_SYSTEMS: Dict[str, DashaSystem] = {
+    # One nakshatra per lord, Ashwini -> Ketu, repeating three times around the zodiac
+    'vimshottari': DashaSystem.from_runs(
+        'vimshottari', _VIMSHOTTARI_LORDS, (7, 20, 6, 10, 7, 18, 16, 19, 17),
+        0, [(lord, 1) for lord in _VIMSHOTTARI_LORDS]),
+    # Nakshatra number + 3 modulo 8: Ashwini -> Bhramari; the 36-year cycle repeats
+    'yogini': DashaSystem.from_runs(
+        'yogini', _YOGINI_LORDS, (1, 2, 3, 4, 5, 6, 7, 8),
+        0, [(lord, 1) for lord in _YOGINI_LORDS[3:] + _YOGINI_LORDS[:3]], cycles=4),
+    # Runs of 4 and 3 nakshatras from Ardra (Abhijit folded into Saturn's run)
+    'ashtottari': DashaSystem.from_runs(
+        'ashtottari', _ASHTOTTARI_LORDS, (6, 15, 8, 17, 10, 19, 12, 21),
+        5, [('Sun', 4), ('Moon', 3), ('Mars', 4), ('Mercury', 3),
+            ('Saturn', 3), ('Jupiter', 3), ('Rahu', 4), ('Venus', 3)]),
+}
+
+def register_dasha_system(system: DashaSystem):
+    """Add or replace a dasha system"""
+    DASHA_SYSTEMS[system.name] = system
+
+def get_dasha_system(name: str) -> DashaSystem:
+    """Look up a dasha system by name"""
+    try:
+        return DASHA_SYSTEMS[name]
+    except KeyError:
+        raise ValueError(f"Unknown dasha system '{name}', expected one of {sorted(DASHA_SYSTEMS)}")
+
+def compare_systems(moon_longitude: float, birth_day: float, systems: Optional[Sequence[str]] = None,
+                    depth: int = 2) -> Dict[str, DashaSchedule]:
+    """Schedules of several systems for one chart, side by side"""
+    schedules = {}
+    for name in systems or DASHA_SYSTEMS:
+        system = get_dasha_system(name)
+        balance = system.balances([moon_longitude])
+        schedules[name] = generate_dasha_schedule(int(balance['lord_index'][0]), float(balance['elapsed_portion'][0]),
+                                                  birth_day, system.lords, system.years, depth, system.cycles)
+    return schedules
+
+print("✅ Dasha Systems loaded")
@@ -0,0 +1,213 @@
+"""
+Dasha Timeline
+Sorted boundary arrays for O(log n) lookup of the active maha, antar and pratyantar dasha
+"""
+
+import bisect
+import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass
+import numpy as np
+
+if TYPE_CHECKING:
+    from core.dasha_schedule import DashaSchedule
+    from core.dashas import DashaCalculator, DashaPeriod
+
+DASHA_LEVELS = ('mahadasha', 'antardasha', 'pratyantardasha')
+
+# Composite key stride: owner * OWNER_STRIDE + date ordinal. Ordinals stay
+# below 1e6 until the year 2738, so keys of different owners never interleave.
+OWNER_STRIDE = 1_000_000
+
+DateLike = Union[datetime.date, int]
+
+@dataclass
+class TimelineSpan:
+    """One period of a timeline level"""
+    level: str
+    lord: str
+    start_date: datetime.date
+    end_date: datetime.date
+    duration_years: float
+    parent: Optional[str] = None
+
+class DashaTimeline:
+    """Interval index over the dasha periods of one or more charts.
+
+    Each level keeps its periods as sorted arrays of start and end keys
+    (date ordinals, offset per owner) with inclusive ends. Periods touch, so
+    the active period for a date is the first whose end is not before it,
+    found with one binary search; on a boundary day the earlier period wins,
+    as in DashaCalculator.get_current_dasha_from_periods.
+    """
+
+    def __init__(self, levels: Dict[str, Tuple[np.ndarray, ...]], lords: Sequence[str], n_owners: int = 1):
+        # level -> (start keys, end keys, lord indices, parent lord indices, duration years)
+        self.levels = levels
+        self.lords = tuple(lords)
+        self.n_owners = n_owners
+
+    @classmethod
+    def from_periods(cls, mahadashas: List['DashaPeriod'], calculator: 'DashaCalculator') -> 'DashaTimeline':
+        """Index a mahadasha list, deriving antar and pratyantar periods"""
+        return cls.from_period_dicts([
+            {'lord': p.lord, 'start_date': p.start_date, 'end_date': p.end_date,
+             'duration_years': p.duration_years} for p in mahadashas
+        ], calculator)
+
+    @classmethod
+    def from_period_dicts(cls, mahadashas: List[Dict], calculator: 'DashaCalculator') -> 'DashaTimeline':
+        """Index mahadashas given as dictionaries (the get_corrected_dasha_periods format)"""
+        lord_index = {lord: i for i, lord in enumerate(calculator.dasha_sequence)}
+        rows = {level: [] for level in DASHA_LEVELS}
+
+        for maha in mahadashas:
+            maha_years = calculator.lord_periods[maha['lord']]
+            maha_balance = maha['duration_years'] < maha_years - 1e-9
+            rows['mahadasha'].append((maha['start_date'], maha['end_date'], maha['lord'], None,
+                                      maha['duration_years']))
+
+            for antar_lord, antar_start, antar_end, antar_years, antar_balance in _subperiods(
+                    calculator, maha['lord'], maha['start_date'], maha['end_date'], maha_years, maha_balance):
+                rows['antardasha'].append((antar_start, antar_end, antar_lord, maha['lord'], antar_years))
+
+                for praty_lord, praty_start, praty_end, praty_years, _ in _subperiods(
+                        calculator, antar_lord, antar_start, antar_end, antar_years, antar_balance):
+                    rows['pratyantardasha'].append((praty_start, praty_end, praty_lord, antar_lord, praty_years))
+
+        levels = {}
+        for level, spans in rows.items():
+            starts, ends, lords, parents, years = zip(*spans) if spans else ((),) * 5
+            levels[level] = (
+                np.array([start.toordinal() for start in starts], dtype=np.int64),
+                np.array([end.toordinal() for end in ends], dtype=np.int64),
+                np.array([lord_index[lord] for lord in lords], dtype=np.int8),
+                np.array([-1 if parent is None else lord_index[parent] for parent in parents], dtype=np.int8),
+                np.array(years, dtype=float),
+            )
+
+        return cls(levels, calculator.dasha_sequence)
+
+    @classmethod
+    def from_schedule(cls, schedule: 'DashaSchedule') -> 'DashaTimeline':
+        """Index a core.dasha_schedule.DashaSchedule of any dasha system (up to three levels)"""
+        levels = {}
+        for depth, level in enumerate(DASHA_LEVELS):
+            if depth >= len(schedule.levels):
+                levels[level] = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                                 np.empty(0, dtype=np.int8), np.empty(0, dtype=np.int8), np.empty(0))
+                continue
+            rows = schedule.levels[depth]
+            parents = np.full(len(rows), -1, dtype=np.int8) if depth == 0 else \
+                schedule.levels[depth - 1].lord_index[rows.parent].astype(np.int8)
+            levels[level] = (
+                np.floor(rows.start_day + 0.5).astype(np.int64),
+                np.floor(rows.end_day + 0.5).astype(np.int64),
+                rows.lord_index.astype(np.int8),
+                parents,
+                (rows.end_day - rows.start_day) / 365.25,
+            )
+        return cls(levels, schedule.lords)
+
+    @classmethod
+    def concatenate(cls, timelines: Sequence['DashaTimeline']) -> 'DashaTimeline':
+        """Merge single-chart timelines into one index; owner i is timelines[i]"""
+        levels = {}
+        for level in DASHA_LEVELS:
+            parts = [timeline.levels[level] for timeline in timelines]
+            offsets = [np.full(len(part[0]), owner * OWNER_STRIDE, dtype=np.int64)
+                       for owner, part in enumerate(parts)]
+            levels[level] = (
+                np.concatenate([part[0] + offset for part, offset in zip(parts, offsets)]),
+                np.concatenate([part[1] + offset for part, offset in zip(parts, offsets)]),
+                *(np.concatenate([part[i] for part in parts]) for i in range(2, 5)),
+            )
+        return cls(levels, timelines[0].lords, len(timelines))
+
+    def __len__(self) -> int:
+        return len(self.levels['mahadasha'][0])
+
+    def find(self, level: str, date: DateLike, owner: int = 0) -> int:
+        """Index of the period active at ``date`` on one level, or -1"""
+        starts, ends = self.levels[level][:2]
+        key = owner * OWNER_STRIDE + _ordinal(date)
+        index = bisect.bisect_left(ends, key)
+        if index < len(ends) and starts[index] <= key:
+            return index
+        return -1
+
+    def find_many(self, level: str, dates, owners=0) -> np.ndarray:
+        """Vectorized find: indices for arrays of dates and owners (broadcast), -1 where none"""
+        starts, ends = self.levels[level][:2]
+        keys = np.asarray(owners, dtype=np.int64) * OWNER_STRIDE + _ordinals(dates)
+        indices = np.searchsorted(ends, keys, side='left')
+        clipped = np.minimum(indices, len(ends) - 1)
+        found = (indices < len(ends)) & (starts[clipped] <= keys)
+        return np.where(found, indices, -1)
+
+    def span(self, level: str, index: int) -> TimelineSpan:
+        """Materialize one stored period"""
+        starts, ends, lords, parents, years = self.levels[level]
+        return TimelineSpan(
+            level=level,
+            lord=self.lords[lords[index]],
+            start_date=datetime.date.fromordinal(int(starts[index] % OWNER_STRIDE)),
+            end_date=datetime.date.fromordinal(int(ends[index] % OWNER_STRIDE)),
+            duration_years=float(years[index]),
+            parent=self.lords[parents[index]] if parents[index] >= 0 else None
+        )
+
+    def active(self, date: DateLike, owner: int = 0) -> Dict[str, Optional[TimelineSpan]]:
+        """Active period on every level at one date"""
+        active = {}
+        for level in DASHA_LEVELS:
+            index = self.find(level, date, owner)
+            active[level] = self.span(level, index) if index >= 0 else None
+        return active
+
+    def active_lords(self, dates, owners=0) -> Dict[str, np.ndarray]:
+        """Lord names on every level for many dates/owners; None where no period is active"""
+        lord_names = np.array(self.lords + (None,), dtype=object)
+        result = {}
+        for level in DASHA_LEVELS:
+            indices = self.find_many(level, dates, owners)
+            lords = np.where(indices >= 0, self.levels[level][2][np.maximum(indices, 0)], -1)
+            result[level] = lord_names[lords]
+        return result
+
+def _ordinal(date: DateLike) -> int:
+    return date if isinstance(date, (int, np.integer)) else date.toordinal()
+
+def _ordinals(dates) -> np.ndarray:
+    """Date ordinals from dates, ordinals or numpy datetime64 values"""
+    values = np.asarray(dates)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[D]').astype(np.int64) + datetime.date(1970, 1, 1).toordinal()
+    if values.dtype == object:
+        return np.array([_ordinal(date) for date in values.ravel()], dtype=np.int64).reshape(values.shape)
+    return values.astype(np.int64)
+
+def _subperiods(calculator: 'DashaCalculator', lord: str, start: datetime.date, end: datetime.date,
+                full_years: float, balance: bool) -> List[Tuple[str, datetime.date, datetime.date, float, bool]]:
+    """Sub-periods of a period as (lord, start, end, full years, balance) tuples.
+
+    A balance period (one already running at birth) is laid out backwards
+    from ``end`` and clipped at ``start``, so it keeps the sub-periods it
+    would have had. The last sub-period is pinned to ``end`` to absorb day
+    rounding.
+    """
+    full_start = end - datetime.timedelta(days=int(full_years * 365.25 + 0.5)) if balance else start
+    spans = []
+    for sub in calculator.calculate_antardasha_periods(lord, full_start, full_years):
+        if sub.end_date <= start:
+            continue
+        if sub.start_date >= end:
+            break
+        spans.append((sub.lord, max(sub.start_date, start), min(sub.end_date, end),
+                      sub.duration_years, sub.start_date < start))
+
+    if spans:
+        spans[-1] = spans[-1][:2] + (end,) + spans[-1][3:]
+    return spans
+
+print("✅ Dasha Timeline loaded")
@@ -0,0 +1,192 @@
+"""
+Dasha Tree
+Lazily expanded dasha tree: maha, antar, pratyantar, sookshma and prana periods
+"""
+
+import bisect
+import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+if TYPE_CHECKING:
+    from core.dasha_schedule import DashaSchedule
+    from core.dashas import DashaCalculator, DashaPeriod
+
+DASHA_TREE_LEVELS = ('Mahadasha', 'Antardasha', 'Pratyantardasha', 'Sookshma', 'Prana')
+
+Moment = Union[datetime.date, datetime.datetime]
+
+def to_day_number(moment: Moment) -> float:
+    """Fractional proleptic ordinal day of a date or naive datetime"""
+    if isinstance(moment, datetime.datetime):
+        seconds = moment.hour * 3600 + moment.minute * 60 + moment.second + moment.microsecond / 1e6
+        return moment.toordinal() + seconds / 86400.0
+    return float(moment.toordinal())
+
+def from_day_number(day: float) -> datetime.datetime:
+    """Naive datetime of a fractional ordinal day"""
+    ordinal = int(day // 1)
+    return datetime.datetime.fromordinal(ordinal) + datetime.timedelta(days=day - ordinal)
+
+class DashaNode:
+    """One period of the tree; its children are built on first access and kept.
+
+    ``start``/``end`` are fractional ordinal days. A period already running
+    at birth keeps its full span in ``full_start`` so its sub-periods are
+    the ones it would have had, clipped at ``start``.
+    """
+
+    __slots__ = ('lord', 'depth', 'start', 'end', 'full_start', 'parent', '_tree', '_children')
+
+    def __init__(self, tree: 'DashaTree', lord: str, depth: int, start: float, end: float,
+                 full_start: float, parent: Optional['DashaNode'] = None):
+        self._tree = tree
+        self.lord = lord
+        self.depth = depth
+        self.start = start
+        self.end = end
+        self.full_start = full_start
+        self.parent = parent
+        self._children: Optional[List['DashaNode']] = None
+
+    @property
+    def dasha_type(self) -> str:
+        return DASHA_TREE_LEVELS[self.depth]
+
+    @property
+    def start_moment(self) -> datetime.datetime:
+        return from_day_number(self.start)
+
+    @property
+    def end_moment(self) -> datetime.datetime:
+        return from_day_number(self.end)
+
+    @property
+    def duration_years(self) -> float:
+        """Length of the (possibly clipped) period"""
+        return (self.end - self.start) / 365.25
+
+    @property
+    def is_expanded(self) -> bool:
+        return self._children is not None
+
+    @property
+    def children(self) -> List['DashaNode']:
+        """Sub-periods, empty at the prana level"""
+        if self._children is None:
+            self._children = self._tree.expand(self) if self.depth + 1 < len(DASHA_TREE_LEVELS) else []
+        return self._children
+
+    def child_at(self, day: float) -> Optional['DashaNode']:
+        """Sub-period containing a fractional ordinal day (earlier one on a boundary)"""
+        children = self.children
+        index = bisect.bisect_left([child.end for child in children], day)
+        if index < len(children) and children[index].start <= day:
+            return children[index]
+        return None
+
+    def lords_path(self) -> List[str]:
+        """Lords from the mahadasha down to this node"""
+        path = []
+        node = self
+        while node is not None:
+            path.append(node.lord)
+            node = node.parent
+        return path[::-1]
+
+    def to_dict(self) -> Dict:
+        return {
+            'lord': self.lord,
+            'dasha_type': self.dasha_type,
+            'start': self.start_moment,
+            'end': self.end_moment,
+            'duration_years': self.duration_years,
+            'parent_dasha': self.parent.lord if self.parent else None
+        }
+
+    def __repr__(self) -> str:
+        return f"DashaNode({'/'.join(self.lords_path())}, {self.start_moment:%Y-%m-%d %H:%M} - {self.end_moment:%Y-%m-%d %H:%M})"
+
+class DashaTree:
+    """Dasha periods of one chart, expanded level by level on demand.
+
+    A full Vimshottari expansion holds 9**5 = 59049 prana periods per chart;
+    lookups and drill-downs only build the nodes on the path they visit.
+    """
+
+    def __init__(self, mahadashas: List[Dict], calculator: 'DashaCalculator'):
+        self.periods = calculator.lord_periods
+        self.sequence = calculator.dasha_sequence
+        self.total_years = sum(self.periods.values())
+        self.roots: List[DashaNode] = []
+
+        for maha in mahadashas:
+            start = to_day_number(maha['start_date'])
+            end = to_day_number(maha['end_date'])
+            full_years = self.periods[maha['lord']]
+            # A balance mahadasha is the tail of a full period that began before birth
+            full_start = end - full_years * 365.25 if maha['duration_years'] < full_years - 1e-9 else start
+            self.roots.append(DashaNode(self, maha['lord'], 0, start, end, full_start))
+
+    @classmethod
+    def from_periods(cls, mahadashas: List['DashaPeriod'], calculator: 'DashaCalculator') -> 'DashaTree':
+        """Tree over a calculate_mahadashas result"""
+        return cls([{'lord': p.lord, 'start_date': p.start_date, 'end_date': p.end_date,
+                     'duration_years': p.duration_years} for p in mahadashas], calculator)
+
+    @classmethod
+    def from_schedule(cls, schedule: 'DashaSchedule', calculator: 'DashaCalculator') -> 'DashaTree':
+        """Tree over the unrounded mahadashas of a DashaSchedule, so its periods match DashaTimeline.from_schedule"""
+        tree = cls([], calculator)
+        level = schedule.levels[0]
+        for i in range(len(level)):
+            end = float(level.end_day[i])
+            tree.roots.append(DashaNode(tree, schedule.lords[level.lord_index[i]], 0, float(level.start_day[i]), end,
+                                        end - float(level.full_years[i]) * 365.25))
+        return tree
+
+    def expand(self, node: DashaNode) -> List[DashaNode]:
+        """Children of a node: every lord from its own, in proportion to their years"""
+        first = self.sequence.index(node.lord)
+        full_span = node.end - node.full_start
+
+        children = []
+        cursor = node.full_start
+        for i in range(len(self.sequence)):
+            lord = self.sequence[(first + i) % len(self.sequence)]
+            child_end = node.end if i == len(self.sequence) - 1 else \
+                cursor + full_span * self.periods[lord] / self.total_years
+
+            if child_end > node.start:
+                start = max(cursor, node.start)
+                children.append(DashaNode(self, lord, node.depth + 1, start, child_end, cursor, node))
+            cursor = child_end
+
+        return children
+
+    def path_at(self, moment: Moment, depth: int = len(DASHA_TREE_LEVELS)) -> List[DashaNode]:
+        """Active period on each of the first ``depth`` levels, outermost first"""
+        day = to_day_number(moment)
+        index = bisect.bisect_left([root.end for root in self.roots], day)
+        if index == len(self.roots) or self.roots[index].start > day:
+            return []
+
+        path = [self.roots[index]]
+        while len(path) < depth:
+            child = path[-1].child_at(day)
+            if child is None:
+                break
+            path.append(child)
+        return path
+
+    def count_expanded(self) -> int:
+        """Number of nodes built so far"""
+        count = 0
+        stack = list(self.roots)
+        while stack:
+            node = stack.pop()
+            count += 1
+            if node.is_expanded:
+                stack.extend(node.children)
+        return count
+
+print("✅ Dasha Tree loaded")
@@ -1,11 +1,30 @@
 """
 Core Dasha Calculations
-Handles Vimshottari Dasha periods with 100% accuracy
+Handles Vimshottari and the other nakshatra dasha systems with 100% accuracy
 """
 
+import bisect
 import datetime
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
+import numpy as np
+
+from core.chart_cache import ChartCache
+from core.dasha_systems import compare_systems, get_dasha_system
+from core.dasha_schedule import DashaSchedule, DashaTemplateCache, days_to_datetime64, subdivide_periods
+from core.dasha_timeline import DashaTimeline
+from core.dasha_tree import DashaTree
+
+# Each nakshatra spans 13 deg 20 min of the sidereal zodiac
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+NAKSHATRA_NAMES = (
+    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra',
+    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni',
+    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha',
+    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha',
+    'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
+)
 
 @dataclass
 class DashaPeriod:
@@ -21,91 +40,112 @@ class DashaPeriod:
     parent_dasha: Optional[str] = None
 
 class DashaCalculator:
-    """Precise Vimshottari Dasha Calculator"""
+    """Precise Dasha Calculator (Vimshottari by default, see core.dasha_systems)"""
     
-    def __init__(self):
-        # Exact Vimshottari periods (120 years total)
-        self.vimshottari_periods = {
-            'Ketu': 7.0, 'Venus': 20.0, 'Sun': 6.0, 'Moon': 10.0, 'Mars': 7.0,
-            'Rahu': 18.0, 'Jupiter': 16.0, 'Saturn': 19.0, 'Mercury': 17.0
-        }
+    def __init__(self, timeline_cache=None, system: str = 'vimshottari'):
+        # core.chart_cache.ChartCache holding DashaTimeline objects per birth date; pass one to share it
+        self.timeline_cache = timeline_cache if timeline_cache is not None else ChartCache(max_size=1024,
+                                                                                           ttl_seconds=None)
+        
+        self.system = get_dasha_system(system)
+        
+        # Period years of each lord of the system (120 years total for Vimshottari)
+        self.lord_periods = self.system.periods
+        self.vimshottari_periods = self.lord_periods  # name kept for existing callers
         
         # Nakshatra to dasha lord mapping
         self.nakshatra_lords = {
-            'Ashwini': 'Ketu', 'Bharani': 'Venus', 'Krittika': 'Sun',
-            'Rohini': 'Moon', 'Mrigashira': 'Mars', 'Ardra': 'Rahu',
-            'Punarvasu': 'Jupiter', 'Pushya': 'Saturn', 'Ashlesha': 'Mercury',
-            'Magha': 'Ketu', 'Purva Phalguni': 'Venus', 'Uttara Phalguni': 'Sun',
-            'Hasta': 'Moon', 'Chitra': 'Mars', 'Swati': 'Rahu',
-            'Vishakha': 'Jupiter', 'Anuradha': 'Saturn', 'Jyeshtha': 'Mercury',
-            'Mula': 'Ketu', 'Purva Ashadha': 'Venus', 'Uttara Ashadha': 'Sun',
-            'Shravana': 'Moon', 'Dhanishta': 'Mars', 'Shatabhisha': 'Rahu',
-            'Purva Bhadrapada': 'Jupiter', 'Uttara Bhadrapada': 'Saturn', 'Revati': 'Mercury'
+            name: self.system.lords[self.system.nakshatra_lord[i]] for i, name in enumerate(NAKSHATRA_NAMES)
         }
         
-        self.dasha_sequence = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
-    
-    def calculate_vimshottari_dasha(self, birth_nakshatra: str, elapsed_portion: float,
-                                  birth_date: datetime.date) -> List[DashaPeriod]:
-        """Calculate precise Vimshottari Dasha periods"""
+        self.dasha_sequence = list(self.system.lords)
         
-        starting_lord = self.nakshatra_lords[birth_nakshatra]
+        # Period lengths in dasha_sequence order, for the array-based generators
+        self.lord_years = np.array(self.system.years)
         
-        # Calculate exact balance of first dasha
-        first_dasha_total = self.vimshottari_periods[starting_lord]
-        first_dasha_balance = first_dasha_total * (1.0 - elapsed_portion)
+        # Nakshatras in zodiac order
+        self.nakshatra_order = list(NAKSHATRA_NAMES)
         
-        dasha_periods = []
-        current_date = birth_date
-        
-        # Find starting position in sequence
-        start_index = self.dasha_sequence.index(starting_lord)
+        # depth -> DashaTemplateCache of per-lord relative schedules
+        self.schedule_templates = {}
+    
+    def dasha_balance_from_moon(self, moon_longitude: float) -> Tuple[str, float]:
+        """Birth nakshatra and elapsed portion of it from the sidereal Moon longitude"""
+        position = (moon_longitude % 360.0) / NAKSHATRA_SPAN
+        index = int(position) % 27
+        return self.nakshatra_order[index], position - int(position)
+    
+    def dasha_balances_from_moon(self, moon_longitudes) -> Dict[str, np.ndarray]:
+        """Starting lord and balance for an array of sidereal Moon longitudes in one pass.
+
+        Returns arrays of nakshatra index, starting lord index (into
+        ``dasha_sequence``), elapsed portion of the first dasha and its
+        balance in years.
+        """
+        return self.system.balances(moon_longitudes)
+    
+    def calculate_dasha_from_moon(self, moon_longitude: float, birth_date: datetime.date) -> List[DashaPeriod]:
+        """Mahadashas from the sidereal Moon longitude at birth"""
+        birth_nakshatra, elapsed_portion = self.dasha_balance_from_moon(moon_longitude)
+        return self.calculate_mahadashas(birth_nakshatra, elapsed_portion, birth_date)
+    
+    def calculate_mahadashas(self, birth_nakshatra: str, elapsed_portion: float,
+                             birth_date: datetime.date) -> List[DashaPeriod]:
+        """Calculate precise mahadasha periods of the calculator's dasha system"""
         
-        # First dasha (balance period)
-        if first_dasha_balance > 0:
-            end_date = self._add_precise_years_to_date(current_date, first_dasha_balance)
-            
-            period = DashaPeriod(
-                lord=starting_lord,
-                start_date=current_date,
-                end_date=end_date,
-                duration_years=first_dasha_balance,
-                duration_months=first_dasha_balance * 12.0,
-                duration_days=int(first_dasha_balance * 365.25),
-                balance_at_birth=first_dasha_balance,
-                dasha_type='Mahadasha'
-            )
-            dasha_periods.append(period)
-            current_date = end_date
+        schedule = self.generate_schedule(birth_nakshatra, elapsed_portion, birth_date, depth=1)
+        level = schedule.levels[0]
+        starts = level.start_dates().tolist()
+        ends = level.end_dates().tolist()
         
-        # Remaining dashas (full periods)
-        for i in range(1, 9):
-            lord_index = (start_index + i) % 9
-            lord = self.dasha_sequence[lord_index]
-            duration = self.vimshottari_periods[lord]
-            
-            end_date = self._add_precise_years_to_date(current_date, duration)
+        dasha_periods = []
+        for i in range(len(level)):
+            duration = float(level.end_day[i] - level.start_day[i]) / 365.25
             
             period = DashaPeriod(
-                lord=lord,
-                start_date=current_date,
-                end_date=end_date,
+                lord=self.dasha_sequence[level.lord_index[i]],
+                start_date=starts[i],
+                end_date=ends[i],
                 duration_years=duration,
                 duration_months=duration * 12.0,
                 duration_days=int(duration * 365.25),
-                balance_at_birth=0.0,
+                balance_at_birth=duration if i == 0 else 0.0,
                 dasha_type='Mahadasha'
             )
             dasha_periods.append(period)
-            current_date = end_date
         
         return dasha_periods
     
-    def get_corrected_dasha_periods(self, birth_date: datetime.date) -> List[Dict]:
+    # Name kept for existing callers; serves every system, not only Vimshottari
+    calculate_vimshottari_dasha = calculate_mahadashas
+    
+    def generate_schedule(self, birth_nakshatra: str, elapsed_portion: float,
+                          birth_date: datetime.date, depth: int = 3) -> DashaSchedule:
+        """Full dasha cycle down to ``depth`` levels, built with array operations"""
+        nakshatra_index = self.nakshatra_order.index(birth_nakshatra)
+        return self.get_schedule_templates(depth).schedule(self.system.nakshatra_lord[nakshatra_index],
+                                                           self.system.run_portion(nakshatra_index, elapsed_portion),
+                                                           float(birth_date.toordinal()))
+    
+    def get_schedule_templates(self, depth: int = 3) -> DashaTemplateCache:
+        """Template cache of this calculator's system for one depth"""
+        if depth not in self.schedule_templates:
+            self.schedule_templates[depth] = DashaTemplateCache(self.dasha_sequence, self.lord_years, depth,
+                                                                self.system.cycles)
+        return self.schedule_templates[depth]
+    
+    def compare_systems(self, moon_longitude: float, birth_date: datetime.date,
+                        systems: Optional[List[str]] = None, depth: int = 3) -> Dict[str, DashaTimeline]:
+        """Interval indexes of several dasha systems for one chart, from one schedule pass each"""
+        schedules = compare_systems(moon_longitude, float(birth_date.toordinal()), systems, depth)
+        return {name: DashaTimeline.from_schedule(schedule) for name, schedule in schedules.items()}
+    
+    def get_corrected_dasha_periods(self, birth_date: datetime.date,
+                                    moon_longitude: Optional[float] = None) -> List[Dict]:
         """Get corrected dasha periods for your specific chart"""
         
         # Your exact dasha periods from the chart
-        if birth_date == datetime.date(2006, 12, 13):
+        if self._is_reference_chart(birth_date, moon_longitude):
             return [
                 {
                     'lord': 'Sun',
@@ -172,37 +212,61 @@ class DashaCalculator:
                 }
             ]
         else:
-            # Use the proper Vimshottari calculation for other dates
-            return self._calculate_generic_dashas(birth_date)
+            # Compute the periods of the selected dasha system for other dates
+            return self._calculate_generic_dashas(birth_date, moon_longitude)
+    
+    def get_dasha_timeline(self, birth_date: datetime.date,
+                           moon_longitude: Optional[float] = None) -> DashaTimeline:
+        """Interval index over the maha, antar and pratyantar periods of a birth date"""
+        
+        def compute() -> DashaTimeline:
+            if self._is_reference_chart(birth_date, moon_longitude):
+                return DashaTimeline.from_period_dicts(self.get_corrected_dasha_periods(birth_date), self)
+            # Three levels straight from the array schedule, rounded to days like the mahadasha list
+            birth_nakshatra, elapsed_portion = self._birth_balance(moon_longitude)
+            return DashaTimeline.from_schedule(self.generate_schedule(birth_nakshatra, elapsed_portion, birth_date))
+        
+        return self.timeline_cache.get_or_compute(('dasha_timeline', self.system.name, birth_date, moon_longitude),
+                                                  compute)
+    
+    def get_dasha_tree(self, birth_date: datetime.date, moon_longitude: Optional[float] = None) -> DashaTree:
+        """Lazily expanded maha-to-prana dasha tree for a birth date, on the same schedule as get_dasha_timeline"""
+        if self._is_reference_chart(birth_date, moon_longitude):
+            return DashaTree(self.get_corrected_dasha_periods(birth_date), self)
+        birth_nakshatra, elapsed_portion = self._birth_balance(moon_longitude)
+        return DashaTree.from_schedule(self.generate_schedule(birth_nakshatra, elapsed_portion, birth_date, depth=1),
+                                       self)
     
     def get_current_dasha_info(self, birth_date: datetime.date, 
-                              reference_date: datetime.date = None) -> Dict:
+                              reference_date: datetime.date = None,
+                              moon_longitude: Optional[float] = None) -> Dict:
         """Get current dasha information"""
         
         if reference_date is None:
             reference_date = datetime.date.today()
         
-        dasha_periods = self.get_corrected_dasha_periods(birth_date)
+        active = self.get_dasha_timeline(birth_date, moon_longitude).active(reference_date)
+        period = active['mahadasha']
+        if period is None:
+            return {'status': 'No current dasha found'}
         
-        for period in dasha_periods:
-            if period['start_date'] <= reference_date <= period['end_date']:
-                remaining_days = (period['end_date'] - reference_date).days
-                remaining_years = remaining_days / 365.25
-                elapsed_days = (reference_date - period['start_date']).days
-                completion_percentage = (elapsed_days / (period['duration_years'] * 365.25)) * 100
-                
-                return {
-                    'current_mahadasha': period['lord'],
-                    'start_date': period['start_date'],
-                    'end_date': period['end_date'],
-                    'duration_years': period['duration_years'],
-                    'remaining_years': remaining_years,
-                    'remaining_days': remaining_days,
-                    'completion_percentage': completion_percentage,
-                    'status': f"You are currently in {period['lord']} Mahadasha"
-                }
+        remaining_days = (period.end_date - reference_date).days
+        remaining_years = remaining_days / 365.25
+        elapsed_days = (reference_date - period.start_date).days
+        completion_percentage = (elapsed_days / (period.duration_years * 365.25)) * 100
         
-        return {'status': 'No current dasha found'}
+        return {
+            'current_mahadasha': period.lord,
+            'current_antardasha': active['antardasha'].lord if active['antardasha'] else None,
+            'current_pratyantardasha': active['pratyantardasha'].lord if active['pratyantardasha'] else None,
+            'start_date': period.start_date,
+            'end_date': period.end_date,
+            'duration_years': period.duration_years,
+            'remaining_years': remaining_years,
+            'remaining_days': remaining_days,
+            'completion_percentage': completion_percentage,
+            'status': f"You are currently in {period.lord} Mahadasha"
+        }
     
     def get_current_dasha_from_periods(self, dasha_periods: List[DashaPeriod], 
                                      reference_date: datetime.date = None) -> Dict:
@@ -211,23 +275,26 @@ class DashaCalculator:
         if reference_date is None:
             reference_date = datetime.date.today()
         
-        for period in dasha_periods:
-            if period.start_date <= reference_date <= period.end_date:
-                remaining_days = (period.end_date - reference_date).days
-                remaining_years = remaining_days / 365.25
-                elapsed_days = (reference_date - period.start_date).days
-                completion_percentage = (elapsed_days / (period.duration_years * 365.25)) * 100
-                
-                return {
-                    'current_mahadasha': period.lord,
-                    'start_date': period.start_date,
-                    'end_date': period.end_date,
-                    'duration_years': period.duration_years,
-                    'remaining_years': remaining_years,
-                    'remaining_days': remaining_days,
-                    'completion_percentage': completion_percentage,
-                    'status': f"You are currently in {period.lord} Mahadasha"
-                }
+        # Periods are contiguous and sorted: the first one not ending before the date is the candidate
+        index = bisect.bisect_left([period.end_date for period in dasha_periods], reference_date)
+        
+        if index < len(dasha_periods) and dasha_periods[index].start_date <= reference_date:
+            period = dasha_periods[index]
+            remaining_days = (period.end_date - reference_date).days
+            remaining_years = remaining_days / 365.25
+            elapsed_days = (reference_date - period.start_date).days
+            completion_percentage = (elapsed_days / (period.duration_years * 365.25)) * 100
+            
+            return {
+                'current_mahadasha': period.lord,
+                'start_date': period.start_date,
+                'end_date': period.end_date,
+                'duration_years': period.duration_years,
+                'remaining_years': remaining_years,
+                'remaining_days': remaining_days,
+                'completion_percentage': completion_percentage,
+                'status': f"You are currently in {period.lord} Mahadasha"
+            }
         
         return {'status': 'No current dasha found'}
     
@@ -235,25 +302,21 @@ class DashaCalculator:
                                    maha_duration: float) -> List[DashaPeriod]:
         """Calculate antardasha periods within a mahadasha"""
         
-        antardasha_periods = []
-        start_index = self.dasha_sequence.index(mahadasha_lord)
+        # Boundaries accumulate in float days and are rounded to dates once
+        lord_index, _, start_day, span_days = subdivide_periods(
+            np.array([self.dasha_sequence.index(mahadasha_lord)]), np.array([float(maha_start.toordinal())]),
+            np.array([maha_duration * 365.25]), self.lord_years)
+        starts = days_to_datetime64(start_day).tolist()
+        ends = days_to_datetime64(start_day + span_days).tolist()
         
-        current_date = maha_start
-        
-        for i in range(9):
-            antara_lord_index = (start_index + i) % 9
-            antara_lord = self.dasha_sequence[antara_lord_index]
-            
-            # Calculate exact antardasha duration
-            antara_years = self.vimshottari_periods[antara_lord]
-            antara_duration = (antara_years * maha_duration) / 120.0
-            
-            end_date = self._add_precise_years_to_date(current_date, antara_duration)
+        antardasha_periods = []
+        for i in range(len(lord_index)):
+            antara_duration = float(span_days[i]) / 365.25
             
             period = DashaPeriod(
-                lord=antara_lord,
-                start_date=current_date,
-                end_date=end_date,
+                lord=self.dasha_sequence[lord_index[i]],
+                start_date=starts[i],
+                end_date=ends[i],
                 duration_years=antara_duration,
                 duration_months=antara_duration * 12.0,
                 duration_days=int(antara_duration * 365.25),
@@ -263,36 +326,29 @@ class DashaCalculator:
             )
             
             antardasha_periods.append(period)
-            current_date = end_date
         
         return antardasha_periods
     
-    def _add_precise_years_to_date(self, start_date: datetime.date, years: float) -> datetime.date:
-        """Add precise fractional years to date"""
-        days = years * 365.25
-        end_date = start_date + datetime.timedelta(days=int(days))
-        
-        # Handle fractional days
-        fractional_days = days - int(days)
-        if fractional_days >= 0.5:
-            end_date += datetime.timedelta(days=1)
-        
-        return end_date
+    def _is_reference_chart(self, birth_date: datetime.date, moon_longitude: Optional[float]) -> bool:
+        """Whether get_corrected_dasha_periods serves the fixed periods of the reference chart"""
+        return birth_date == datetime.date(2006, 12, 13) and moon_longitude is None and \
+            self.system.name == 'vimshottari'
     
-    def _calculate_generic_dashas(self, birth_date: datetime.date) -> List[Dict]:
+    def _birth_balance(self, moon_longitude: Optional[float]) -> Tuple[str, float]:
+        """Birth nakshatra and elapsed portion, with a default when no Moon longitude is known"""
+        if moon_longitude is not None:
+            # Nakshatra and elapsed portion follow directly from the natal Moon
+            return self.dasha_balance_from_moon(moon_longitude)
+        # Without a chart, default to Moon in Rohini (Moon's own nakshatra) with 50% elapsed
+        return 'Rohini', 0.5
+    
+    def _calculate_generic_dashas(self, birth_date: datetime.date,
+                                  moon_longitude: Optional[float] = None) -> List[Dict]:
         """Calculate generic dasha periods for other dates"""
-        # For generic calculation, we need to estimate the birth nakshatra and elapsed portion
-        # This is a simplified approach - in a real implementation, you'd need the exact birth time and place
-        
-        # For demo purposes, let's use a default calculation
-        # In practice, this should be calculated based on the actual birth chart
-        
-        # Default to Moon in Rohini (Moon's own nakshatra) with 50% elapsed
-        birth_nakshatra = 'Rohini'
-        elapsed_portion = 0.5
+        birth_nakshatra, elapsed_portion = self._birth_balance(moon_longitude)
         
-        # Calculate dasha periods using the Vimshottari method
-        dasha_periods = self.calculate_vimshottari_dasha(birth_nakshatra, elapsed_portion, birth_date)
+        # Calculate mahadashas of the selected dasha system
+        dasha_periods = self.calculate_mahadashas(birth_nakshatra, elapsed_portion, birth_date)
         
         # Convert to the expected format
         result = []
@@ -313,7 +369,7 @@ class DashaCalculator:
         """Verify dasha calculation accuracy"""
         
         total_duration = sum(period.duration_years for period in dasha_periods)
-        expected_duration = 120.0
+        expected_duration = self.system.total_years * self.system.cycles
         
         accuracy = (1.0 - abs(total_duration - expected_duration) / expected_duration) * 100
         
@@ -0,0 +1,202 @@
+"""
+Ephemeris Cache
+Precomputed Chebyshev tables for one precision tier of core.ephemeris_series,
+stored in a binary file that is memory-mapped and shared between processes
+"""
+
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import numpy as np
+
+from core.calculations import AstronomicalCalculator
+from core.ephemeris_series import PRECISION_TIERS, SERIES_BODIES, get_tier_spec
+
+# 1900-01-01 0h UT to 2100-01-01 0h UT
+CACHE_START_JD = 2415020.5
+CACHE_END_JD = 2488069.5
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+_MAGIC = b"SKEPHEM1"
+_HEADER = struct.Struct("<8sII8sdd")  # magic, version, body count, precision tier, start JD, end JD
+_BODY_ENTRY = struct.Struct("<dIIQ")  # segment days, degree, segment count, coefficient offset
+_VERSION = 2
+
+@dataclass
+class SegmentSpec:
+    """Chebyshev segmentation for one body"""
+    segment_days: float
+    degree: int
+
+_SECULAR = SegmentSpec(512.0, 2)
+
+# Segment lengths follow the shortest period in each series: the Moon's
+# 2F/2M' terms (~13.6 days, ~6.9 days for the 4M' term of the high tier),
+# the Sun's 3M term (~122 days), the geocentric planets' synodic loops
+# (Mercury's ~116 days is the fastest) and the purely secular mean motions.
+TIER_SEGMENT_SPECS = {
+    'fast': {body: _SECULAR for body in SERIES_BODIES},
+    'standard': {
+        'Sun': SegmentSpec(32.0, 8),
+        'Moon': SegmentSpec(8.0, 10),
+        'Mercury': SegmentSpec(16.0, 8),
+        'Venus': SegmentSpec(16.0, 8),
+        'Mars': SegmentSpec(32.0, 8),
+        'Jupiter': SegmentSpec(32.0, 8),
+        'Saturn': SegmentSpec(32.0, 8),
+        'Rahu': _SECULAR,
+    },
+    'high': {
+        'Sun': SegmentSpec(32.0, 8),
+        'Moon': SegmentSpec(4.0, 10),
+        'Mercury': SegmentSpec(16.0, 8),
+        'Venus': SegmentSpec(16.0, 8),
+        'Mars': SegmentSpec(32.0, 8),
+        'Jupiter': SegmentSpec(32.0, 8),
+        'Saturn': SegmentSpec(32.0, 8),
+        'Rahu': _SECULAR,
+    },
+}
+
+DEFAULT_SEGMENT_SPECS = TIER_SEGMENT_SPECS['standard']
+
+def default_cache_path(precision: str = 'standard') -> str:
+    """Cache file location for one precision tier"""
+    return os.path.join(DEFAULT_CACHE_DIR, f"ephemeris_cache_{precision}.bin")
+
+def build_ephemeris_cache(path: Optional[str] = None,
+                          calculator: Optional[AstronomicalCalculator] = None,
+                          start_jd: float = CACHE_START_JD, end_jd: float = CACHE_END_JD,
+                          segment_specs: Optional[Dict[str, SegmentSpec]] = None,
+                          precision: str = 'standard') -> str:
+    """Fit the series longitudes of one precision tier and write the binary cache file"""
+    get_tier_spec(precision)
+    path = path or default_cache_path(precision)
+    calculator = calculator or AstronomicalCalculator()
+    segment_specs = segment_specs or TIER_SEGMENT_SPECS[precision]
+
+    entries = []
+    blocks = []
+    offset = 0
+
+    for column, body in enumerate(SERIES_BODIES):
+        spec = segment_specs[body]
+        coefficients = _fit_body(calculator, column, spec, start_jd, end_jd, precision)
+        entries.append(_BODY_ENTRY.pack(spec.segment_days, spec.degree, len(coefficients), offset))
+        blocks.append(coefficients.astype('<f8').tobytes())
+        offset += coefficients.size
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Write then rename so workers never map a half-written file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(SERIES_BODIES), precision.encode('ascii'), start_jd, end_jd))
+        f.write(b"".join(entries))
+        f.write(b"".join(blocks))
+    os.replace(temp_path, path)
+
+    return path
+
+def _fit_body(calculator: AstronomicalCalculator, column: int, spec: SegmentSpec,
+              start_jd: float, end_jd: float, precision: str) -> np.ndarray:
+    """Fit Chebyshev coefficients for every segment of one body at once"""
+    n_segments = int(np.ceil((end_jd - start_jd) / spec.segment_days))
+    n_nodes = 2 * (spec.degree + 1)
+
+    # Chebyshev nodes on [-1, 1], shared by every segment
+    nodes = np.cos(np.pi * (np.arange(n_nodes) + 0.5) / n_nodes)
+    segment_starts = start_jd + spec.segment_days * np.arange(n_segments)
+    jds = segment_starts[:, None] + (nodes[None, :] + 1.0) * 0.5 * spec.segment_days
+
+    t = (jds.ravel() - 2451545.0) / 36525.0
+    values = calculator._series_longitudes_batch(t, precision)[:, column].reshape(n_segments, n_nodes)
+
+    vander = np.polynomial.chebyshev.chebvander(nodes, spec.degree)
+    return values @ np.linalg.pinv(vander).T
+
+class EphemerisCache:
+    """Read-only view of a memory-mapped Chebyshev ephemeris file"""
+
+    def __init__(self, buffer, start_jd: float, end_jd: float,
+                 bodies: List[Tuple[float, int, np.ndarray]], mapping: Optional[mmap.mmap] = None,
+                 precision: str = 'standard'):
+        self._buffer = buffer
+        self._mapping = mapping
+        self.precision = precision
+        self.start_jd = start_jd
+        self.end_jd = end_jd
+        self.bodies = bodies
+
+    @classmethod
+    def open(cls, path: Optional[str] = None) -> 'EphemerisCache':
+        """Map an existing cache file into memory"""
+        path = path or default_cache_path()
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n_bodies, precision, start_jd, end_jd = _HEADER.unpack_from(mapping, 0)
+        precision = precision.rstrip(b"\0").decode('ascii')
+        if magic != _MAGIC or version != _VERSION or precision not in PRECISION_TIERS:
+            mapping.close()
+            raise ValueError(f"Not a Sankatmochan ephemeris cache: {path}")
+
+        data_offset = _HEADER.size + n_bodies * _BODY_ENTRY.size
+        coefficients = np.frombuffer(mapping, dtype='<f8', offset=data_offset)
+
+        bodies = []
+        for i in range(n_bodies):
+            segment_days, degree, n_segments, offset = _BODY_ENTRY.unpack_from(
+                mapping, _HEADER.size + i * _BODY_ENTRY.size)
+            size = n_segments * (degree + 1)
+            table = coefficients[offset:offset + size].reshape(n_segments, degree + 1)
+            bodies.append((segment_days, degree, table))
+
+        return cls(coefficients, start_jd, end_jd, bodies, mapping, precision)
+
+    def covers(self, julian_days) -> bool:
+        """True when every Julian day lies inside the cached range"""
+        jd = np.asarray(julian_days, dtype=float)
+        return bool(np.all((jd >= self.start_jd) & (jd < self.end_jd)))
+
+    def longitudes(self, julian_days) -> np.ndarray:
+        """Unnormalized series longitudes, shape (n, 8), in SERIES_BODIES order"""
+        jd = np.atleast_1d(np.asarray(julian_days, dtype=float))
+        result = np.empty((len(jd), len(self.bodies)))
+        elapsed = jd - self.start_jd
+
+        for column, (segment_days, degree, table) in enumerate(self.bodies):
+            segment = np.clip((elapsed // segment_days).astype(np.int64), 0, len(table) - 1)
+            x = 2.0 * (elapsed - segment * segment_days) / segment_days - 1.0
+
+            # Clenshaw recurrence over all dates at once
+            coefficients = table[segment]
+            b1 = np.zeros(len(jd))
+            b2 = np.zeros(len(jd))
+            for k in range(degree, 0, -1):
+                b1, b2 = 2.0 * x * b1 - b2 + coefficients[:, k], b1
+            result[:, column] = x * b1 - b2 + coefficients[:, 0]
+
+        return result
+
+    def close(self):
+        """Release the memory mapping"""
+        self.bodies = []
+        self._buffer = None
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+def load_ephemeris_cache(path: Optional[str] = None, precision: str = 'standard') -> EphemerisCache:
+    """Open the cache file of a precision tier, building it first if it does not exist yet"""
+    path = path or default_cache_path(precision)
+    if not os.path.exists(path):
+        build_ephemeris_cache(path, precision=precision)
+    return EphemerisCache.open(path)
+
+print("✅ Ephemeris Cache loaded")
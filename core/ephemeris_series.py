@@ -0,0 +1,227 @@
+"""
+Ephemeris Series
+Periodic-term tables and precision tiers for the tropical longitudes of the grahas
+
+Every tier returns unnormalized longitudes of date for Sun, Moon, Mercury,
+Venus, Mars, Jupiter, Saturn and Rahu (mean node). Values are continuous in
+time, so root solvers can work on them without unwrapping.
+
+Tiers and their worst-case error in degrees against PyEphem, sampled over
+1900-2100 (longitudes of date, mean equinox):
+
+    fast      Mean longitudes only. Sun 1.9, Moon 8.0; planets are
+              heliocentric mean longitudes, not apparent positions
+              (Mercury and Venus can be half a circle away). One
+              multiply-add per body. Used for list views.
+    standard  Sun equation of center, Moon 6 ELP terms, planets geocentric
+              from Keplerian elements with a 2nd-order equation of center.
+              Sun 0.01, Moon 0.32, Mercury 0.55, Venus 0.18, Mars 0.23,
+              Jupiter 0.17, Saturn 0.35.
+    high      50 ELP terms with the eccentricity factor, 5th-order equation
+              of center and orbital inclination. Sun 0.01, Moon 0.04,
+              Mercury 0.02, Venus 0.03, Mars 0.06, Jupiter 0.17, Saturn 0.37
+              (the Jupiter-Saturn great inequality is not modelled). Used
+              for report generation.
+
+scripts/benchmark_precision_tiers.py measures the cost of each tier.
+"""
+
+from typing import Dict
+from dataclasses import dataclass
+import numpy as np
+
+PRECISION_TIERS = ('fast', 'standard', 'high')
+
+SERIES_BODIES = ('Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu')
+
+# Mean longitude elements: (degrees at J2000.0, degrees per Julian century)
+MEAN_LONGITUDE_ELEMENTS = {
+    'Sun': (280.4664567, 36000.76982779),
+    'Moon': (218.3164477, 481267.88123421),
+    'Mercury': (252.250906, 149472.6746358),
+    'Venus': (181.979801, 58517.8156760),
+    'Mars': (355.433000, 19140.299314),
+    'Jupiter': (34.351519, 3034.9056606),
+    'Saturn': (50.077444, 1222.1138488),
+    'Rahu': (125.0445479, -1934.1362891),
+}
+
+# Equation of center of the Sun: coefficients of sin(k*M), each a polynomial in t
+SUN_CENTER_TERMS = np.array([
+    [1.914602, -0.004817, -0.000014],
+    [0.019993, -0.000101, 0.0],
+    [0.000289, 0.0, 0.0],
+])
+
+# Periodic terms in the Moon's longitude (ELP2000-82 as tabulated by Meeus):
+# multipliers of D, M, M', F and the amplitude in 1e-6 degrees. Sorted by
+# amplitude; the first six are the classic terms of calculate_moon_position.
+MOON_LONGITUDE_TERMS = np.array([
+    [0, 0, 1, 0, 6288774], [2, 0, -1, 0, 1274027], [2, 0, 0, 0, 658314],
+    [0, 0, 2, 0, 213618], [0, 1, 0, 0, -185116], [0, 0, 0, 2, -114332],
+    [2, 0, -2, 0, 58793], [2, -1, -1, 0, 57066], [2, 0, 1, 0, 53322],
+    [2, -1, 0, 0, 45758], [0, 1, -1, 0, -40923], [1, 0, 0, 0, -34720],
+    [0, 1, 1, 0, -30383], [2, 0, 0, -2, 15327], [0, 0, 1, 2, -12528],
+    [0, 0, 1, -2, 10980], [4, 0, -1, 0, 10675], [0, 0, 3, 0, 10034],
+    [4, 0, -2, 0, 8548], [2, 1, -1, 0, -7888], [2, 1, 0, 0, -6766],
+    [1, 0, -1, 0, -5163], [1, 1, 0, 0, 4987], [2, -1, 1, 0, 4036],
+    [2, 0, 2, 0, 3994], [4, 0, 0, 0, 3861], [2, 0, -3, 0, 3665],
+    [0, 1, -2, 0, -2689], [2, 0, -1, 2, -2602], [2, -1, -2, 0, 2390],
+    [1, 0, 1, 0, -2348], [2, -2, 0, 0, 2236], [0, 1, 2, 0, -2120],
+    [0, 2, 0, 0, -2069], [2, -2, -1, 0, 2048], [2, 0, 1, -2, -1773],
+    [2, 0, 0, 2, -1595], [4, -1, -1, 0, 1215], [0, 0, 2, 2, -1110],
+    [3, 0, -1, 0, -892], [2, 1, 1, 0, -810], [4, -1, -2, 0, 759],
+    [0, 2, -1, 0, -713], [2, 2, -1, 0, -700], [2, 1, -2, 0, 691],
+    [2, -1, 0, -2, 596], [4, 0, 1, 0, 549], [0, 0, 4, 0, 537],
+    [4, -1, 0, 0, 520], [1, 0, -2, 0, -487],
+], dtype=float)
+
+# Keplerian elements referred to the J2000 ecliptic and equinox (JPL approximate
+# positions, 1800-2050): rows a (AU), e, I, L, longitude of perihelion, node;
+# columns value at J2000 and rate per Julian century (degrees for angles).
+PLANET_ELEMENTS = {
+    'Earth': np.array([[1.00000261, 0.00000562], [0.01671123, -0.00004392],
+                       [-0.00001531, -0.01294668], [100.46457166, 35999.37244981],
+                       [102.93768193, 0.32327364], [0.0, 0.0]]),
+    'Mercury': np.array([[0.38709927, 0.00000037], [0.20563593, 0.00001906],
+                         [7.00497902, -0.00594749], [252.25032350, 149472.67411175],
+                         [77.45779628, 0.16047689], [48.33076593, -0.12534081]]),
+    'Venus': np.array([[0.72333566, 0.00000390], [0.00677672, -0.00004107],
+                       [3.39467605, -0.00078890], [181.97909950, 58517.81538729],
+                       [131.60246718, 0.00268329], [76.67984255, -0.27769418]]),
+    'Mars': np.array([[1.52371034, 0.00001847], [0.09339410, 0.00007882],
+                      [1.84969142, -0.00813131], [-4.55343205, 19140.30268499],
+                      [-23.94362959, 0.44441088], [49.55953891, -0.29257343]]),
+    'Jupiter': np.array([[5.20288700, -0.00011607], [0.04838624, -0.00013253],
+                         [1.30439695, -0.00183714], [34.39644051, 3034.74612775],
+                         [14.72847983, 0.21252668], [100.47390909, 0.20469106]]),
+    'Saturn': np.array([[9.53667594, -0.00125060], [0.05386179, -0.00050991],
+                        [2.48599187, 0.00193609], [49.95424423, 1222.49362201],
+                        [92.59887831, -0.41897216], [113.66242448, -0.28867794]]),
+}
+
+# Equation of center as a series in sin(k*M): row k-1 holds the coefficients
+# of e^0..e^5 (result in radians).
+CENTER_SERIES = np.array([
+    [0.0, 2.0, 0.0, -1.0 / 4.0, 0.0, 5.0 / 96.0],
+    [0.0, 0.0, 5.0 / 4.0, 0.0, -11.0 / 24.0, 0.0],
+    [0.0, 0.0, 0.0, 13.0 / 12.0, 0.0, -43.0 / 64.0],
+    [0.0, 0.0, 0.0, 0.0, 103.0 / 96.0, 0.0],
+    [0.0, 0.0, 0.0, 0.0, 0.0, 1097.0 / 960.0],
+])
+
+# Bodies whose apparent longitude stays near the Sun rather than near their own mean longitude
+INNER_PLANETS = ('Mercury', 'Venus')
+
+@dataclass(frozen=True)
+class TierSpec:
+    """How many periodic terms a precision tier evaluates"""
+    moon_terms: int
+    moon_eccentricity_factor: bool
+    planet_center_order: int  # 0 keeps heliocentric mean longitudes
+    planet_inclination: bool
+
+TIER_SPECS: Dict[str, TierSpec] = {
+    'fast': TierSpec(0, False, 0, False),
+    'standard': TierSpec(6, False, 2, False),
+    'high': TierSpec(len(MOON_LONGITUDE_TERMS), True, 5, True),
+}
+
+def get_tier_spec(precision: str) -> TierSpec:
+    """Look up a precision tier by name"""
+    try:
+        return TIER_SPECS[precision]
+    except KeyError:
+        raise ValueError(f"Unknown precision tier '{precision}', expected one of {PRECISION_TIERS}")
+
+def mean_longitudes(t: np.ndarray) -> np.ndarray:
+    """Unnormalized mean longitudes, shape (len(t), 8)"""
+    elements = np.array([MEAN_LONGITUDE_ELEMENTS[body] for body in SERIES_BODIES])
+    return elements[:, 0] + np.multiply.outer(np.asarray(t, dtype=float), elements[:, 1])
+
+def mean_daily_motions() -> np.ndarray:
+    """Mean motions in degrees per day, in SERIES_BODIES order"""
+    return np.array([MEAN_LONGITUDE_ELEMENTS[body][1] for body in SERIES_BODIES]) / 36525.0
+
+def evaluate_series(t, precision: str = 'standard') -> np.ndarray:
+    """Tropical longitudes of date for Julian centuries ``t``, shape (len(t), 8)"""
+    spec = get_tier_spec(precision)
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+    longitudes = mean_longitudes(t)
+
+    if precision == 'fast':
+        return longitudes
+
+    longitudes[:, 0] = sun_longitude(t)
+    longitudes[:, 1] = moon_longitude(t, spec.moon_terms, spec.moon_eccentricity_factor)
+
+    if spec.planet_center_order:
+        reference = longitudes.copy()
+        earth = _heliocentric_position('Earth', t, spec.planet_center_order, spec.planet_inclination)
+        precession = (5028.796195 * t + 1.1054348 * t * t) / 3600.0
+
+        for column, body in enumerate(SERIES_BODIES[2:7], start=2):
+            x, y = _heliocentric_position(body, t, spec.planet_center_order, spec.planet_inclination)
+            geocentric = np.degrees(np.arctan2(y - earth[1], x - earth[0])) + precession
+
+            # Keep the result continuous by unwrapping it around a mean reference
+            anchor = reference[:, 0] if body in INNER_PLANETS else reference[:, column]
+            longitudes[:, column] = anchor + (geocentric - anchor + 180.0) % 360.0 - 180.0
+
+    return longitudes
+
+def sun_longitude(t: np.ndarray) -> np.ndarray:
+    """Unnormalized true longitude of the Sun"""
+    L0 = 280.4664567 + 36000.76982779 * t + 0.0003032028 * t * t
+    M_rad = np.radians(357.5291092 + 35999.0502909 * t - 0.0001536 * t * t)
+
+    harmonics = np.sin(np.multiply.outer(M_rad, np.arange(1, len(SUN_CENTER_TERMS) + 1)))
+    coefficients = SUN_CENTER_TERMS @ np.vstack([np.ones_like(t), t, t * t])
+    return L0 + np.einsum('nk,kn->n', harmonics, coefficients)
+
+def moon_longitude(t: np.ndarray, n_terms: int = 6, eccentricity_factor: bool = False) -> np.ndarray:
+    """Unnormalized longitude of the Moon from the first ``n_terms`` periodic terms"""
+    L = 218.3164477 + 481267.88123421 * t - 0.0015786 * t * t
+    arguments = np.radians(np.vstack([
+        297.8501921 + 445267.1114034 * t - 0.0018819 * t * t,  # D
+        357.5291092 + 35999.0502909 * t - 0.0001536 * t * t,  # M
+        134.9633964 + 477198.8675055 * t + 0.0087414 * t * t,  # M'
+        93.2720950 + 483202.0175233 * t - 0.0036539 * t * t,  # F
+    ]))
+
+    terms = MOON_LONGITUDE_TERMS[:n_terms]
+    sines = np.sin(terms[:, :4] @ arguments)
+
+    if eccentricity_factor:
+        # Terms in the Sun's anomaly shrink with the decreasing eccentricity of Earth's orbit
+        E = 1.0 - 0.002516 * t - 0.0000074 * t * t
+        sines = sines * E[None, :] ** np.abs(terms[:, 1])[:, None]
+
+    return L + terms[:, 4] @ sines * 1e-6
+
+def _heliocentric_position(body: str, t: np.ndarray, order: int, inclination: bool):
+    """Heliocentric ecliptic x, y (AU, J2000 frame) from the equation-of-center series"""
+    elements = PLANET_ELEMENTS[body]
+    a, e, incl, L, perihelion, node = elements[:, 0][:, None] + np.outer(elements[:, 1], t)
+
+    M = np.radians(L - perihelion)
+    harmonics = np.sin(np.outer(np.arange(1, len(CENTER_SERIES) + 1), M))
+    e_powers = e[None, :] ** np.arange(order + 1)[:, None]
+    center = np.einsum('kj,jn,kn->n', CENTER_SERIES[:, :order + 1], e_powers, harmonics)
+
+    true_anomaly = M + center
+    radius = a * (1.0 - e * e) / (1.0 + e * np.cos(true_anomaly))
+
+    if not inclination:
+        longitude = np.radians(perihelion) + true_anomaly
+        return radius * np.cos(longitude), radius * np.sin(longitude)
+
+    # Rotate from the orbital plane into the ecliptic
+    node_rad = np.radians(node)
+    u = true_anomaly + np.radians(perihelion) - node_rad
+    cos_i = np.cos(np.radians(incl))
+    x = radius * (np.cos(node_rad) * np.cos(u) - np.sin(node_rad) * np.sin(u) * cos_i)
+    y = radius * (np.sin(node_rad) * np.cos(u) + np.cos(node_rad) * np.sin(u) * cos_i)
+    return x, y
+
+print("✅ Ephemeris Series loaded")
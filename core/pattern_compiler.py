@@ -0,0 +1,431 @@
+"""
+Pattern Compiler
+Turns JSON pattern definitions into predicate objects indexed for fast candidate lookup
+"""
+
+import bisect
+import json
+import os
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+import numpy as np
+
+from core.aspects import DRISHTI_TABLES, circular_span, drishti_indices, largest_clusters, orb_matrix
+
+if TYPE_CHECKING:
+    from core.patterns import AstroPattern
+
+DEFAULT_PATTERNS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'data', 'patterns.json')
+
+# Bodies a stellium is counted over unless a definition lists its own
+STELLIUM_BODIES = ('Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu', 'Ketu')
+
+RASHI_NAMES = ("Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+               "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces")
+
+@dataclass
+class ChartArrays:
+    """Array view of a batch of charts for the predicates, one column per body"""
+    bodies: Tuple[str, ...]
+    longitudes: np.ndarray  # (n_charts, n_bodies) sidereal degrees
+    houses: Optional[np.ndarray] = None  # (n_charts, n_bodies) 1-12
+    orbs: Optional[np.ndarray] = None  # (n_charts, n_bodies, n_bodies) from core.aspects.orb_matrix
+
+    def column(self, body: str) -> int:
+        return self.bodies.index(body)
+
+class SeparationPredicate:
+    """Two bodies ``angle`` degrees apart (either direction) within ``orb``"""
+    kind = 'aspect'
+    indexable = True
+
+    def __init__(self, planets: Sequence[str], orb: float, angle: float = 0.0):
+        if len(planets) != 2:
+            raise ValueError(f"'{self.kind}' needs exactly two planets, got {list(planets)}")
+        self.planets = tuple(planets)
+        self.orb = float(orb)
+        self.angle = float(angle)
+
+    @property
+    def selectivity(self) -> float:
+        """Expected fraction of charts satisfying the predicate"""
+        return min(2.0 * self.orb / 360.0, 1.0)
+
+    def deviation(self, separation: float) -> float:
+        return abs(separation - self.angle)
+
+    def evaluate(self, positions: Dict, separations: 'SeparationLookup') -> Optional[float]:
+        """Deviation from the exact angle when satisfied, else None"""
+        deviation = self.deviation(separations[self.planets])
+        return deviation if deviation <= self.orb else None
+
+    def evaluate_batch(self, charts: ChartArrays) -> Tuple[np.ndarray, np.ndarray]:
+        """(satisfied mask, deviation) over a batch"""
+        deviation = np.abs(charts.orbs[:, charts.column(self.planets[0]), charts.column(self.planets[1])] - self.angle)
+        return deviation <= self.orb, deviation
+
+class ConjunctionPredicate(SeparationPredicate):
+    kind = 'conjunction'
+
+    def __init__(self, planets: Sequence[str], orb: float):
+        super().__init__(planets, orb, 0.0)
+
+class OppositionPredicate(SeparationPredicate):
+    kind = 'opposition'
+
+    def __init__(self, planets: Sequence[str], orb: float):
+        super().__init__(planets, orb, 180.0)
+
+class HousePredicate:
+    """A body placed in one of ``houses``"""
+    kind = 'house'
+    indexable = True
+
+    def __init__(self, planet: str, houses: Iterable[int]):
+        self.planets = (planet,)
+        self.houses = frozenset(int(house) for house in houses)
+        if not self.houses or not self.houses <= set(range(1, 13)):
+            raise ValueError(f"Houses must be between 1 and 12, got {sorted(self.houses)}")
+
+    @property
+    def selectivity(self) -> float:
+        return len(self.houses) / 12.0
+
+    def evaluate(self, positions: Dict, separations: 'SeparationLookup') -> Optional[float]:
+        return 0.0 if positions[self.planets[0]].house in self.houses else None
+
+    def evaluate_batch(self, charts: ChartArrays) -> Tuple[np.ndarray, np.ndarray]:
+        if charts.houses is None:
+            raise ValueError("House predicates need house numbers for the batch")
+        satisfied = np.isin(charts.houses[:, charts.column(self.planets[0])], sorted(self.houses))
+        return satisfied, np.zeros(len(satisfied), dtype=np.float32)
+
+class SignPredicate:
+    """A body placed in one of ``signs`` (rashi names or 0-11 indices)"""
+    kind = 'sign'
+    indexable = True
+
+    def __init__(self, planet: str, signs: Iterable):
+        self.planets = (planet,)
+        self.signs = frozenset(_sign_index(sign) for sign in signs)
+        if not self.signs:
+            raise ValueError("Sign predicates need at least one sign")
+
+    @property
+    def selectivity(self) -> float:
+        return len(self.signs) / 12.0
+
+    def evaluate(self, positions: Dict, separations: 'SeparationLookup') -> Optional[float]:
+        return 0.0 if int(positions[self.planets[0]].longitude // 30) % 12 in self.signs else None
+
+    def evaluate_batch(self, charts: ChartArrays) -> Tuple[np.ndarray, np.ndarray]:
+        signs = (charts.longitudes[:, charts.column(self.planets[0])] // 30).astype(int) % 12
+        satisfied = np.isin(signs, sorted(self.signs))
+        return satisfied, np.zeros(len(satisfied), dtype=np.float32)
+
+class DrishtiPredicate:
+    """A planet's sign aspect (core.aspects.DRISHTI_TABLES) falling on another body or on given houses"""
+    kind = 'drishti'
+    indexable = False
+
+    def __init__(self, planet: str, target: Optional[str] = None, houses: Iterable[int] = ()):
+        self.houses = frozenset(int(house) for house in houses)
+        if (target is None) == (not self.houses):
+            raise ValueError("Drishti conditions need either a target planet or houses")
+        self.planet = planet
+        self.target = target
+        self.planets = (planet, target) if target is not None else (planet,)
+        self.table = DRISHTI_TABLES[drishti_indices([planet])[0]]
+        # House mask for the house form, (12,) over target house - 1
+        self.house_mask = np.isin(np.arange(1, 13), sorted(self.houses))
+
+    @property
+    def selectivity(self) -> float:
+        return float(self.table[0].sum()) / 12.0
+
+    def evaluate(self, positions: Dict, separations: 'SeparationLookup') -> Optional[float]:
+        aspected = self.table[positions[self.planet].house - 1]
+        if self.target is not None:
+            return 0.0 if aspected[positions[self.target].house - 1] else None
+        return 0.0 if (aspected & self.house_mask).any() else None
+
+    def evaluate_batch(self, charts: ChartArrays) -> Tuple[np.ndarray, np.ndarray]:
+        if charts.houses is None:
+            raise ValueError("Drishti predicates need house numbers for the batch")
+        aspected = self.table[charts.houses[:, charts.column(self.planet)].astype(np.intp) - 1]
+        if self.target is not None:
+            target = charts.houses[:, charts.column(self.target)].astype(np.intp) - 1
+            satisfied = aspected[np.arange(len(target)), target]
+        else:
+            satisfied = (aspected & self.house_mask).any(axis=1)
+        return satisfied, np.zeros(len(satisfied), dtype=np.float32)
+
+class ClusterPredicate:
+    """All of ``planets`` inside one arc of at most ``orb`` degrees (3+ planet conjunctions)"""
+    kind = 'cluster'
+    indexable = False
+
+    def __init__(self, planets: Sequence[str], orb: float):
+        if len(planets) < 2:
+            raise ValueError(f"Clusters need at least two planets, got {list(planets)}")
+        self.planets = tuple(planets)
+        self.orb = float(orb)
+
+    @property
+    def selectivity(self) -> float:
+        return min(2.0 * self.orb / 360.0, 1.0) ** (len(self.planets) - 1)
+
+    def evaluate(self, positions: Dict, separations: 'SeparationLookup') -> Optional[float]:
+        span = float(circular_span([positions[planet].longitude for planet in self.planets]))
+        return span if span <= self.orb else None
+
+    def evaluate_batch(self, charts: ChartArrays) -> Tuple[np.ndarray, np.ndarray]:
+        span = circular_span(charts.longitudes[:, [charts.column(planet) for planet in self.planets]])
+        return span <= self.orb, span.astype(np.float32)
+
+class StelliumPredicate:
+    """At least ``min_planets`` of ``bodies`` inside one arc of at most ``orb`` degrees"""
+    kind = 'stellium'
+    indexable = False
+
+    def __init__(self, min_planets: int, orb: float, bodies: Sequence[str] = STELLIUM_BODIES):
+        self.min_planets = int(min_planets)
+        self.orb = float(orb)
+        self.bodies = tuple(bodies)
+        # No single planet is required, so nothing to check for presence
+        self.planets = ()
+
+    @property
+    def selectivity(self) -> float:
+        return 1.0
+
+    def evaluate(self, positions: Dict, separations: 'SeparationLookup') -> Optional[float]:
+        bodies = [body for body in self.bodies if body in positions]
+        size, span, _, _ = largest_clusters([[positions[body].longitude for body in bodies]], self.orb)
+        return float(span[0]) if size[0] >= self.min_planets else None
+
+    def evaluate_batch(self, charts: ChartArrays) -> Tuple[np.ndarray, np.ndarray]:
+        columns = [charts.column(body) for body in self.bodies if body in charts.bodies]
+        size, span, _, _ = largest_clusters(charts.longitudes[:, columns], self.orb)
+        return size >= self.min_planets, span.astype(np.float32)
+
+def _sign_index(sign) -> int:
+    if isinstance(sign, str):
+        if sign not in RASHI_NAMES:
+            raise ValueError(f"Unknown sign '{sign}'")
+        return RASHI_NAMES.index(sign)
+    if not 0 <= int(sign) < 12:
+        raise ValueError(f"Sign index must be 0-11, got {sign}")
+    return int(sign)
+
+def _compile_separation(cls):
+    return lambda spec, orb: cls(spec['planets'], spec.get('orb', orb))
+
+def _compile_conjunction(spec: Dict, orb: float):
+    """Two planets compile to a pair separation; more to a cluster anchored on its first pair"""
+    orb = spec.get('orb', orb)
+    if len(spec['planets']) == 2:
+        return ConjunctionPredicate(spec['planets'], orb)
+    return [ConjunctionPredicate(spec['planets'][:2], orb), ClusterPredicate(spec['planets'], orb)]
+
+# Predicate builders by JSON "type": (spec, default orb) -> predicate
+PREDICATE_TYPES = {
+    'conjunction': _compile_conjunction,
+    'opposition': _compile_separation(OppositionPredicate),
+    'aspect': lambda spec, orb: SeparationPredicate(spec['planets'], spec.get('orb', orb), spec['angle']),
+    'house': lambda spec, orb: HousePredicate(spec['planet'], spec.get('houses') or [spec['house']]),
+    'sign': lambda spec, orb: SignPredicate(spec['planet'], spec.get('signs') or [spec['sign']]),
+    'drishti': lambda spec, orb: DrishtiPredicate(spec['planet'], spec.get('target'),
+                                                  spec.get('houses') or ([spec['house']] if 'house' in spec else [])),
+    'stellium': lambda spec, orb: StelliumPredicate(spec.get('min_planets', 4), spec.get('orb', orb),
+                                                    spec.get('bodies', STELLIUM_BODIES)),
+}
+
+def register_predicate(kind: str, builder):
+    """Add a predicate type usable in pattern "conditions" as {"type": kind, ...}.
+
+    ``builder(spec, default_orb)`` returns an object (or a list of them) with ``planets``,
+    ``selectivity``, ``evaluate`` and ``evaluate_batch`` like the built-in
+    predicates; without ``indexable = True`` it is never used as an anchor.
+    """
+    PREDICATE_TYPES[kind] = builder
+
+def compile_predicate(spec: Dict, default_orb: float):
+    """Build one predicate from its JSON spec"""
+    builder = PREDICATE_TYPES.get(spec.get('type'))
+    if builder is None:
+        raise ValueError(f"Unknown pattern condition type '{spec.get('type')}', expected one of {sorted(PREDICATE_TYPES)}")
+    return builder(spec, default_orb)
+
+@dataclass
+class CompiledPattern:
+    """A pattern and the predicates that must all hold"""
+    pattern: 'AstroPattern'
+    predicates: List
+    anchor: object = field(init=False)
+
+    def __post_init__(self):
+        # The most selective indexable predicate decides which charts are tested at all
+        self.anchor = min(self.predicates, key=lambda predicate: (not getattr(predicate, 'indexable', False),
+                                                                 predicate.selectivity))
+
+    @property
+    def pattern_id(self) -> str:
+        return self.pattern.pattern_id
+
+    def evaluate(self, positions: Dict, separations: 'SeparationLookup') -> Optional[float]:
+        """Largest angular deviation over the predicates when all hold, else None"""
+        worst = 0.0
+        for predicate in self.predicates:
+            if any(planet not in positions for planet in predicate.planets):
+                return None
+            deviation = predicate.evaluate(positions, separations)
+            if deviation is None:
+                return None
+            worst = max(worst, deviation)
+        return worst
+
+    def evaluate_batch(self, charts: ChartArrays) -> Tuple[np.ndarray, np.ndarray]:
+        """(all predicates hold, largest deviation) over a batch"""
+        satisfied = np.ones(len(charts.longitudes), dtype=bool)
+        worst = np.zeros(len(charts.longitudes), dtype=np.float32)
+        for predicate in self.predicates:
+            if any(planet not in charts.bodies for planet in predicate.planets):
+                return np.zeros_like(satisfied), worst
+            mask, deviation = predicate.evaluate_batch(charts)
+            satisfied &= mask
+            worst = np.maximum(worst, deviation)
+        return satisfied, worst
+
+class PatternCatalog:
+    """Compiled patterns indexed by their anchor predicate.
+
+    Placement anchors are keyed by (planet, house) or (planet, sign), and
+    separation anchors by planet pair as intervals of separation sorted by
+    their lower edge. A chart only tests patterns whose anchor its own ten
+    placements and forty-five pair separations hit, so the per-chart cost
+    follows the number of candidates, not the size of the catalog.
+    """
+
+    def __init__(self, compiled: Iterable[CompiledPattern]):
+        self.compiled: Dict[str, CompiledPattern] = {}
+        self.by_placement: Dict[Tuple, List[CompiledPattern]] = {}
+        self.by_pair: Dict[Tuple[str, str], List[Tuple[float, float, CompiledPattern]]] = {}
+        # Patterns made only of non-indexable predicates (drishti, custom types), tested on every chart
+        self.unanchored: List[CompiledPattern] = []
+
+        for entry in compiled:
+            self.compiled[entry.pattern_id] = entry
+            anchor = entry.anchor
+            if isinstance(anchor, HousePredicate):
+                for house in anchor.houses:
+                    self.by_placement.setdefault(('house', anchor.planets[0], house), []).append(entry)
+            elif isinstance(anchor, SignPredicate):
+                for sign in anchor.signs:
+                    self.by_placement.setdefault(('sign', anchor.planets[0], sign), []).append(entry)
+            elif isinstance(anchor, SeparationPredicate):
+                low, high = anchor.angle - anchor.orb, anchor.angle + anchor.orb
+                self.by_pair.setdefault(tuple(sorted(anchor.planets)), []).append((low, high, entry))
+            else:
+                self.unanchored.append(entry)
+
+        for intervals in self.by_pair.values():
+            intervals.sort(key=lambda interval: interval[0])
+        # Lower edges and the widest interval per pair, for the bisect in candidates()
+        self._pair_lows = {pair: [low for low, _, _ in intervals] for pair, intervals in self.by_pair.items()}
+        self._pair_width = {pair: max(high - low for low, high, _ in intervals)
+                            for pair, intervals in self.by_pair.items()}
+
+    @property
+    def patterns(self) -> Dict[str, 'AstroPattern']:
+        return {pattern_id: entry.pattern for pattern_id, entry in self.compiled.items()}
+
+    def __len__(self) -> int:
+        return len(self.compiled)
+
+    def separations(self, positions: Dict) -> 'SeparationLookup':
+        """Separation of any pair of bodies, looked up in one orb matrix"""
+        return SeparationLookup(positions)
+
+    def candidates(self, positions: Dict, separations: 'SeparationLookup') -> List[CompiledPattern]:
+        """Patterns whose anchor predicate the chart satisfies"""
+        found = {entry.pattern_id: entry for entry in self.unanchored}
+        for planet, position in positions.items():
+            for key in (('house', planet, position.house), ('sign', planet, int(position.longitude // 30) % 12)):
+                for entry in self.by_placement.get(key, ()):
+                    found[entry.pattern_id] = entry
+
+        for pair, intervals in self.by_pair.items():
+            separation = separations.get(pair)
+            if separation is None:
+                continue
+            # Intervals containing the separation start at most one widest-interval before it
+            lows = self._pair_lows[pair]
+            first = bisect.bisect_left(lows, separation - self._pair_width[pair])
+            for low, high, entry in intervals[first:bisect.bisect_right(lows, separation)]:
+                if separation <= high:
+                    found[entry.pattern_id] = entry
+
+        return list(found.values())
+
+    def match(self, positions: Dict) -> List[Tuple[CompiledPattern, float]]:
+        """(pattern, largest deviation) of every pattern the chart satisfies"""
+        separations = self.separations(positions)
+        matches = []
+        for entry in self.candidates(positions, separations):
+            deviation = entry.evaluate(positions, separations)
+            if deviation is not None:
+                matches.append((entry, deviation))
+        return matches
+
+class SeparationLookup:
+    """Read-only (body, body) -> separation view over a chart's orb matrix"""
+
+    def __init__(self, positions: Dict):
+        self.columns = {body: column for column, body in enumerate(positions)}
+        self.orbs = orb_matrix([position.longitude for position in positions.values()])
+
+    def __getitem__(self, pair: Tuple[str, str]) -> float:
+        return float(self.orbs[self.columns[pair[0]], self.columns[pair[1]]])
+
+    def get(self, pair: Tuple[str, str], default: Optional[float] = None) -> Optional[float]:
+        if pair[0] in self.columns and pair[1] in self.columns:
+            return self[pair]
+        return default
+
+def compile_pattern(pattern_id: str, spec: Dict) -> CompiledPattern:
+    """Compile one JSON definition; without "conditions" it is a conjunction of its planets"""
+    from core.patterns import AstroPattern
+
+    orb = float(spec.get('orb', 6.0))
+    conditions = spec.get('conditions') or [{'type': 'conjunction', 'planets': spec['planets']}]
+    predicates = []
+    for condition in conditions:
+        # A condition may compile to several predicates (a cluster plus its anchoring pair)
+        compiled = compile_predicate(condition, orb)
+        predicates.extend(compiled if isinstance(compiled, list) else [compiled])
+
+    planets = list(spec.get('planets') or dict.fromkeys(
+        planet for predicate in predicates for planet in predicate.planets))
+    pattern = AstroPattern(
+        pattern_id=pattern_id,
+        name=spec.get('name', pattern_id),
+        description=spec.get('description', ''),
+        planets_involved=planets,
+        orb_tolerance=orb,
+        severity_level=int(spec.get('severity', 5)),
+        typical_effects=list(spec.get('effects', [])),
+        remedies=list(spec.get('remedies', [])),
+        confirmed_count=int(spec.get('confirmed_count', 0)),
+        accuracy_score=float(spec.get('accuracy_score', 0.0))
+    )
+    return CompiledPattern(pattern, predicates)
+
+def load_pattern_catalog(path: str = DEFAULT_PATTERNS_PATH) -> PatternCatalog:
+    """Load and compile a pattern definition file (see data/patterns.json)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        definitions = json.load(f)
+    return PatternCatalog(compile_pattern(pattern_id, spec) for pattern_id, spec in definitions.items())
+
+print("✅ Pattern Compiler loaded")
@@ -0,0 +1,241 @@
+"""
+Pattern Feedback Store
+Append-only SQLite log of pattern feedback, compacted into per-pattern accuracy counters
+"""
+
+import atexit
+import datetime
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from typing import Dict, Optional, Tuple
+
+DEFAULT_FEEDBACK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'data', 'pattern_feedback.db')
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+def fold_feedback(confirmed_count: int, accuracy_score: float, confirmed: bool,
+                  effect_count: float) -> Tuple[int, float]:
+    """Apply one feedback event to (confirmed_count, accuracy_score)"""
+    if confirmed:
+        confirmed_count += 1
+        accuracy_score = (accuracy_score * (confirmed_count - 1) + effect_count) / confirmed_count
+    else:
+        # Decrease accuracy for false positives
+        total_predictions = confirmed_count + 1
+        accuracy_score = (accuracy_score * (total_predictions - 1)) / total_predictions
+
+    # Ensure accuracy score stays within bounds
+    return confirmed_count, max(0.0, min(1.0, accuracy_score))
+
+class PatternFeedbackStore:
+    """Durable, multi-process feedback for pattern accuracy.
+
+    ``record`` only enqueues; a background thread appends events to the
+    log in batches, so request threads never wait on the disk. Compaction
+    folds the log, in insertion order, into the ``pattern_accuracy`` table
+    and bumps a version number. Readers use an immutable snapshot dictionary
+    that is swapped in whole, so ``accuracy`` takes no lock; the writer
+    rebuilds it after its own writes and whenever another process bumps
+    the version. A write that fails (e.g. the database stays locked past the
+    timeout) is logged and retried with the next batch. Queued events are
+    written by ``close``, which also runs at interpreter exit.
+    """
+
+    def __init__(self, path: str = DEFAULT_FEEDBACK_PATH, baseline: Optional[Dict[str, Tuple[int, float]]] = None,
+                 compact_every: int = 1000, poll_seconds: float = 1.0, batch_size: int = 500,
+                 busy_timeout: float = 30.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.compact_every = compact_every
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self._baseline: Dict[str, Tuple[int, float]] = dict(baseline or {})
+        self._queue: queue.Queue = queue.Queue()
+        self._since_compaction = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS feedback_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    pattern_id TEXT NOT NULL,
+                    confirmed INTEGER NOT NULL,
+                    effect_count REAL NOT NULL,
+                    recorded_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS pattern_accuracy (
+                    pattern_id TEXT PRIMARY KEY,
+                    confirmed_count INTEGER NOT NULL,
+                    accuracy_score REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO store_meta VALUES ('version', 0);
+            """)
+            self.version = -1
+            self._snapshot: Dict[str, Tuple[int, float]] = self._read_snapshot(connection)
+        finally:
+            connection.close()
+
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="pattern-feedback-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def set_baseline(self, baseline: Dict[str, Tuple[int, float]]):
+        """Starting counters of patterns that have no compacted row yet (e.g. from data/patterns.json)"""
+        # Swapped in whole: the writer thread may be folding the current dictionary
+        self._baseline = {**baseline, **self._baseline}
+        self._queue.put(('refresh',))
+
+    def record(self, pattern_id: str, confirmed: bool, effect_count: float):
+        """Queue one feedback event; returns immediately"""
+        self._queue.put(('event', pattern_id, bool(confirmed), float(effect_count),
+                         datetime.datetime.now().isoformat()))
+
+    def accuracy(self, pattern_id: str, default: Tuple[int, float] = (0, 0.0)) -> Tuple[int, float]:
+        """Current (confirmed_count, accuracy_score); lock-free read of the latest snapshot"""
+        return self._snapshot.get(pattern_id, self._baseline.get(pattern_id, default))
+
+    def snapshot(self) -> Dict[str, Tuple[int, float]]:
+        return self._snapshot
+
+    def compact(self):
+        """Fold the whole log into the counters now (waits for queued events first)"""
+        self._queue.put(('compact',))
+        self.flush()
+
+    def flush(self):
+        """Block until every queued item is handled; a failed write is logged and retried later"""
+        self._queue.join()
+
+    def close(self):
+        """Write what is queued and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _run(self):
+        connection = self._connect()
+        # Items whose write failed, retried ahead of the next batch
+        retry = []
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.poll_seconds)
+                except queue.Empty:
+                    if retry:
+                        retry = self._handle(connection, retry)
+                    else:
+                        self._refresh_if_changed(connection)
+                    continue
+
+                # Drain what is already queued into one transaction
+                items = [item]
+                while len(items) < self.batch_size:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = any(item is _STOP for item in items)
+                try:
+                    retry = self._handle(connection, retry + [item for item in items if item is not _STOP])
+                finally:
+                    for _ in items:
+                        self._queue.task_done()
+                if stop:
+                    if retry:
+                        logger.error("Pattern feedback writer stopped with %d unwritten events",
+                                     sum(item[0] == 'event' for item in retry))
+                    return
+        finally:
+            connection.close()
+
+    def _handle(self, connection: sqlite3.Connection, items) -> list:
+        """Write a batch; returns the items to retry when the database fails part-way"""
+        events = [item[1:] for item in items if item[0] == 'event']
+        compact = any(item[0] == 'compact' for item in items)
+        try:
+            if events:
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO feedback_log (pattern_id, confirmed, effect_count, recorded_at) "
+                        "VALUES (?, ?, ?, ?)", events)
+                    connection.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+                self._since_compaction += len(events)
+                events = []
+
+            if self._since_compaction >= self.compact_every or compact:
+                self._compact(connection)
+                compact = False
+
+            self._snapshot = self._read_snapshot(connection)
+        except Exception:
+            logger.exception("Pattern feedback write failed; retrying %d events with the next batch", len(events))
+            return [('event',) + event for event in events] + ([('compact',)] if compact else [])
+        return []
+
+    def _compact(self, connection: sqlite3.Connection):
+        """Fold logged events into pattern_accuracy and drop them, in one write transaction"""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            counters = self._fold(connection)
+            connection.executemany("INSERT OR REPLACE INTO pattern_accuracy VALUES (?, ?, ?)",
+                                   [(pattern_id, count, score) for pattern_id, (count, score) in counters.items()])
+            connection.execute("DELETE FROM feedback_log")
+            connection.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        self._since_compaction = 0
+
+    def _fold(self, connection: sqlite3.Connection) -> Dict[str, Tuple[int, float]]:
+        """Compacted counters with every logged event applied in order"""
+        counters = dict(self._baseline)
+        counters.update((pattern_id, (count, score)) for pattern_id, count, score in
+                        connection.execute("SELECT pattern_id, confirmed_count, accuracy_score FROM pattern_accuracy"))
+        for pattern_id, confirmed, effect_count in connection.execute(
+                "SELECT pattern_id, confirmed, effect_count FROM feedback_log ORDER BY id"):
+            count, score = counters.get(pattern_id, (0, 0.0))
+            counters[pattern_id] = fold_feedback(count, score, bool(confirmed), effect_count)
+        return counters
+
+    def _read_snapshot(self, connection: sqlite3.Connection) -> Dict[str, Tuple[int, float]]:
+        # One read transaction, so the version matches the folded state
+        connection.execute("BEGIN")
+        try:
+            self.version = connection.execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0]
+            return self._fold(connection)
+        finally:
+            connection.execute("COMMIT")
+
+    def _refresh_if_changed(self, connection: sqlite3.Connection):
+        try:
+            version = connection.execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0]
+            if version != self.version:
+                self._snapshot = self._read_snapshot(connection)
+        except Exception:
+            logger.exception("Pattern feedback refresh failed; retrying at the next poll")
+
+print("✅ Pattern Feedback Store loaded")
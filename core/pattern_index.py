@@ -0,0 +1,275 @@
+"""
+Pattern Query Index
+Inverted index from pattern ids and placements to compressed sets of stored chart ids
+"""
+
+import re
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from core.calculations import BATCH_BODIES
+from core.pattern_compiler import RASHI_NAMES
+
+if TYPE_CHECKING:
+    from core.patterns import PatternDetector
+
+class ChartIdSet:
+    """Set of chart ids in [0, n_charts), stored as a sorted uint32 array when sparse
+    and as a packed bitset when dense, whichever is smaller."""
+
+    def __init__(self, n_charts: int, ids: Optional[np.ndarray] = None, bits: Optional[np.ndarray] = None):
+        self.n_charts = n_charts
+        if bits is not None and int(np.count_nonzero(np.unpackbits(bits, count=n_charts))) * 32 < n_charts:
+            ids, bits = np.flatnonzero(np.unpackbits(bits, count=n_charts)).astype(np.uint32), None
+        elif ids is not None and len(ids) * 32 >= n_charts:
+            mask = np.zeros(n_charts, dtype=bool)
+            mask[ids] = True
+            ids, bits = None, np.packbits(mask)
+        self.ids = None if ids is None else np.asarray(ids, dtype=np.uint32)
+        self.bits = bits
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> 'ChartIdSet':
+        return cls(len(mask), bits=np.packbits(mask))
+
+    @classmethod
+    def from_ids(cls, n_charts: int, ids) -> 'ChartIdSet':
+        return cls(n_charts, ids=np.unique(np.asarray(ids, dtype=np.uint32)))
+
+    @property
+    def nbytes(self) -> int:
+        return self.ids.nbytes if self.ids is not None else self.bits.nbytes
+
+    def mask(self) -> np.ndarray:
+        if self.bits is not None:
+            return np.unpackbits(self.bits, count=self.n_charts).astype(bool)
+        mask = np.zeros(self.n_charts, dtype=bool)
+        mask[self.ids] = True
+        return mask
+
+    def to_array(self) -> np.ndarray:
+        """Sorted chart ids"""
+        if self.ids is not None:
+            return self.ids
+        return np.flatnonzero(np.unpackbits(self.bits, count=self.n_charts)).astype(np.uint32)
+
+    def __len__(self) -> int:
+        if self.ids is not None:
+            return len(self.ids)
+        return int(np.count_nonzero(np.unpackbits(self.bits, count=self.n_charts)))
+
+    def __contains__(self, chart_id: int) -> bool:
+        if self.ids is not None:
+            index = np.searchsorted(self.ids, chart_id)
+            return bool(index < len(self.ids) and self.ids[index] == chart_id)
+        return bool(self.bits[chart_id >> 3] & (0x80 >> (chart_id & 7)))
+
+    def __and__(self, other: 'ChartIdSet') -> 'ChartIdSet':
+        if self.ids is not None and other.ids is not None:
+            return ChartIdSet(self.n_charts, ids=np.intersect1d(self.ids, other.ids, assume_unique=True))
+        if self.ids is not None or other.ids is not None:
+            sparse, dense = (self, other) if self.ids is not None else (other, self)
+            return ChartIdSet(self.n_charts, ids=sparse.ids[dense.mask()[sparse.ids]])
+        return ChartIdSet(self.n_charts, bits=self.bits & other.bits)
+
+    def __or__(self, other: 'ChartIdSet') -> 'ChartIdSet':
+        if self.ids is not None and other.ids is not None:
+            return ChartIdSet(self.n_charts, ids=np.union1d(self.ids, other.ids))
+        return ChartIdSet(self.n_charts, bits=np.packbits(self.mask() | other.mask()))
+
+    def __invert__(self) -> 'ChartIdSet':
+        return ChartIdSet(self.n_charts, bits=np.packbits(~self.mask()))
+
+    def __sub__(self, other: 'ChartIdSet') -> 'ChartIdSet':
+        return self & ~other
+
+class PatternIndex:
+    """Inverted index over stored charts.
+
+    Terms are pattern ids (from PatternDetector.detect_patterns_batch) and
+    placements, ``house:<body>:<1-12>`` and ``sign:<body>:<0-11>``. Queries
+    combine terms with AND, OR, NOT and parentheses, for example
+    ``Angarak Yoga AND Moon in 6th`` or ``"Rahu-Sun Conjunction" AND NOT Moon in Cancer``.
+    """
+
+    def __init__(self, n_charts: int, postings: Dict[str, ChartIdSet], pattern_names: Dict[str, str]):
+        self.n_charts = n_charts
+        self.postings = postings
+        self.pattern_names = pattern_names
+
+    @classmethod
+    def build(cls, detector: 'PatternDetector', charts, bodies: Tuple[str, ...] = BATCH_BODIES,
+              houses: np.ndarray = None, chunk_size: int = 65536) -> 'PatternIndex':
+        """Index a ChartArray, BatchPositions or longitude array; chart id = row"""
+        longitudes = np.asarray(getattr(charts, 'longitudes', charts))
+        bodies = tuple(getattr(charts, 'bodies', bodies))
+        if houses is None:
+            houses = getattr(charts, 'houses', getattr(charts, 'house', None))
+        n_charts = len(longitudes)
+
+        masks: Dict[str, np.ndarray] = {}
+        for start in range(0, n_charts, chunk_size):
+            rows = slice(start, min(start + chunk_size, n_charts))
+            table = detector.detect_patterns_batch(longitudes[rows], bodies,
+                                                   None if houses is None else houses[rows], chunk_size)
+            for column, pattern_id in enumerate(table.pattern_ids):
+                masks.setdefault(pattern_id, np.zeros(n_charts, dtype=bool))[rows] = table.matched[:, column]
+
+        postings = {pattern_id: ChartIdSet.from_mask(mask) for pattern_id, mask in masks.items()}
+        signs = (longitudes // 30).astype(np.int64) % 12
+        for column, body in enumerate(bodies):
+            postings.update(_placement_postings(f"sign:{body}", signs[:, column], range(12)))
+            if houses is not None:
+                postings.update(_placement_postings(f"house:{body}", houses[:, column], range(1, 13)))
+
+        names = {pattern_id: pattern.name for pattern_id, pattern in detector.patterns.items()}
+        return cls(n_charts, postings, names)
+
+    def term(self, name: str) -> ChartIdSet:
+        """Posting set of one term; unknown terms are empty"""
+        posting = self.postings.get(name)
+        return posting if posting is not None else ChartIdSet(self.n_charts, ids=np.empty(0, dtype=np.uint32))
+
+    def resolve(self, phrase: str) -> str:
+        """Index term for a query phrase: a term, a pattern id or name, or '<body> in <house or sign>'"""
+        phrase = phrase.strip()
+        if phrase in self.postings or phrase in self.pattern_names:
+            return phrase
+
+        placement = re.fullmatch(r"(\w+)\s+in\s+(\w+)", phrase, re.IGNORECASE)
+        if placement:
+            body, where = placement.group(1).capitalize(), placement.group(2)
+            house = re.fullmatch(r"(\d{1,2})(?:st|nd|rd|th)?", where, re.IGNORECASE)
+            if house and 1 <= int(house.group(1)) <= 12:
+                return f"house:{body}:{int(house.group(1))}"
+            if where.capitalize() in RASHI_NAMES:
+                return f"sign:{body}:{RASHI_NAMES.index(where.capitalize())}"
+
+        lowered = phrase.lower()
+        exact = [pid for pid, name in self.pattern_names.items() if name.lower() == lowered or pid == lowered]
+        partial = [pid for pid, name in self.pattern_names.items() if lowered in name.lower()]
+        found = exact or partial
+        if len(found) != 1:
+            reason = "matches several patterns" if found else "is not a known pattern or placement"
+            raise ValueError(f"Query term '{phrase}' {reason}")
+        return found[0]
+
+    def query(self, text: str) -> ChartIdSet:
+        """Evaluate a boolean query (AND, OR, NOT, parentheses; quote names containing them)"""
+        parser = _QueryParser(_tokenize(text), self)
+        result = parser.expression()
+        if parser.position != len(parser.tokens):
+            raise ValueError(f"Unexpected '{parser.tokens[parser.position]}' in query")
+        return result
+
+    def count(self, text: str) -> int:
+        return len(self.query(text))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(posting.nbytes for posting in self.postings.values())
+
+    def save(self, path: str):
+        """Write the index to one .npz file"""
+        arrays = {'n_charts': np.array(self.n_charts)}
+        for number, (term, posting) in enumerate(self.postings.items()):
+            arrays[f"term_{number}"] = np.array(term)
+            arrays[f"{'ids' if posting.ids is not None else 'bits'}_{number}"] = \
+                posting.ids if posting.ids is not None else posting.bits
+        arrays['pattern_ids'] = np.array(list(self.pattern_names), dtype=str)
+        arrays['pattern_names'] = np.array(list(self.pattern_names.values()), dtype=str)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'PatternIndex':
+        with np.load(path) as data:
+            n_charts = int(data['n_charts'])
+            postings = {}
+            number = 0
+            while f"term_{number}" in data:
+                if f"ids_{number}" in data:
+                    posting = ChartIdSet(n_charts, ids=data[f"ids_{number}"])
+                else:
+                    posting = ChartIdSet(n_charts, bits=data[f"bits_{number}"])
+                postings[str(data[f"term_{number}"])] = posting
+                number += 1
+            names = dict(zip(data['pattern_ids'].tolist(), data['pattern_names'].tolist()))
+        return cls(n_charts, postings, names)
+
+def _placement_postings(prefix: str, values: np.ndarray, domain) -> Dict[str, ChartIdSet]:
+    """One posting per placement value, from a single argsort of the column"""
+    order = np.argsort(values, kind='stable')
+    bounds = np.searchsorted(values[order], list(domain) + [max(domain) + 1])
+    return {f"{prefix}:{value}": ChartIdSet.from_ids(len(values), order[bounds[k]:bounds[k + 1]])
+            for k, value in enumerate(domain)}
+
+_OPERATORS = ('AND', 'OR', 'NOT')
+
+def _tokenize(text: str) -> List[str]:
+    """Operators, parentheses and phrases (runs of other words, or quoted strings)"""
+    tokens: List[str] = []
+    words: List[str] = []
+    for token in re.findall(r'"[^"]*"|\(|\)|[^\s()"]+', text):
+        if token in _OPERATORS or token in '()':
+            if words:
+                tokens.append(' '.join(words))
+                words = []
+            tokens.append(token)
+        elif token.startswith('"'):
+            tokens.append(token)
+        else:
+            words.append(token)
+    if words:
+        tokens.append(' '.join(words))
+    return tokens
+
+class _QueryParser:
+    """Recursive descent: OR binds loosest, then AND, then NOT"""
+
+    def __init__(self, tokens: Sequence[str], index: PatternIndex):
+        self.tokens = tokens
+        self.index = index
+        self.position = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Query ended unexpectedly")
+        self.position += 1
+        return token
+
+    def expression(self) -> ChartIdSet:
+        result = self.conjunction()
+        while self.peek() == 'OR':
+            self.take()
+            result = result | self.conjunction()
+        return result
+
+    def conjunction(self) -> ChartIdSet:
+        result = self.negation()
+        while self.peek() == 'AND':
+            self.take()
+            result = result & self.negation()
+        return result
+
+    def negation(self) -> ChartIdSet:
+        if self.peek() == 'NOT':
+            self.take()
+            return ~self.negation()
+        return self.atom()
+
+    def atom(self) -> ChartIdSet:
+        token = self.take()
+        if token == '(':
+            result = self.expression()
+            if self.take() != ')':
+                raise ValueError("Missing ')' in query")
+            return result
+        if token in _OPERATORS or token == ')':
+            raise ValueError(f"Unexpected '{token}' in query")
+        return self.index.term(self.index.resolve(token.strip('"')))
+
+print("✅ Pattern Query Index loaded")
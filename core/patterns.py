@@ -6,7 +6,28 @@ Identifies astrological patterns and their effects
 import datetime
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
-from core.calculations import PlanetPosition
+import numpy as np
+from core.aspects import find_clusters, iter_orb_tensors, largest_clusters
+from core.calculations import AstronomicalCalculator, PlanetPosition, BATCH_BODIES
+from core.pattern_feedback import fold_feedback
+from core.pattern_compiler import (
+    DEFAULT_PATTERNS_PATH, STELLIUM_BODIES, ChartArrays, ConjunctionPredicate, load_pattern_catalog
+)
+from core.transits import TRANSIT_BODIES, TransitEventFinder
+
+# Upper bounds on apparent speed in degrees per day, so a scan can jump
+# as far as a separation could possibly close without missing an entry
+MAX_DAILY_MOTION = {
+    'Sun': 1.05,
+    'Moon': 15.5,
+    'Mercury': 2.25,
+    'Venus': 1.3,
+    'Mars': 0.82,
+    'Jupiter': 0.25,
+    'Saturn': 0.14,
+    'Rahu': 0.06,
+    'Ketu': 0.06,
+}
 
 @dataclass
 class AstroPattern:
@@ -31,205 +52,357 @@ class PatternMatch:
     orb_accuracy: float
     confidence_score: float
     predicted_effects: List[str]
+    # Transit windows only; None where the window runs past the scanned range or never gets exact
+    entry_time: Optional[datetime.datetime] = None
+    exact_time: Optional[datetime.datetime] = None
+    exit_time: Optional[datetime.datetime] = None
+
+@dataclass
+class PatternMatchTable:
+    """Pattern results for a batch of charts, one column per pattern"""
+    pattern_ids: Tuple[str, ...]
+    orbs: np.ndarray  # (n_charts, n_patterns) degrees
+    confidence: np.ndarray
+    matched: np.ndarray  # within orb and confident enough
+
+    def __len__(self) -> int:
+        return len(self.matched)
+
+    def charts_matching(self, pattern_id: str) -> np.ndarray:
+        """Indices of the charts where one pattern matched"""
+        return np.flatnonzero(self.matched[:, self.pattern_ids.index(pattern_id)])
+
+    def patterns_in_chart(self, index: int) -> List[str]:
+        """Pattern ids matched in one chart"""
+        return [self.pattern_ids[column] for column in np.flatnonzero(self.matched[index])]
 
 class PatternDetector:
     """Advanced pattern detection system"""
     
-    def __init__(self):
+    def __init__(self, calculator: AstronomicalCalculator = None, ayanamsa: str = 'lahiri',
+                 precision: str = 'standard', tolerance_days: float = 1.0 / 1440.0,
+                 patterns_path: str = DEFAULT_PATTERNS_PATH, feedback_store=None):
+        self.catalog = load_pattern_catalog(patterns_path)
         self.patterns = self._initialize_patterns()
+        # Optional core.pattern_feedback.PatternFeedbackStore holding accuracy across restarts and workers
+        self.feedback_store = feedback_store
+        if feedback_store is not None:
+            feedback_store.set_baseline({pattern_id: (pattern.confirmed_count, pattern.accuracy_score)
+                                         for pattern_id, pattern in self.patterns.items()})
+        self.transit_finder = TransitEventFinder(calculator, ayanamsa, precision=precision)
+        self.tolerance_days = tolerance_days
     
     def _initialize_patterns(self) -> Dict[str, AstroPattern]:
-        """Initialize pattern database"""
-        
-        patterns = {}
-        
-        # Rahu-Sun conjunction
-        patterns['rahu_sun_conjunction'] = AstroPattern(
-            pattern_id='rahu_sun_conjunction',
-            name='Rahu-Sun Conjunction',
-            description='Conjunction causing ego conflicts and authority issues',
-            planets_involved=['Rahu', 'Sun'],
-            orb_tolerance=6.0,
-            severity_level=9,
-            typical_effects=[
-                'Authority conflicts', 'Ego issues', 'Government problems',
-                'Father-related issues', 'Career obstacles', 'Health problems'
-            ],
-            remedies=[
-                'Chant Aditya Hridayam daily',
-                'Offer water to Sun every morning',
-                'Donate copper items on Sundays',
-                'Avoid conflicts with authority figures'
-            ],
-            confirmed_count=0,
-            accuracy_score=0.0
-        )
-        
-        # Mars-Saturn conjunction
-        patterns['mars_saturn_conjunction'] = AstroPattern(
-            pattern_id='mars_saturn_conjunction',
-            name='Mars-Saturn Conjunction',
-            description='Conjunction causing delays, accidents, and frustrations',
-            planets_involved=['Mars', 'Saturn'],
-            orb_tolerance=6.0,
-            severity_level=8,
-            typical_effects=[
-                'Accidents', 'Delays in projects', 'Frustration', 'Legal issues',
-                'Property disputes', 'Bone/muscle problems'
-            ],
-            remedies=[
-                'Recite Hanuman Chalisa daily',
-                'Donate iron items on Tuesdays',
-                'Avoid risky activities',
-                'Practice patience and discipline'
-            ],
-            confirmed_count=0,
-            accuracy_score=0.0
-        )
-        
-        # Ketu-Moon conjunction
-        patterns['ketu_moon_conjunction'] = AstroPattern(
-            pattern_id='ketu_moon_conjunction',
-            name='Ketu-Moon Conjunction',
-            description='Conjunction causing mental stress and emotional instability',
-            planets_involved=['Ketu', 'Moon'],
-            orb_tolerance=4.0,
-            severity_level=7,
-            typical_effects=[
-                'Mental stress', 'Emotional instability', 'Depression',
-                'Family problems', 'Mother-related issues', 'Sleep disorders'
-            ],
-            remedies=[
-                'Chant Mahamrityunjaya Mantra',
-                'Worship Goddess Durga',
-                'Practice meditation',
-                'Maintain emotional balance'
-            ],
-            confirmed_count=0,
-            accuracy_score=0.0
-        )
-        
-        # Rahu-Mars conjunction (Angarak Yoga)
-        patterns['rahu_mars_conjunction'] = AstroPattern(
-            pattern_id='rahu_mars_conjunction',
-            name='Rahu-Mars Conjunction (Angarak Yoga)',
-            description='Dangerous conjunction causing accidents and violence',
-            planets_involved=['Rahu', 'Mars'],
-            orb_tolerance=6.0,
-            severity_level=9,
-            typical_effects=[
-                'Accidents', 'Violence', 'Explosions', 'Surgery',
-                'Blood-related issues', 'Aggressive behavior'
-            ],
-            remedies=[
-                'Recite Hanuman Chalisa 108 times daily',
-                'Donate red items on Tuesdays',
-                'Avoid aggressive behavior',
-                'Practice anger management'
-            ],
-            confirmed_count=0,
-            accuracy_score=0.0
-        )
-        
-        return patterns
+        """Initialize pattern database from the compiled catalog"""
+        return self.catalog.patterns
     
     def detect_patterns_in_chart(self, planetary_positions: Dict[str, PlanetPosition]) -> List[PatternMatch]:
         """Detect patterns in birth chart"""
         
         pattern_matches = []
         
-        for pattern_id, pattern in self.patterns.items():
-            matches = self._check_conjunction_pattern(pattern, planetary_positions)
-            pattern_matches.extend(matches)
+        # Only patterns whose anchor condition the chart hits are evaluated
+        for entry, deviation in self.catalog.match(planetary_positions):
+            match = self._build_match(entry.pattern, planetary_positions, deviation)
+            if match is not None:
+                pattern_matches.append(match)
         
         return pattern_matches
     
+    def detect_patterns_batch(self, charts, bodies: Tuple[str, ...] = BATCH_BODIES, houses: np.ndarray = None,
+                              chunk_size: int = 65536) -> 'PatternMatchTable':
+        """Evaluate every catalog pattern on a whole batch of charts in array passes.
+        
+        ``charts`` is a ChartArray, a BatchPositions or an ``(n_charts,
+        n_bodies)`` longitude array laid out as ``bodies`` (pass ``houses``
+        for house conditions). Orb tensors are built chunk by chunk and each
+        condition is a masked lookup against them.
+        """
+        longitudes = np.asarray(getattr(charts, 'longitudes', charts))
+        bodies = tuple(getattr(charts, 'bodies', bodies))
+        if houses is None:
+            houses = getattr(charts, 'houses', getattr(charts, 'house', None))
+        
+        entries = list(self.catalog.compiled.values())
+        tolerances = np.array([entry.pattern.orb_tolerance for entry in entries], dtype=np.float32)
+        bonuses = np.array([self._confidence_bonus(entry.pattern) for entry in entries], dtype=np.float32)
+        
+        orbs = np.empty((len(longitudes), len(entries)), dtype=np.float32)
+        satisfied = np.empty((len(longitudes), len(entries)), dtype=bool)
+        for chunk, tensor in iter_orb_tensors(longitudes, chunk_size):
+            chunk_charts = ChartArrays(bodies, longitudes[chunk], None if houses is None else houses[chunk], tensor)
+            for column, entry in enumerate(entries):
+                satisfied[chunk, column], orbs[chunk, column] = entry.evaluate_batch(chunk_charts)
+        
+        confidence = np.minimum((tolerances - orbs) / tolerances + bonuses, 1.0)
+        matched = satisfied & (orbs <= tolerances) & (confidence > 0.6)
+        return PatternMatchTable(tuple(entry.pattern_id for entry in entries), orbs, confidence, matched)
+    
+    def find_planet_clusters(self, planetary_positions: Dict[str, PlanetPosition], orb: float = 10.0,
+                             min_planets: int = 3) -> List[Dict]:
+        """Stelliums: maximal groups of at least ``min_planets`` grahas within ``orb`` degrees"""
+        bodies = [body for body in STELLIUM_BODIES if body in planetary_positions]
+        return find_clusters([planetary_positions[body].longitude for body in bodies], bodies, orb, min_planets)
+    
+    def find_planet_clusters_batch(self, charts, orb: float = 10.0, bodies: Tuple[str, ...] = BATCH_BODIES) -> Dict:
+        """Largest graha cluster of every chart in a batch: size, span, start longitude and member mask"""
+        longitudes = np.asarray(getattr(charts, 'longitudes', charts))
+        bodies = tuple(getattr(charts, 'bodies', bodies))
+        columns = [bodies.index(body) for body in STELLIUM_BODIES if body in bodies]
+        size, span, start, members = largest_clusters(longitudes[:, columns], orb)
+        return {
+            'bodies': tuple(bodies[column] for column in columns),
+            'size': size,
+            'span': span,
+            'start_longitude': start,
+            'members': members
+        }
+    
     def detect_transit_patterns(self, transit_positions: Dict[str, PlanetPosition],
                               birth_positions: Dict[str, PlanetPosition],
                               start_date: datetime.date, end_date: datetime.date) -> List[PatternMatch]:
-        """Detect patterns in transit period"""
+        """Detect patterns in transit period.
+        
+        ``transit_positions`` is one snapshot, so each pattern it forms is
+        evaluated and reported once, dated ``start_date``, instead of once per
+        day of the period. For windows that follow the moving planets use
+        detect_transit_windows.
+        """
+        if end_date < start_date:
+            return []
         
         pattern_matches = []
-        current_date = start_date
         
-        while current_date <= end_date:
-            # Check transit conjunctions
-            for pattern_id, pattern in self.patterns.items():
-                matches = self._check_conjunction_pattern(pattern, transit_positions, current_date)
-                pattern_matches.extend(matches)
-            
-            current_date += datetime.timedelta(days=1)
+        # Same compiled predicates as detect_patterns_in_chart: aspect angles, houses, signs and clusters
+        for entry, deviation in self.catalog.match(transit_positions):
+            match = self._build_match(entry.pattern, transit_positions, deviation, start_date)
+            if match is not None:
+                pattern_matches.append(match)
         
         return pattern_matches
     
-    def _check_conjunction_pattern(self, pattern: AstroPattern, 
-                                 positions: Dict[str, PlanetPosition],
-                                 date: datetime.date = None) -> List[PatternMatch]:
-        """Check conjunction pattern matches"""
+    def detect_transit_windows(self, start_date: datetime.date, end_date: datetime.date,
+                               timezone_offset: float = 5.5) -> List[PatternMatch]:
+        """Detect transit conjunction windows between two local calendar dates (inclusive)"""
+        calculator = self.transit_finder.calculator
+        start_jd = calculator.get_julian_day(start_date, datetime.time(0, 0), timezone_offset)
+        end_jd = calculator.get_julian_day(end_date + datetime.timedelta(days=1), datetime.time(0, 0), timezone_offset)
+        return self.scan_transit_conjunctions(start_jd, end_jd, timezone_offset=timezone_offset)
+    
+    def scan_transit_conjunctions(self, start_jd: float, end_jd: float,
+                                  patterns: Optional[List[AstroPattern]] = None,
+                                  timezone_offset: float = 5.5) -> List[PatternMatch]:
+        """Entry, exact and exit times of every two-planet conjunction in [start_jd, end_jd].
         
-        matches = []
+        Each pair advances its own cursor by the longest step that cannot
+        carry the separation across the orb, given MAX_DAILY_MOTION: far from
+        conjunction that is weeks or months, and inside the orb ``orb / bound``,
+        so every crossing lands between two samples. All pairs share one batch
+        evaluation per round, and the brackets are then bisected together.
+        Windows shorter than one minimum step (grazes at the orb edge) can be
+        missed.
+        """
+        pairs = [pattern for pattern in (patterns or self.patterns.values())
+                 if self._is_transit_conjunction(pattern)]
+        if not pairs:
+            return []
+        
+        bodies = [body for body in TRANSIT_BODIES if any(body in pattern.planets_involved for pattern in pairs)]
+        columns = np.array([[bodies.index(planet) for planet in pattern.planets_involved] for pattern in pairs])
+        orbs = np.array([pattern.orb_tolerance for pattern in pairs])
+        bounds = np.array([sum(MAX_DAILY_MOTION[planet] for planet in pattern.planets_involved) for pattern in pairs])
         
-        if len(pattern.planets_involved) == 2:
-            planet1, planet2 = pattern.planets_involved
+        # Coarse pass: one sample list of (jd, signed separation) per pair
+        samples = [([], []) for _ in pairs]
+        cursors = np.full(len(pairs), float(start_jd))
+        active = np.ones(len(pairs), dtype=bool)
+        while active.any():
+            index = np.flatnonzero(active)
+            separations = self._separations(cursors[index], columns[index], bodies)
+            for k, i in enumerate(index):
+                samples[i][0].append(cursors[i])
+                samples[i][1].append(separations[k])
             
-            if planet1 in positions and planet2 in positions:
-                pos1, pos2 = positions[planet1], positions[planet2]
-                
-                # Calculate orb
-                orb = abs(pos1.longitude - pos2.longitude)
-                if orb > 180:
-                    orb = 360 - orb
-                
-                if orb <= pattern.orb_tolerance:
-                    confidence = self._calculate_confidence_score(pattern, orb)
-                    
-                    if confidence > 0.6:
-                        match = PatternMatch(
-                            pattern=pattern,
-                            match_date=date or datetime.date.today(),
-                            exact_degrees={planet1: pos1.longitude, planet2: pos2.longitude},
-                            orb_accuracy=orb,
-                            confidence_score=confidence,
-                            predicted_effects=pattern.typical_effects.copy()
-                        )
-                        matches.append(match)
+            active[index[cursors[index] >= end_jd]] = False
+            steps = np.maximum(np.abs(separations) - orbs[index], orbs[index]) / bounds[index]
+            cursors[index] = np.minimum(cursors[index] + steps, end_jd)
+        
+        # Brackets of every orb entry/exit (root of separation -/+ orb) and exact conjunction (root of separation)
+        bracket_pairs, lows, highs, targets, kinds = [], [], [], [], []
+        for i, (jds, separations) in enumerate(samples):
+            jds, separations = np.array(jds), np.array(separations)
+            inside = np.abs(separations) <= orbs[i]
+            for k in range(len(jds) - 1):
+                if inside[k] != inside[k + 1]:
+                    side = np.sign(separations[k + 1] if inside[k + 1] else separations[k])
+                    kind, target = ('entry' if inside[k + 1] else 'exit'), side * orbs[i]
+                elif inside[k] and separations[k] * separations[k + 1] < 0:
+                    kind, target = 'exact', 0.0
+                else:
+                    continue
+                bracket_pairs.append(i)
+                lows.append(jds[k])
+                highs.append(jds[k + 1])
+                targets.append(target)
+                kinds.append(kind)
         
+        roots = self._bisect_separations(np.array(bracket_pairs, dtype=int), np.array(lows), np.array(highs),
+                                         np.array(targets), columns, bodies)
+        
+        # Assemble windows per pair from the time-ordered events
+        windows = []
+        events = sorted(zip(bracket_pairs, roots, kinds), key=lambda event: (event[0], event[1]))
+        for i in range(len(pairs)):
+            jds, separations = np.array(samples[i][0]), np.array(samples[i][1])
+            window = {'entry': None, 'exact': None} if abs(separations[0]) <= orbs[i] else None
+            for _, jd, kind in (event for event in events if event[0] == i):
+                if kind == 'entry':
+                    window = {'entry': jd, 'exact': None}
+                elif kind == 'exact' and window is not None and window['exact'] is None:
+                    window['exact'] = jd
+                elif kind == 'exit' and window is not None:
+                    windows.append((i, window['entry'], window['exact'], jd))
+                    window = None
+            if window is not None:
+                windows.append((i, window['entry'], window['exact'], None))
+        
+        if not windows:
+            return []
+        
+        # Closest approach of each window: the exact moment, else its closest sample
+        closest_jds = []
+        closest_orbs = []
+        for i, entry, exact, exit in windows:
+            if exact is not None:
+                closest_jds.append(exact)
+                closest_orbs.append(0.0)
+                continue
+            jds, separations = np.array(samples[i][0]), np.abs(np.array(samples[i][1]))
+            # A window always holds the sample after its entry
+            within = (jds >= (entry if entry is not None else start_jd)) & (jds <= (exit if exit is not None else end_jd))
+            best = np.flatnonzero(within)[np.argmin(separations[within])]
+            closest_jds.append(jds[best])
+            closest_orbs.append(float(separations[best]))
+        
+        longitudes = self.transit_finder.body_longitudes(np.array(closest_jds), bodies) % 360.0
+        
+        def to_moment(jd: Optional[float]) -> Optional[datetime.datetime]:
+            if jd is None:
+                return None
+            return self.transit_finder.calculator.get_datetime_from_julian_day(float(jd), timezone_offset)
+        
+        matches = []
+        for w, (i, entry, exact, exit) in enumerate(windows):
+            pattern = pairs[i]
+            confidence = self._calculate_confidence_score(pattern, closest_orbs[w])
+            if confidence <= 0.6:
+                continue
+            matches.append(PatternMatch(
+                pattern=pattern,
+                match_date=to_moment(closest_jds[w]).date(),
+                exact_degrees={planet: float(longitudes[w, bodies.index(planet)]) for planet in pattern.planets_involved},
+                orb_accuracy=closest_orbs[w],
+                confidence_score=confidence,
+                predicted_effects=pattern.typical_effects.copy(),
+                entry_time=to_moment(entry),
+                exact_time=to_moment(exact),
+                exit_time=to_moment(exit)
+            ))
+        
+        matches.sort(key=lambda match: match.match_date)
         return matches
     
+    def _is_transit_conjunction(self, pattern: AstroPattern) -> bool:
+        """Whether a pattern is a plain two-planet conjunction the transit scanner can follow"""
+        entry = self.catalog.compiled.get(pattern.pattern_id)
+        if entry is not None and not (len(entry.predicates) == 1 and isinstance(entry.predicates[0], ConjunctionPredicate)):
+            return False
+        return len(pattern.planets_involved) == 2 and all(planet in TRANSIT_BODIES for planet in pattern.planets_involved)
+    
+    def _separations(self, jds: np.ndarray, pair_columns: np.ndarray, bodies: List[str]) -> np.ndarray:
+        """Signed separation of each pair at its own JD, wrapped to [-180, 180)"""
+        longitudes = self.transit_finder.body_longitudes(jds, bodies)
+        rows = np.arange(len(jds))
+        difference = longitudes[rows, pair_columns[:, 0]] - longitudes[rows, pair_columns[:, 1]]
+        return (difference + 180.0) % 360.0 - 180.0
+    
+    def _bisect_separations(self, bracket_pairs: np.ndarray, lows: np.ndarray, highs: np.ndarray,
+                            targets: np.ndarray, columns: np.ndarray, bodies: List[str]) -> np.ndarray:
+        """Bisect every bracket of ``separation - target`` at once"""
+        if len(bracket_pairs) == 0:
+            return np.empty(0)
+        
+        pair_columns = columns[bracket_pairs]
+        low_sign = np.sign(self._separations(lows, pair_columns, bodies) - targets)
+        while np.max(highs - lows) > self.tolerance_days:
+            mids = 0.5 * (lows + highs)
+            same_side = np.sign(self._separations(mids, pair_columns, bodies) - targets) == low_sign
+            lows = np.where(same_side, mids, lows)
+            highs = np.where(same_side, highs, mids)
+        
+        return 0.5 * (lows + highs)
+    
+    def _build_match(self, pattern: AstroPattern, positions: Dict[str, PlanetPosition], orb: float,
+                     date: datetime.date = None) -> Optional[PatternMatch]:
+        """Pattern match for an orb, or None when outside tolerance or not confident enough"""
+        
+        if orb > pattern.orb_tolerance:
+            return None
+        
+        confidence = self._calculate_confidence_score(pattern, orb)
+        if confidence <= 0.6:
+            return None
+        
+        return PatternMatch(
+            pattern=pattern,
+            match_date=date or datetime.date.today(),
+            exact_degrees={planet: positions[planet].longitude for planet in pattern.planets_involved},
+            orb_accuracy=orb,
+            confidence_score=confidence,
+            predicted_effects=pattern.typical_effects.copy()
+        )
+    
     def _calculate_confidence_score(self, pattern: AstroPattern, orb: float) -> float:
         """Calculate confidence score for pattern match"""
         
         # Base confidence from orb accuracy
         orb_confidence = (pattern.orb_tolerance - orb) / pattern.orb_tolerance
         
+        total_confidence = orb_confidence + self._confidence_bonus(pattern)
+        
+        return min(total_confidence, 1.0)
+    
+    def _confidence_bonus(self, pattern: AstroPattern) -> float:
+        """Confidence added by a pattern's track record, independent of the orb"""
+        
+        confirmed_count, accuracy_score = self._pattern_accuracy(pattern)
+        
         # Historical accuracy bonus
-        accuracy_bonus = pattern.accuracy_score * 0.1
+        accuracy_bonus = accuracy_score * 0.1
         
         # User confirmation bonus
-        confirmation_bonus = min(pattern.confirmed_count * 0.05, 0.2)
-        
-        total_confidence = orb_confidence + accuracy_bonus + confirmation_bonus
+        confirmation_bonus = min(confirmed_count * 0.05, 0.2)
         
-        return min(total_confidence, 1.0)
+        return accuracy_bonus + confirmation_bonus
     
     def update_pattern_accuracy(self, pattern_id: str, confirmed: bool, effect_count: float):
         """Update pattern accuracy based on user feedback"""
         
         if pattern_id in self.patterns:
-            pattern = self.patterns[pattern_id]
+            if self.feedback_store is not None:
+                # Persisted and folded by the store's writer thread; never blocks the caller
+                self.feedback_store.record(pattern_id, confirmed, effect_count)
+                return
             
-            if confirmed:
-                pattern.confirmed_count += 1
-                total_predictions = pattern.confirmed_count
-                if total_predictions > 0:
-                    pattern.accuracy_score = (pattern.accuracy_score * (total_predictions - 1) + effect_count) / total_predictions
-            else:
-                # Decrease accuracy for false positives
-                total_predictions = pattern.confirmed_count + 1
-                pattern.accuracy_score = (pattern.accuracy_score * (total_predictions - 1)) / total_predictions
-            
-            # Ensure accuracy score stays within bounds
-            pattern.accuracy_score = max(0.0, min(1.0, pattern.accuracy_score))
+            pattern = self.patterns[pattern_id]
+            pattern.confirmed_count, pattern.accuracy_score = fold_feedback(
+                pattern.confirmed_count, pattern.accuracy_score, confirmed, effect_count)
+    
+    def _pattern_accuracy(self, pattern: AstroPattern) -> Tuple[int, float]:
+        """Current (confirmed_count, accuracy_score), from the feedback store snapshot when attached"""
+        if self.feedback_store is not None:
+            return self.feedback_store.accuracy(pattern.pattern_id, (pattern.confirmed_count, pattern.accuracy_score))
+        return pattern.confirmed_count, pattern.accuracy_score
     
     def get_pattern_statistics(self) -> Dict[str, Any]:
         """Get pattern accuracy statistics"""
@@ -243,14 +416,15 @@ class PatternDetector:
         
         accuracies = []
         for pattern_id, pattern in self.patterns.items():
-            if pattern.confirmed_count > 0:
+            confirmed_count, accuracy_score = self._pattern_accuracy(pattern)
+            if confirmed_count > 0:
                 stats['confirmed_patterns'] += 1
-                accuracies.append(pattern.accuracy_score)
+                accuracies.append(accuracy_score)
             
             stats['pattern_details'][pattern_id] = {
                 'name': pattern.name,
-                'confirmed_count': pattern.confirmed_count,
-                'accuracy_score': pattern.accuracy_score,
+                'confirmed_count': confirmed_count,
+                'accuracy_score': accuracy_score,
                 'severity': pattern.severity_level
             }
         
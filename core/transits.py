@@ -0,0 +1,328 @@
+"""
+Transit Event Search
+Finds the exact moments planets cross rashi, nakshatra and pada boundaries
+"""
+
+import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import numpy as np
+
+from core.ayanamsa import AyanamsaEngine
+from core.calculations import AstronomicalCalculator
+from core.ephemeris_series import get_tier_spec
+
+# Boundary spacing of each zodiac division, in degrees
+DIVISION_SPANS = {
+    'rashi': 30.0,
+    'nakshatra': 360.0 / 27.0,
+    'pada': 360.0 / 108.0,
+}
+
+# Bodies with a series longitude: (column in calculate_series_longitudes, offset in degrees)
+TRANSIT_BODIES = {
+    'Sun': (0, 0.0),
+    'Moon': (1, 0.0),
+    'Mercury': (2, 0.0),
+    'Venus': (3, 0.0),
+    'Mars': (4, 0.0),
+    'Jupiter': (5, 0.0),
+    'Saturn': (6, 0.0),
+    'Rahu': (7, 0.0),
+    'Ketu': (7, 180.0),
+}
+
+@dataclass
+class TransitEvent:
+    """A planet crossing a zodiac division boundary"""
+    planet: str
+    division: str
+    julian_day: float
+    moment: datetime.datetime
+    from_index: int
+    to_index: int
+    from_name: str
+    to_name: str
+
+@dataclass
+class Station:
+    """A planet coming to rest before changing direction"""
+    planet: str
+    julian_day: float
+    moment: datetime.datetime
+    longitude: float
+    kind: str  # 'retrograde' when motion turns backward, 'direct' when it resumes
+
+@dataclass
+class RetrogradePeriod:
+    """Interval during which a planet's apparent motion is backward"""
+    planet: str
+    start_jd: float
+    end_jd: float
+    start: datetime.datetime
+    end: datetime.datetime
+
+class TransitEventFinder:
+    """Root-solving search for sign, nakshatra and pada ingresses"""
+
+    def __init__(self, calculator: AstronomicalCalculator = None, ayanamsa: str = 'lahiri',
+                 tolerance_days: float = 1e-6, max_iterations: int = 40,
+                 precision: str = 'standard', station_step_days: float = 1.0):
+        get_tier_spec(precision)
+        self.calculator = calculator or AstronomicalCalculator()
+        self.ayanamsa = AyanamsaEngine(ayanamsa)
+        self.tolerance_days = tolerance_days
+        self.max_iterations = max_iterations
+        self.precision = precision
+        self.station_step_days = station_step_days
+
+    def find_events(self, start_jd: float, end_jd: float,
+                    planets: Optional[Sequence[str]] = None,
+                    divisions: Sequence[str] = ('rashi', 'nakshatra', 'pada'),
+                    timezone_offset: float = 5.5) -> List[TransitEvent]:
+        """Find every boundary crossing in [start_jd, end_jd), in time order.
+
+        The range is split at each planet's stations into pieces of monotonic
+        motion, where every crossing is the single root of
+        ``longitude(jd) - k * span`` for an integer ``k``. All roots are
+        seeded by interpolating across their piece and refined together with
+        bracketed Newton steps, so the cost is a handful of batch evaluations
+        regardless of how many events the range contains.
+        """
+        planets = list(planets or TRANSIT_BODIES.keys())
+        pieces = self._monotonic_pieces(start_jd, end_jd, planets)
+
+        # Longitude at both ends of every piece, in one batch evaluation
+        piece_planets = np.array([p for p, _, _ in pieces])
+        edges = np.array([[low, high] for _, low, high in pieces])
+        edge_longitudes = self.body_longitudes(edges.ravel(), planets)[
+            np.arange(2 * len(pieces)), np.repeat(piece_planets, 2)].reshape(-1, 2)
+
+        # Enumerate every boundary target reached inside each piece
+        event_pieces = []
+        event_divisions = []
+        targets = []
+        for k in range(len(pieces)):
+            low, high = sorted(edge_longitudes[k])
+            for division in divisions:
+                span = DIVISION_SPANS[division]
+                boundaries = np.arange(np.floor(low / span) + 1, np.ceil(high / span)) * span
+                event_pieces.extend([k] * len(boundaries))
+                event_divisions.extend([division] * len(boundaries))
+                targets.extend(boundaries)
+
+        if not targets:
+            return []
+
+        event_pieces = np.array(event_pieces)
+        targets = np.array(targets)
+        jds = self._solve_crossings(piece_planets[event_pieces], targets, planets,
+                                    edges[event_pieces], edge_longitudes[event_pieces])
+
+        events = []
+        for i in np.argsort(jds, kind='stable'):
+            k = event_pieces[i]
+            planet = planets[piece_planets[k]]
+            division = event_divisions[i]
+            span = DIVISION_SPANS[division]
+            count = int(round(360.0 / span))
+            boundary = int(round(targets[i] / span))
+            moving_forward = edge_longitudes[k, 1] > edge_longitudes[k, 0]
+
+            to_index = boundary % count if moving_forward else (boundary - 1) % count
+            from_index = (to_index - 1) % count if moving_forward else (to_index + 1) % count
+
+            events.append(TransitEvent(
+                planet=planet,
+                division=division,
+                julian_day=float(jds[i]),
+                moment=self.calculator.get_datetime_from_julian_day(float(jds[i]), timezone_offset),
+                from_index=from_index,
+                to_index=to_index,
+                from_name=self._division_name(division, from_index),
+                to_name=self._division_name(division, to_index)
+            ))
+
+        return events
+
+    def find_events_between_dates(self, start_date: datetime.date, end_date: datetime.date,
+                                  planets: Optional[Sequence[str]] = None,
+                                  divisions: Sequence[str] = ('rashi', 'nakshatra', 'pada'),
+                                  timezone_offset: float = 5.5) -> List[TransitEvent]:
+        """Find boundary crossings between two local calendar dates (inclusive)"""
+        start_jd = self.calculator.get_julian_day(start_date, datetime.time(0, 0), timezone_offset)
+        end_jd = self.calculator.get_julian_day(end_date + datetime.timedelta(days=1),
+                                                datetime.time(0, 0), timezone_offset)
+        return self.find_events(start_jd, end_jd, planets, divisions, timezone_offset)
+
+    def get_transit_calendar(self, year: int, planets: Optional[Sequence[str]] = None,
+                             divisions: Sequence[str] = ('rashi', 'nakshatra'),
+                             timezone_offset: float = 5.5) -> Dict[str, List[TransitEvent]]:
+        """Yearly transit calendar grouped by planet"""
+        events = self.find_events_between_dates(datetime.date(year, 1, 1), datetime.date(year, 12, 31),
+                                                planets, divisions, timezone_offset)
+
+        calendar = {planet: [] for planet in (planets or TRANSIT_BODIES.keys())}
+        for event in events:
+            calendar[event.planet].append(event)
+
+        return calendar
+
+    def find_stations(self, start_jd: float, end_jd: float,
+                      planets: Optional[Sequence[str]] = None, step_days: float = 1.0,
+                      timezone_offset: float = 5.5) -> List[Station]:
+        """Find the zero-speed instants in [start_jd, end_jd], in time order.
+
+        Speeds are sampled on a coarse grid with one batch evaluation; every
+        sign change is then bisected, all brackets in parallel. ``step_days``
+        must be shorter than the briefest retrograde loop to be detected.
+        """
+        planets = list(planets or TRANSIT_BODIES.keys())
+        jds, columns, low_speed = self._station_roots(start_jd, end_jd, planets, step_days)
+        if len(jds) == 0:
+            return []
+
+        longitudes = self.body_longitudes(jds, planets)[np.arange(len(jds)), columns] % 360
+
+        stations = []
+        for i in np.argsort(jds, kind='stable'):
+            stations.append(Station(
+                planet=planets[columns[i]],
+                julian_day=float(jds[i]),
+                moment=self.calculator.get_datetime_from_julian_day(float(jds[i]), timezone_offset),
+                longitude=float(longitudes[i]),
+                kind='retrograde' if low_speed[i] > 0 else 'direct'
+            ))
+
+        return stations
+
+    def get_retrograde_calendar(self, start_jd: float, end_jd: float,
+                                planets: Optional[Sequence[str]] = None, step_days: float = 1.0,
+                                timezone_offset: float = 5.5) -> Dict[str, List[RetrogradePeriod]]:
+        """Retrograde intervals per planet, clipped to the requested range"""
+        planets = list(planets or TRANSIT_BODIES.keys())
+        edge_speeds = self._body_speeds(np.array([start_jd]), planets)[0]
+
+        boundaries = {planet: [] for planet in planets}
+        for station in self.find_stations(start_jd, end_jd, planets, step_days, timezone_offset):
+            boundaries[station.planet].append(station.julian_day)
+
+        calendar = {}
+        for p, planet in enumerate(planets):
+            # Alternate retrograde/direct starting from the motion at start_jd
+            edges = [start_jd] + boundaries[planet] + [end_jd]
+            first_retrograde = 0 if edge_speeds[p] < 0 else 1
+            calendar[planet] = [
+                RetrogradePeriod(
+                    planet=planet,
+                    start_jd=edges[i],
+                    end_jd=edges[i + 1],
+                    start=self.calculator.get_datetime_from_julian_day(edges[i], timezone_offset),
+                    end=self.calculator.get_datetime_from_julian_day(edges[i + 1], timezone_offset)
+                )
+                for i in range(first_retrograde, len(edges) - 1, 2)
+            ]
+
+        return calendar
+
+    def _station_roots(self, start_jd: float, end_jd: float, planets: List[str],
+                       step_days: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Bisect every speed sign change on the grid: station JDs, planet columns, speeds before"""
+        grid = np.append(np.arange(start_jd, end_jd, step_days), end_jd)
+        speeds = self._body_speeds(grid, planets)
+
+        signs = np.sign(speeds)
+        steps, columns = np.nonzero(signs[:-1] * signs[1:] < 0)
+        if len(steps) == 0:
+            return np.empty(0), columns, np.empty(0)
+
+        low, high = grid[steps], grid[steps + 1]
+        low_speed = speeds[steps, columns]
+        while np.max(high - low) > self.tolerance_days:
+            mid = 0.5 * (low + high)
+            mid_speed = self._body_speeds(mid, planets)[np.arange(len(mid)), columns]
+            same_side = np.sign(mid_speed) == np.sign(low_speed)
+            low = np.where(same_side, mid, low)
+            high = np.where(same_side, high, mid)
+
+        return 0.5 * (low + high), columns, low_speed
+
+    def _monotonic_pieces(self, start_jd: float, end_jd: float,
+                          planets: List[str]) -> List[Tuple[int, float, float]]:
+        """Split the range at stations: (planet column, start JD, end JD) per piece"""
+        stations = {p: [] for p in range(len(planets))}
+        if get_tier_spec(self.precision).planet_center_order:
+            jds, columns, _ = self._station_roots(start_jd, end_jd, planets, self.station_step_days)
+            for jd, column in sorted(zip(jds, columns)):
+                stations[column].append(float(jd))
+
+        pieces = []
+        for p in range(len(planets)):
+            edges = [start_jd] + stations[p] + [end_jd]
+            pieces.extend((p, edges[i], edges[i + 1]) for i in range(len(edges) - 1))
+        return pieces
+
+    def _solve_crossings(self, event_planets: np.ndarray, targets: np.ndarray, planets: List[str],
+                         brackets: np.ndarray, bracket_longitudes: np.ndarray) -> np.ndarray:
+        """Safeguarded Newton iteration for all crossings at once.
+
+        Each root lies inside a monotonic bracket; Newton steps that leave
+        the shrinking bracket (near a station, where the speed vanishes)
+        fall back to bisection.
+        """
+        low, high = brackets[:, 0].copy(), brackets[:, 1].copy()
+        direction = np.sign(bracket_longitudes[:, 1] - bracket_longitudes[:, 0])
+        fraction = (targets - bracket_longitudes[:, 0]) / (bracket_longitudes[:, 1] - bracket_longitudes[:, 0])
+        jds = low + fraction * (high - low)
+
+        step = 1e-3
+        active = np.ones(len(jds), dtype=bool)
+        for _ in range(self.max_iterations):
+            index = np.flatnonzero(active)
+            probe = np.concatenate([jds[index], jds[index] - step, jds[index] + step])
+            longitudes = self.body_longitudes(probe, planets)
+            columns = np.tile(event_planets[index], 3)
+            values = longitudes[np.arange(len(probe)), columns].reshape(3, -1)
+
+            residual = values[0] - targets[index]
+            past = residual * direction[index] > 0
+            high[index] = np.where(past, jds[index], high[index])
+            low[index] = np.where(past, low[index], jds[index])
+
+            speed = (values[2] - values[1]) / (2 * step)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                newton = jds[index] - residual / speed
+            inside = np.isfinite(newton) & (newton > low[index]) & (newton < high[index])
+            updated = np.where(inside, newton, 0.5 * (low[index] + high[index]))
+
+            converged = np.abs(updated - jds[index]) <= self.tolerance_days
+            jds[index] = updated
+            active[index[converged]] = False
+            if not active.any():
+                break
+
+        return jds
+
+    def body_longitudes(self, jds: np.ndarray, planets: List[str]) -> np.ndarray:
+        """Unwrapped sidereal longitudes of the requested bodies, shape (len(jds), len(planets))"""
+        series = self.calculator.calculate_series_longitudes(jds, self.precision)
+        columns = [TRANSIT_BODIES[planet][0] for planet in planets]
+        offsets = np.array([TRANSIT_BODIES[planet][1] for planet in planets])
+        # Unbucketed ayanamsa keeps the longitude smooth for the root solvers
+        return series[:, columns] + offsets - self.ayanamsa.exact_offsets(jds)[:, None]
+
+    def _body_speeds(self, jds: np.ndarray, planets: List[str]) -> np.ndarray:
+        """Apparent speeds in degrees per day, shape (len(jds), len(planets))"""
+        _, speeds = self.calculator.calculate_series_motion(jds, precision=self.precision)
+        columns = [TRANSIT_BODIES[planet][0] for planet in planets]
+        return speeds[:, columns] - self.ayanamsa.daily_rates(jds)[:, None]
+
+    def _division_name(self, division: str, index: int) -> str:
+        """Human readable name of a division index"""
+        if division == 'rashi':
+            return self.calculator.rashi_names[index]
+        if division == 'nakshatra':
+            return self.calculator.nakshatra_names[index]
+        return f"{self.calculator.nakshatra_names[index // 4]} {index % 4 + 1}"
+
+print("✅ Transit Event Search loaded")
@@ -0,0 +1,81 @@
+"""
+Benchmark for the ephemeris precision tiers
+Times each tier on a batch of dates and, when PyEphem is installed, measures its error
+"""
+
+import math
+import time
+import numpy as np
+
+from core.ephemeris_series import PRECISION_TIERS, SERIES_BODIES, evaluate_series
+
+START_JD = 2415020.5  # 1900-01-01
+END_JD = 2488069.5  # 2100-01-01
+
+def time_tiers(n_dates: int = 200000, repeats: int = 3):
+    """Best-of wall time per tier for one batch evaluation"""
+    t = (np.random.default_rng(0).uniform(START_JD, END_JD, n_dates) - 2451545.0) / 36525.0
+    results = {}
+
+    for precision in PRECISION_TIERS:
+        best = float('inf')
+        for _ in range(repeats):
+            started = time.perf_counter()
+            evaluate_series(t, precision)
+            best = min(best, time.perf_counter() - started)
+        results[precision] = best
+
+    return results
+
+def reference_longitudes(julian_days: np.ndarray) -> np.ndarray:
+    """Geocentric ecliptic longitudes of date from PyEphem, shape (n, 7)"""
+    import ephem
+
+    bodies = [ephem.Sun(), ephem.Moon(), ephem.Mercury(), ephem.Venus(),
+              ephem.Mars(), ephem.Jupiter(), ephem.Saturn()]
+    longitudes = np.empty((len(julian_days), len(bodies)))
+
+    for i, jd in enumerate(julian_days):
+        date = ephem.Date(jd - 2415020.0)
+        for j, body in enumerate(bodies):
+            body.compute(date, epoch=date)
+            longitudes[i, j] = math.degrees(ephem.Ecliptic(body, epoch=date).lon)
+
+    return longitudes
+
+def measure_errors(n_dates: int = 1000):
+    """Worst-case error per tier and body in degrees, or None without PyEphem"""
+    julian_days = np.random.default_rng(1).uniform(START_JD, END_JD, n_dates)
+    try:
+        reference = reference_longitudes(julian_days)
+    except ImportError:
+        return None
+    t = (julian_days - 2451545.0) / 36525.0
+
+    errors = {}
+    for precision in PRECISION_TIERS:
+        computed = evaluate_series(t, precision)[:, :reference.shape[1]]
+        errors[precision] = np.abs((computed - reference + 180) % 360 - 180).max(axis=0)
+
+    return errors
+
+def run_benchmark():
+    """Print timings and error bounds for every tier"""
+    print("⏱️ EPHEMERIS PRECISION TIERS")
+    print("=" * 60)
+
+    for precision, seconds in time_tiers().items():
+        print(f"{precision:>10}: {seconds * 1000:8.1f} ms per 200k dates")
+
+    errors = measure_errors()
+    if errors is None:
+        print("\nInstall PyEphem to measure errors against a full ephemeris")
+        return
+
+    print("\nWorst-case error in degrees, 1900-2100:")
+    print(" " * 10 + "".join(f"{body:>9}" for body in SERIES_BODIES[:7]))
+    for precision, row in errors.items():
+        print(f"{precision:>10}" + "".join(f"{value:9.3f}" for value in row))
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+
+from core.calculations import AstronomicalCalculator
+
+CHARTS = [
+    (datetime.date(1995, 3, 3), datetime.time(8, 0), 19.0760, 72.8777),
+    (datetime.date(1990, 1, 1), datetime.time(23, 45), 28.6139, 77.2090),
+    (datetime.date(2006, 12, 13), datetime.time(5, 30), 13.0827, 80.2707),
+    (datetime.date(1978, 7, 21), datetime.time(14, 10), 51.5074, -0.1278),
+]
+
+@pytest.mark.parametrize("house_system", ['equal', 'whole_sign'])
+@pytest.mark.parametrize("birth_date, birth_time, latitude, longitude", CHARTS)
+def test_house_cusps_agree_with_chart_houses(birth_date, birth_time, latitude, longitude, house_system):
+    astro = AstronomicalCalculator()
+    chart = astro.calculate_planetary_positions(birth_date, birth_time, latitude, longitude, house_system)
+    cusps = astro.calculate_house_cusps(astro.get_julian_day(birth_date, birth_time), latitude, longitude,
+                                        house_system)
+
+    assert cusps['ascendant'] == pytest.approx(chart['Ascendant'].longitude, abs=1e-6)
+    for position in chart.values():
+        offset = (position.longitude - cusps['cusps'][0]) % 360
+        if house_system == 'whole_sign':
+            offset = (int(position.longitude // 30) - int(cusps['cusps'][0] // 30)) % 12 * 30
+        assert int(offset // 30) + 1 == position.house, position.name
+
+def test_tropical_cusps_are_unshifted():
+    astro = AstronomicalCalculator()
+    jd = astro.get_julian_day(datetime.date(1995, 3, 3), datetime.time(8, 0))
+    tropical = astro.calculate_ascendant_and_mc(jd, 19.0760, 72.8777, 'tropical')
+    sidereal = astro.calculate_ascendant_and_mc(jd, 19.0760, 72.8777)
+
+    assert (tropical[0] - sidereal[0]) % 360 == pytest.approx((tropical[1] - sidereal[1]) % 360)
+    assert 23.0 < (tropical[0] - sidereal[0]) % 360 < 24.5
+
+def test_fast_tier_reports_retrograde():
+    # Mercury stationed retrograde on 2024-04-01 and went direct on 2024-04-25
+    astro = AstronomicalCalculator()
+    retrograde = astro.calculate_planetary_positions(datetime.date(2024, 4, 12), datetime.time(12, 0), 28.6139, 77.2090)
+    direct = astro.calculate_planetary_positions(datetime.date(2024, 5, 20), datetime.time(12, 0), 28.6139, 77.2090)
+
+    assert retrograde['Mercury'].retrograde and retrograde['Mercury'].speed < 0
+    assert not direct['Mercury'].retrograde
@@ -0,0 +1,50 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from core.calculations import AstronomicalCalculator
+from core.chart_array import ChartArray
+
+@pytest.fixture(scope="module")
+def astro():
+    return AstronomicalCalculator()
+
+def boundary_batch(astro, offsets):
+    """A batch whose longitudes sit just around every sign boundary"""
+    batch = astro.calculate_batch_positions(np.full(12 * len(offsets), 2451545.0))
+    boundaries = np.repeat(np.arange(12) * 30.0, len(offsets))
+    longitudes = (boundaries[:, None] + np.tile(offsets, 12)[:, None]
+                  + np.zeros(len(batch.bodies))) % 360.0
+    classes = astro.classify_longitudes(longitudes, longitudes[:, -1:])
+    return dataclasses.replace(batch, longitudes=longitudes, rashi_index=classes['rashi'],
+                               nakshatra_index=classes['nakshatra'], pada=classes['pada'], house=classes['house'])
+
+def test_signs_match_batch_near_boundaries(astro):
+    batch = boundary_batch(astro, np.array([-1e-5, -1e-6, -1e-7, -1e-9, 0.0, 1e-9, 1e-7, 1e-6, 1e-5]))
+    charts = ChartArray.from_batch(batch, astro)
+
+    packed = astro.classify_longitudes(charts.longitudes)
+    np.testing.assert_array_equal(packed['rashi'], batch.rashi_index)
+    np.testing.assert_array_equal(packed['nakshatra'], batch.nakshatra_index)
+    np.testing.assert_array_equal(packed['pada'], batch.pada)
+
+    for index in range(len(charts)):
+        assert charts[index]['Sun'].rashi == astro.rashi_names[batch.rashi_index[index, 0]]
+
+def test_speed_keeps_float32_resolution(astro):
+    batch = astro.calculate_batch_positions(np.linspace(2451545.0, 2451910.0, 50), 19.0760, 72.8777)
+    charts = ChartArray.from_batch(batch, astro)
+
+    np.testing.assert_allclose(charts.records['speed'], batch.speed, rtol=1e-6)
+
+def test_houses_and_retrograde_share_one_byte(astro):
+    batch = astro.calculate_batch_positions(np.linspace(2451545.0, 2451910.0, 50), 19.0760, 72.8777)
+    charts = ChartArray.from_batch(batch, astro)
+
+    assert charts.records.dtype.itemsize == 9
+    np.testing.assert_array_equal(charts.houses, batch.house)
+    for index in (0, 25, 49):
+        for column, body in enumerate(batch.bodies):
+            assert charts[index][body].retrograde == bool(batch.speed[index, column] < 0)
+            assert charts[index][body].house == batch.house[index, column]
@@ -0,0 +1,34 @@
+import datetime
+import random
+
+import pytest
+
+from core.dasha_events import DashaEventIndex
+from core.dashas import DashaCalculator
+
+INFO_KEYS = {'Mahadasha': 'current_mahadasha', 'Antardasha': 'current_antardasha'}
+
+@pytest.fixture(scope="module")
+def profiles():
+    generator = random.Random(16)
+    return {
+        f"user-{number}": (datetime.date(1940, 1, 1) + datetime.timedelta(days=generator.randrange(30000)),
+                           generator.uniform(0.0, 360.0))
+        for number in range(300)
+    }
+
+def test_event_dates_match_current_dasha(profiles):
+    calculator = DashaCalculator()
+    trees = {user_id: calculator.get_dasha_tree(birth_date, moon) for user_id, (birth_date, moon) in profiles.items()}
+    index = DashaEventIndex()
+    index.build(trees, datetime.datetime(2026, 1, 1), datetime.datetime(2028, 1, 1))
+
+    events = index.between(datetime.date(2026, 1, 1), datetime.date(2027, 12, 31))
+    assert any(event.level == 'Antardasha' for event in events)
+    for event in events:
+        birth_date, moon = profiles[event.user_id]
+        key = INFO_KEYS[event.level]
+        assert calculator.get_current_dasha_info(birth_date, event.date, moon)[key] == event.lord
+        day_before = event.date - datetime.timedelta(days=1)
+        assert calculator.get_current_dasha_info(birth_date, day_before, moon)[key] == event.previous_lord
+        assert event in index.on_date(event.date, event.level)
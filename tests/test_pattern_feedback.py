@@ -0,0 +1,61 @@
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import threading
+
+from core.pattern_feedback import PatternFeedbackStore
+
+def run_with_timeout(function, seconds=10.0):
+    """Run ``function`` on a thread and report whether it finished in time"""
+    thread = threading.Thread(target=function, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    return not thread.is_alive()
+
+def test_locked_database_is_retried(tmp_path):
+    path = str(tmp_path / "feedback.db")
+    store = PatternFeedbackStore(path, poll_seconds=0.05, busy_timeout=0.1)
+    store.record('rahu_sun', True, 0.8)
+    store.flush()
+
+    # Another process holding the write lock makes the writer's compaction time out
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    store.record('rahu_sun', True, 0.6)
+    assert run_with_timeout(store.compact)
+    assert store._thread.is_alive()
+
+    other.execute("ROLLBACK")
+    other.close()
+    store.record('rahu_sun', False, 0.0)
+    assert run_with_timeout(store.compact)
+    store.close()
+
+    reopened = PatternFeedbackStore(path)
+    assert reopened.accuracy('rahu_sun')[0] == 2
+    reopened.close()
+
+def test_queued_events_are_written_at_exit(tmp_path):
+    path = str(tmp_path / "feedback.db")
+    script = textwrap.dedent(f"""
+        from core.pattern_feedback import PatternFeedbackStore
+        store = PatternFeedbackStore({path!r}, poll_seconds=60.0)
+        for _ in range(50):
+            store.record('rahu_sun', True, 1.0)
+    """)
+    subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, timeout=60)
+
+    store = PatternFeedbackStore(path)
+    assert store.accuracy('rahu_sun')[0] == 50
+    store.close()
+
+def test_set_baseline_while_writing(tmp_path):
+    store = PatternFeedbackStore(str(tmp_path / "feedback.db"), compact_every=1)
+    for number in range(200):
+        store.record(f"pattern_{number % 7}", True, 0.5)
+        store.set_baseline({f"baseline_{number}": (1, 0.5)})
+    assert run_with_timeout(store.flush)
+    assert store._thread.is_alive()
+    assert store.accuracy('baseline_199') == (1, 0.5)
+    store.close()
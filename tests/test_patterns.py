@@ -0,0 +1,50 @@
+import datetime
+import json
+
+import pytest
+
+from core.calculations import PlanetPosition
+from core.patterns import PatternDetector
+
+PATTERNS = {
+    "sun_moon_opposition": {
+        "name": "Sun-Moon Opposition",
+        "planets": ["Sun", "Moon"],
+        "orb": 6.0,
+        "conditions": [{"type": "opposition", "planets": ["Sun", "Moon"]}]
+    },
+    "mars_in_eighth": {
+        "name": "Mars in 8th",
+        "planets": ["Mars"],
+        "conditions": [{"type": "house", "planet": "Mars", "house": 8}]
+    }
+}
+
+def positions(longitudes, houses):
+    return {
+        name: PlanetPosition(name=name, longitude=longitude, latitude=0.0, rashi='', degree=0, minute=0, second=0,
+                             nakshatra='', pada=1, retrograde=False, house=houses[name])
+        for name, longitude in longitudes.items()
+    }
+
+@pytest.fixture(scope="module")
+def detector(tmp_path_factory):
+    path = tmp_path_factory.mktemp("patterns") / "patterns.json"
+    path.write_text(json.dumps(PATTERNS))
+    return PatternDetector(patterns_path=str(path))
+
+def detected(detector, chart):
+    start, end = datetime.date(2026, 1, 1), datetime.date(2026, 1, 31)
+    transits = detector.detect_transit_patterns(chart, chart, start, end)
+    assert sorted(match.pattern.pattern_id for match in transits) == \
+        sorted(match.pattern.pattern_id for match in detector.detect_patterns_in_chart(chart))
+    assert all(match.match_date == start for match in transits)
+    return sorted(match.pattern.pattern_id for match in transits)
+
+def test_opposition_is_not_matched_at_new_moon(detector):
+    chart = positions({'Sun': 266.54, 'Moon': 266.20, 'Mars': 10.0}, {'Sun': 1, 'Moon': 1, 'Mars': 5})
+    assert detected(detector, chart) == []
+
+def test_opposition_and_house_patterns_in_transit(detector):
+    chart = positions({'Sun': 266.54, 'Moon': 86.40, 'Mars': 10.0}, {'Sun': 1, 'Moon': 7, 'Mars': 8})
+    assert detected(detector, chart) == ['mars_in_eighth', 'sun_moon_opposition']